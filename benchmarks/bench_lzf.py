@@ -0,0 +1,44 @@
+"""
+Compares the LZF decompression backends by reading every record of the test files.
+
+Run from the repository root with yxdb installed (pip install -e .[fast]):
+
+    python benchmarks/bench_lzf.py
+"""
+import os
+import time
+
+from yxdb._buffered_record_reader import BufferedRecordReader
+from yxdb._lzf import backends
+from yxdb.yxdb_reader import YxdbReader
+
+_test_files = os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_files')
+_files = ['LotsOfRecords.yxdb', 'VeryLongField.yxdb']
+_repeat = 3
+
+
+def _read_all(path: str, backend) -> int:
+    yxdb = YxdbReader(path=path)
+    reader = BufferedRecordReader(yxdb._stream, yxdb._record.fixed_size, yxdb._record.has_var, yxdb.num_records, backend)
+    records = 0
+    while reader.next_record():
+        records += 1
+    return records
+
+
+def main():
+    for file in _files:
+        path = os.path.join(_test_files, file)
+        for name, backend in backends.items():
+            best = None
+            records = 0
+            for _ in range(_repeat):
+                start = time.perf_counter()
+                records = _read_all(path, backend)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{file:<22} {name:<8} {records:>8} records  {best * 1000:>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
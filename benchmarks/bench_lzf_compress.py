@@ -0,0 +1,70 @@
+"""
+Compares the LZF compressors on the record blocks of the test files.
+
+Every block of every test file is decompressed, then compressed again with each backend and mode.
+The ratio is the uncompressed size divided by the written size, where blocks that do not get
+smaller are counted at their uncompressed size because the writer stores them raw.
+
+Run from the repository root with yxdb installed (pip install -e .[fast]):
+
+    python benchmarks/bench_lzf_compress.py
+"""
+import glob
+import os
+import time
+
+from yxdb._header import Header, header_size
+from yxdb._lzf import backends, compress_block, new_lzf
+from yxdb._utility import memview
+
+_test_files = os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_files')
+_repeat = 3
+
+
+def _read_blocks(path: str) -> list:
+    with open(path, 'rb') as file:
+        data = file.read()
+    header = Header(memoryview(data[:header_size]))
+    position = header.first_block_pos()
+    end = header.records_end_pos()
+    blocks = []
+    while position < end:
+        length = int.from_bytes(data[position:position + 4], 'little')
+        position += 4
+        raw = length & 0x80000000 > 0
+        length &= 0x7fffffff
+        block = data[position:position + length]
+        position += length
+        if not raw:
+            out_bytes = memview(0x40000)
+            written = new_lzf(memoryview(block), out_bytes, backends['python']).decompress(length)
+            block = out_bytes[:written].tobytes()
+        blocks.append(block)
+    return blocks
+
+
+def main():
+    blocks = []
+    for path in sorted(glob.glob(os.path.join(_test_files, '*.yxdb'))):
+        blocks += _read_blocks(path)
+    size = sum(len(block) for block in blocks)
+    print(f"{len(blocks)} blocks, {size} bytes")
+
+    for name, backend in backends.items():
+        for tight in (False, True):
+            best = None
+            written = 0
+            for _ in range(_repeat):
+                start = time.perf_counter()
+                written = 0
+                for block in blocks:
+                    compressed = compress_block(block, backend, tight)
+                    written += len(block) if compressed is None else len(compressed)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            mode = 'tight' if tight else 'fast'
+            print(f"{name:<8} {mode:<6} ratio {size / written:>6.3f}  {size / best / 1e6:>9.2f} MB/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2 @@
+from yxdb._pandas import read_dataframe
+from yxdb.yxdb_schema import read_schema, read_schemas
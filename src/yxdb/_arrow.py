@@ -0,0 +1,159 @@
+from yxdb import _columnar
+from yxdb._buffered_record_reader import BufferedRecordReader
+from yxdb._utility import import_optional
+from yxdb._yxdb_record import YxdbRecord
+
+_primitive_types = {
+    'Int16': 'int16',
+    'Int32': 'int32',
+    'Int64': 'int64',
+    'Float': 'float32',
+    'Double': 'float64',
+    'FixedDecimal': 'float64',
+    'Byte': 'uint8',
+    'Bool': 'bool_',
+    'String': 'string',
+    'WString': 'string',
+    'V_String': 'string',
+    'V_WString': 'string',
+    'Blob': 'binary',
+    'SpatialObj': 'binary',
+}
+
+# string and binary arrays use int32 offsets, so their data must not exceed this many bytes
+_max_offset = 0x7fffffff
+
+
+def pyarrow():
+    return import_optional('pyarrow', 'arrow')
+
+
+def schema(record: YxdbRecord):
+    pa = pyarrow()
+    fields = []
+    for index, (field, layout) in enumerate(zip(record.fields, record.layouts)):
+        if index in record.dictionary_indices:
+            fields.append(pa.field(field.name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(field.name, arrow_type(layout.field.data_type)))
+    return pa.schema(fields)
+
+
+def arrow_type(data_type: str):
+    pa = pyarrow()
+    if data_type == 'Date':
+        return pa.date32()
+    if data_type == 'DateTime':
+        return pa.timestamp('s')
+    return getattr(pa, _primitive_types[data_type])()
+
+
+def read_record_batches(record_reader: BufferedRecordReader, record: YxdbRecord, n: int, row_filter=None) -> list:
+    """
+    Reads up to n records into a list of pyarrow.RecordBatch objects using schema(record).
+
+    The list holds a single batch unless the string or blob data of a column does not fit in the
+    int32 offsets of the schema's types; the records are then split into batches that do.
+    """
+    pa = pyarrow()
+    batch_schema = schema(record)
+    count, records, columns = _columnar.scan(record_reader, record, n, row_filter)
+    arrays = [_to_arrow(column, records, count, field.type) for column, field in zip(columns, batch_schema)]
+    large = [index for index, (array, field) in enumerate(zip(arrays, batch_schema)) if array.type != field.type]
+    if not large:
+        return [pa.RecordBatch.from_arrays(arrays, schema=batch_schema)]
+    return _split_large_batch(pa.RecordBatch.from_arrays(arrays, names=batch_schema.names), batch_schema, large)
+
+
+def _split_large_batch(batch, batch_schema, large: list) -> list:
+    pa = pyarrow()
+    pc = import_optional('pyarrow.compute', 'arrow')
+    batches = []
+    pending = [batch]
+    while pending:
+        piece = pending.pop()
+        sizes = [pc.sum(pc.binary_length(piece.column(index))).as_py() or 0 for index in large]
+        if max(sizes) > _max_offset and piece.num_rows > 1:
+            half = piece.num_rows // 2
+            pending.append(piece.slice(half))
+            pending.append(piece.slice(0, half))
+            continue
+        arrays = [column.cast(field.type) for column, field in zip(piece.columns, batch_schema)]
+        batches.append(pa.RecordBatch.from_arrays(arrays, schema=batch_schema))
+    return batches
+
+
+def _to_arrow(column, records, count: int, data_type):
+    if isinstance(column, _columnar.VarColumn):
+        return _var_to_arrow(column, count)
+    if isinstance(column, (_columnar.DictionaryVarColumn, _columnar.DictionaryStringColumn)):
+        return _dictionary_to_arrow(column.finish(records))
+
+    pa = pyarrow()
+    np = _columnar.numpy()
+    finished = column.finish(records)
+    values = finished.values
+    if isinstance(column, _columnar.DateColumn):
+        if column.width == 10:
+            values = values.astype('datetime64[D]').view(np.int64).astype(np.int32)
+        else:
+            values = values.view(np.int64)
+    if values.dtype == object or values.dtype == np.bool_:
+        return pa.array(values, mask=finished.nulls, type=data_type)
+    return pa.Array.from_buffers(data_type, count, [_validity(finished.nulls), pa.py_buffer(values)], int(finished.nulls.sum()))
+
+
+def _dictionary_to_arrow(finished):
+    pa = pyarrow()
+    indices = pa.array(finished.values, mask=finished.nulls, type=pa.int32())
+    return pa.DictionaryArray.from_arrays(indices, pa.array(finished.dictionary, type=pa.string()))
+
+
+def _var_to_arrow(column, count: int):
+    pa = pyarrow()
+    np = _columnar.numpy()
+    nulls = np.array(column.null_flags, dtype=bool)
+    offsets = np.array(column.offsets, dtype=np.int64)
+    data = column.data
+    if column.encoding == 'latin1':
+        offsets, data = _latin1_to_utf8(offsets, data)
+    elif column.encoding == 'utf_16_le':
+        offsets, data = _utf16_to_utf8(offsets, data)
+
+    large = len(data) > _max_offset
+    if column.encoding is None:
+        data_type = pa.large_binary() if large else pa.binary()
+    else:
+        data_type = pa.large_string() if large else pa.string()
+    if not large:
+        offsets = offsets.astype(np.int32)
+    buffers = [_validity(nulls), pa.py_buffer(offsets), pa.py_buffer(data)]
+    return pa.Array.from_buffers(data_type, count, buffers, int(nulls.sum()))
+
+
+def _latin1_to_utf8(offsets, data: bytearray):
+    if data.isascii():
+        return offsets, data
+
+    np = _columnar.numpy()
+    high = np.frombuffer(data, dtype=np.uint8) >= 0x80
+    extra = np.concatenate(([0], np.cumsum(high, dtype=np.int64)))
+    return offsets + extra[offsets], str(data, 'latin1').encode('utf-8')
+
+
+def _utf16_to_utf8(offsets, data: bytearray):
+    np = _columnar.numpy()
+    units = np.frombuffer(data, dtype='<u2')
+    unit_lengths = np.full(len(units), 3, dtype=np.int64)
+    unit_lengths[units < 0x800] = 2
+    unit_lengths[units < 0x80] = 1
+    unit_lengths[(units >= 0xd800) & (units < 0xe000)] = 2
+    utf8_offsets = np.concatenate(([0], np.cumsum(unit_lengths)))
+    return utf8_offsets[offsets // 2], str(data, 'utf_16_le').encode('utf-8')
+
+
+def _validity(nulls):
+    if not nulls.any():
+        return None
+    np = _columnar.numpy()
+    return pyarrow().py_buffer(np.packbits(~nulls, bitorder='little'))
@@ -0,0 +1,66 @@
+from io import BytesIO
+from typing import List
+
+from yxdb._lzf import compress_block
+
+block_size = 0x40000
+raw_block_flag = 0x80000000
+
+
+class BlockWriter:
+    """
+    BlockWriter splits record bytes into 256 KiB blocks and writes each block LZF-compressed, or
+    uncompressed with the raw flag set when compression does not make it smaller.
+
+    start_index_entry() ends the current block so the next record starts a new block, and records
+    the position of that block for the record block index. Positions are relative to origin, the
+    stream position where the YXDB file starts.
+    """
+
+    def __init__(self, stream: BytesIO, compress=compress_block, origin: int = 0):
+        self.stream = stream
+        self.compress = compress
+        self.origin = origin
+        self.buffer = bytearray()
+        self.block_positions: List[int] = []
+
+    def start_index_entry(self):
+        self.flush()
+        self.block_positions.append(self.stream.tell() - self.origin)
+
+    def write(self, data: bytes):
+        view = memoryview(data)
+        if len(self.buffer) + len(view) < block_size:
+            self.buffer += view
+            return
+        fill = block_size - len(self.buffer)
+        self.buffer += view[:fill]
+        self._write_block(self.buffer)
+        self.buffer = bytearray()
+        index = fill
+        while len(view) - index >= block_size:
+            self._write_block(view[index:index + block_size])
+            index += block_size
+        self.buffer += view[index:]
+
+    def flush(self):
+        if len(self.buffer) > 0:
+            self._write_block(self.buffer)
+            self.buffer = bytearray()
+
+    def write_block_index(self) -> int:
+        self.flush()
+        position = self.stream.tell() - self.origin
+        self.stream.write(len(self.block_positions).to_bytes(4, 'little'))
+        for block_position in self.block_positions:
+            self.stream.write(block_position.to_bytes(8, 'little'))
+        return position
+
+    def _write_block(self, block):
+        compressed = self.compress(block)
+        if compressed is None:
+            self.stream.write((len(block) | raw_block_flag).to_bytes(4, 'little'))
+            self.stream.write(block)
+        else:
+            self.stream.write(len(compressed).to_bytes(4, 'little'))
+            self.stream.write(compressed)
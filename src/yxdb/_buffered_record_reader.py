@@ -1,23 +1,48 @@
 from io import BytesIO
 
-from yxdb._lzf import Lzf
+from yxdb._lzf import new_lzf
 from yxdb._utility import memview
 
+default_lzf_buffer_size = 262144
+
+# an LZF back reference expands 3 bytes into at most 264, so no block decompresses to more than this
+# multiple of its compressed length
+max_lzf_expansion = 89
+
+
+def decompress_growing(lzf, length: int) -> int:
+    """
+    Decompresses length bytes of lzf.in_bytes, replacing lzf.out_bytes with a buffer twice the size
+    until the decompressed block fits.
+    """
+    while True:
+        try:
+            return lzf.decompress(length)
+        except AttributeError:
+            if len(lzf.out_bytes) >= length * max_lzf_expansion:
+                raise
+            lzf.out_bytes = memview(len(lzf.out_bytes) * 2)
+
 
 class BufferedRecordReader:
-    def __init__(self, stream: BytesIO, fixed_len: int, has_var_fields: bool, total_records: int):
-        self.lzf_buffer_size = 262144
+    def __init__(self, stream: BytesIO, fixed_len: int, has_var_fields: bool, total_records: int, lzf_backend=None, skip_var_data: bool = False, zero_copy: bool = False, lzf_buffer_size: int = default_lzf_buffer_size, buffer_pool=None):
+        self.lzf_buffer_size = lzf_buffer_size
+        self.buffer_pool = buffer_pool
         self.stream = stream
         self.fixed_len = fixed_len
         self.has_var_fields = has_var_fields
+        self.skip_var_data = skip_var_data
+        self.zero_copy = zero_copy
         self.total_records = total_records
         if has_var_fields:
             self.record_buffer = memview(fixed_len + 4 + 1000)
         else:
             self.record_buffer = memview(fixed_len)
-        self.lzf_in = memview(self.lzf_buffer_size)
-        self.lzf_out = memview(self.lzf_buffer_size)
-        self.lzf = Lzf(self.lzf_in, self.lzf_out)
+        self.copy_buffer = self.record_buffer
+        self.lzf_in = None
+        self.lzf_out = None
+        self.lzf = new_lzf(None, None, lzf_backend)
+        self._acquire_lzf_buffers()
         self.lzf_length_buffer = memview(4)
         self.current_record = 0
         self.record_buffer_index = 0
@@ -27,23 +52,116 @@ class BufferedRecordReader:
     def next_record(self) -> bool:
         self.current_record += 1
         if self.current_record > self.total_records:
-            self.stream.close()
+            self.close()
             return False
         self.record_buffer_index = 0
+        if self.zero_copy:
+            if self._view_record():
+                return True
+            self.record_buffer = self.copy_buffer
         if self.has_var_fields:
             self._read_variable_record()
         else:
             self._read(self.fixed_len)
         return True
 
+    def close(self):
+        self._release_lzf_buffers()
+        self.stream.close()
+
+    def reopen(self, stream: BytesIO):
+        self.stream = stream
+        self._acquire_lzf_buffers()
+
+    def release_stream(self):
+        """Stops any background reads so the caller can use the stream; reading resumes where it left off."""
+
+    def seek(self, position: int, current_record: int):
+        self.stream.seek(position)
+        self.current_record = current_record
+        self.lzf_out_size = 0
+        self.lzf_out_index = 0
+
+    def skip_records(self, count: int):
+        count = min(count, self.total_records - self.current_record)
+        if count <= 0:
+            return
+        self.current_record += count
+        if not self.has_var_fields:
+            self._skip(self.fixed_len * count)
+            return
+        self.record_buffer = self.copy_buffer
+        for _ in range(count):
+            self.record_buffer_index = 0
+            self._read(self.fixed_len + 4)
+            self._skip(self._var_length())
+
+    def read_fixed_records(self, n: int):
+        count = min(n, self.total_records - self.current_record)
+        if count <= 0:
+            return 0, memview(0)
+        self.current_record += count
+        size = count * self.fixed_len
+
+        if self.lzf_out_index == self.lzf_out_size:
+            self.lzf_out_size = self._read_next_lzf_block()
+            self.lzf_out_index = 0
+        if self.lzf_out_index + size <= self.lzf_out_size:
+            records = self.block[self.lzf_out_index:self.lzf_out_index+size]
+            self.lzf_out_index += size
+            return count, records
+
+        records = memview(size)
+        filled = 0
+        while filled < size:
+            if self.lzf_out_index == self.lzf_out_size:
+                self.lzf_out_size = self._read_next_lzf_block()
+                self.lzf_out_index = 0
+            len_to_copy = min(size - filled, self.lzf_out_size - self.lzf_out_index)
+            records[filled:filled+len_to_copy] = self.block[self.lzf_out_index:self.lzf_out_index+len_to_copy]
+            self.lzf_out_index += len_to_copy
+            filled += len_to_copy
+        return count, records
+
+    def _var_length(self) -> int:
+        return int.from_bytes(self.record_buffer[self.record_buffer_index-4:self.record_buffer_index], "little")
+
+    def _view_record(self) -> bool:
+        if self.lzf_out_index == self.lzf_out_size:
+            self.lzf_out_size = self._read_next_lzf_block()
+            self.lzf_out_index = 0
+
+        start = self.lzf_out_index
+        end = start + self.fixed_len
+        next_index = end
+        if self.has_var_fields:
+            if end + 4 > self.lzf_out_size:
+                return False
+            var_length = int.from_bytes(self.block[end:end+4], "little")
+            end += 4
+            next_index = end + var_length
+            if not self.skip_var_data:
+                end = next_index
+        if next_index > self.lzf_out_size:
+            return False
+
+        self.record_buffer = self.block[start:end]
+        self.record_buffer_index = end - start
+        self.lzf_out_index = next_index
+        return True
+
     def _read_variable_record(self):
         self._read(self.fixed_len + 4)
-        var_length = int.from_bytes(self.record_buffer[self.record_buffer_index-4:self.record_buffer_index], "little")
+        var_length = self._var_length()
+        if self.skip_var_data:
+            self._skip(var_length)
+            return
         if self.fixed_len + 4 + var_length > len(self.record_buffer):
             new_length = (self.fixed_len + 4 + var_length) * 2
             new_buffer = memview(new_length)
             new_buffer[:self.fixed_len+4] = self.record_buffer[:self.fixed_len+4]
             self.record_buffer = new_buffer
+            self.copy_buffer = new_buffer
         self._read(var_length)
 
     def _read(self, size: int):
@@ -57,27 +175,67 @@ class BufferedRecordReader:
                 self.lzf_out_index = 0
 
             len_to_copy = min(self.lzf_out_size, size)
-            self.record_buffer[self.record_buffer_index:self.record_buffer_index+len_to_copy] = self.lzf_out[self.lzf_out_index: self.lzf_out_index+len_to_copy]
+            self.record_buffer[self.record_buffer_index:self.record_buffer_index+len_to_copy] = self.block[self.lzf_out_index: self.lzf_out_index+len_to_copy]
             self.lzf_out_index += len_to_copy
             self.record_buffer_index += len_to_copy
             size -= len_to_copy
 
+    def _skip(self, size: int):
+        while size + self.lzf_out_index > self.lzf_out_size:
+            size -= self.lzf_out_size - self.lzf_out_index
+            self.lzf_out_size = self._read_next_lzf_block()
+            self.lzf_out_index = 0
+        self.lzf_out_index += size
+
     def _copy_remaining_lzf_out_to_record(self) -> int:
         remaining_lzf = self.lzf_out_size - self.lzf_out_index
-        self.record_buffer[self.record_buffer_index:self.record_buffer_index+remaining_lzf] = self.lzf_out[self.lzf_out_index:self.lzf_out_index+remaining_lzf]
+        self.record_buffer[self.record_buffer_index:self.record_buffer_index+remaining_lzf] = self.block[self.lzf_out_index:self.lzf_out_index+remaining_lzf]
         self.record_buffer_index += remaining_lzf
         return remaining_lzf
 
+    def _acquire_lzf_buffers(self):
+        if self.lzf_out is not None:
+            return
+        if self.buffer_pool is None:
+            self._set_lzf_buffers(memview(self.lzf_buffer_size), memview(self.lzf_buffer_size))
+        else:
+            self._set_lzf_buffers(self.buffer_pool.acquire(self.lzf_buffer_size), self.buffer_pool.acquire(self.lzf_buffer_size))
+
+    def _release_lzf_buffers(self):
+        if self.buffer_pool is None or self.lzf_out is None:
+            return
+        self.buffer_pool.release(self.lzf_in)
+        self.buffer_pool.release(self.lzf_out)
+        self._set_lzf_buffers(None, None)
+
+    def _set_lzf_buffers(self, lzf_in: memoryview, lzf_out: memoryview):
+        self.lzf_in = lzf_in
+        self.lzf_out = lzf_out
+        self.lzf.in_bytes = lzf_in
+        self.lzf.out_bytes = lzf_out
+        self.block = lzf_out
+
+    def _decompress(self, length: int) -> int:
+        size = decompress_growing(self.lzf, length)
+        if self.lzf.out_bytes is not self.lzf_out:
+            self.lzf_out = self.lzf.out_bytes
+            self.block = self.lzf_out
+        return size
+
     def _read_next_lzf_block(self) -> int:
         lzf_block_length = self._read_lzf_block_length()
         checkbit = lzf_block_length & 0x80000000
         if checkbit > 0:
             lzf_block_length &= 0x7fffffff
+            if lzf_block_length > len(self.lzf_out):
+                self._set_lzf_buffers(self.lzf_in, memview(lzf_block_length))
             self.stream.readinto(self.lzf_out[:lzf_block_length])
             return lzf_block_length
         else:
+            if lzf_block_length > len(self.lzf_in):
+                self._set_lzf_buffers(memview(lzf_block_length), self.lzf_out)
             read_in = self.stream.readinto(self.lzf_in[:lzf_block_length])
-            return self.lzf.decompress(read_in)
+            return self._decompress(read_in)
 
     def _read_lzf_block_length(self):
         read = self.stream.readinto(self.lzf_length_buffer)
@@ -0,0 +1,448 @@
+from typing import List
+
+from yxdb._buffered_record_reader import BufferedRecordReader
+from yxdb._extractors import get_blob_span, _get_string
+from yxdb._field_layout import FieldLayout
+from yxdb._metainfo_field import MetaInfoField
+from yxdb._utility import import_optional
+from yxdb._yxdb_record import YxdbRecord
+from yxdb.yxdb_batch import YxdbBatch, YxdbColumn
+from yxdb.yxdb_field import YxdbField
+
+_value_formats = {
+    'Int16': '<i2',
+    'Int32': '<i4',
+    'Int64': '<i8',
+    'Float': '<f4',
+    'Double': '<f8',
+    'Byte': 'u1',
+    'Date': 'S10',
+    'DateTime': 'S19',
+}
+
+_numeric_types = {'Int16', 'Int32', 'Int64', 'Float', 'Double', 'Byte'}
+
+_date_widths = {
+    'Date': 10,
+    'DateTime': 19,
+}
+
+_days_in_month = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+_var_encodings = {
+    'V_String': 'latin1',
+    'V_WString': 'utf_16_le',
+    'Blob': None,
+    'SpatialObj': None,
+}
+
+
+def numpy():
+    return import_optional('numpy', 'numpy')
+
+
+def read_batch(record_reader: BufferedRecordReader, record: YxdbRecord, n: int, row_filter=None, scan_limit: int = None) -> YxdbBatch:
+    count, records, columns = scan(record_reader, record, n, row_filter, scan_limit)
+    return YxdbBatch(count, [column.finish(records) for column in columns])
+
+
+def scan(record_reader: BufferedRecordReader, record: YxdbRecord, n: int, row_filter=None, scan_limit: int = None):
+    """
+    Reads up to n records and returns (count, records, columns).
+
+    records is a NumPy array using record_dtype(record) over the fixed-width portion of each record.
+    When the file has no variable-length fields, records is a single view over the decompressed
+    block(s); otherwise the fixed-width portion of each record is copied into one buffer and the
+    variable-length columns are appended to record by record.
+
+    When row_filter is provided, only matching records are returned and counted towards n. Records
+    are tested on their raw bytes before any column sees them. scan_limit caps the number of records
+    read from the file, whether or not they match.
+    """
+    np = numpy()
+    columns = new_columns(record)
+    if scan_limit is None:
+        scan_limit = record_reader.total_records
+    if record.has_var:
+        count, fixed = _read_variable_records(record_reader, record, n, columns, row_filter, scan_limit)
+    elif row_filter is None:
+        count, fixed = record_reader.read_fixed_records(min(n, scan_limit))
+    else:
+        return _scan_filtered_fixed_records(record_reader, record, n, columns, row_filter, scan_limit)
+    records = np.frombuffer(fixed, dtype=record_dtype(record), count=count)
+    return count, records, columns
+
+
+def _read_variable_records(record_reader: BufferedRecordReader, record: YxdbRecord, n: int, columns: List, row_filter, scan_limit: int):
+    per_record = [column for column in columns if column.per_record]
+    fixed_size = record.fixed_size
+    fixed = bytearray(n * fixed_size)
+    matches = None if row_filter is None else row_filter.matches
+
+    count = 0
+    scanned = 0
+    while count < n and scanned < scan_limit and record_reader.next_record():
+        scanned += 1
+        buffer = record_reader.record_buffer
+        if matches is not None and not matches(buffer):
+            continue
+        offset = count * fixed_size
+        fixed[offset:offset + fixed_size] = buffer[:fixed_size]
+        for column in per_record:
+            column.append(buffer)
+        count += 1
+    return count, fixed
+
+
+def _scan_filtered_fixed_records(record_reader: BufferedRecordReader, record: YxdbRecord, n: int, columns: List, row_filter, scan_limit: int):
+    np = numpy()
+    dtype = record_dtype(record)
+    chunks = []
+    count = 0
+    while count < n and scan_limit > 0:
+        # every match needs a record, so reading n - count records never reads past the n-th match
+        scanned, fixed = record_reader.read_fixed_records(min(n - count, scan_limit))
+        if scanned == 0:
+            break
+        scan_limit -= scanned
+        records = np.frombuffer(fixed, dtype=dtype, count=scanned)
+        chunks.append(records[row_filter.mask(records)])
+        count += len(chunks[-1])
+    records = np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+    return count, records, columns
+
+
+def record_dtype(record: YxdbRecord):
+    """
+    Builds a NumPy structured dtype matching the fixed-width portion of a record.
+
+    Every field is a nested structure at its offset in the record, named by field_key() of its
+    position, containing 'value' and, for fields that have one, the 'null' flag byte that follows
+    the value. Positions are used instead of field names so a column can be projected twice.
+    """
+    np = numpy()
+    names = []
+    formats = []
+    offsets = []
+    for index, layout in enumerate(record.layouts):
+        names.append(field_key(index))
+        formats.append(_field_dtype(layout.field))
+        offsets.append(layout.start)
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': record.fixed_size})
+
+
+def field_key(index: int) -> str:
+    """Returns the name of the field at index in a record_dtype array."""
+
+    return f'f{index}'
+
+
+def _field_dtype(field: MetaInfoField):
+    np = numpy()
+    data_type = field.data_type
+    if data_type == 'Bool':
+        return np.dtype([('value', 'u1')])
+    if data_type in _var_encodings:
+        return np.dtype([('value', '<u4')])
+    if data_type == 'String' or data_type == 'FixedDecimal':
+        value_format = f'S{field.size}'
+    elif data_type == 'WString':
+        value_format = f'S{field.size * 2}'
+    else:
+        value_format = _value_formats[data_type]
+    return np.dtype([('value', value_format), ('null', 'u1')])
+
+
+def new_columns(record: YxdbRecord) -> List:
+    columns = []
+    for index in range(len(record.fields)):
+        if index in record.dictionary_indices:
+            columns.append(_new_dictionary_column(record.fields[index], field_key(index), record.layouts[index]))
+        else:
+            columns.append(_new_column(record.fields[index], field_key(index), record.layouts[index], record.get_extractor(index)))
+    return columns
+
+
+def _new_dictionary_column(field: YxdbField, key: str, layout: FieldLayout):
+    data_type = layout.field.data_type
+    if data_type in _var_encodings:
+        return DictionaryVarColumn(field, layout.start, _var_encodings[data_type])
+    return DictionaryStringColumn(field, key, layout.field.size, 1 if data_type == 'String' else 2)
+
+
+def _new_column(field: YxdbField, key: str, layout: FieldLayout, extractor):
+    data_type = layout.field.data_type
+    if data_type in _numeric_types:
+        return NumericColumn(field, key)
+    if data_type == 'Bool':
+        return BoolColumn(field, key)
+    if data_type in _date_widths:
+        return DateColumn(field, key, _date_widths[data_type])
+    if data_type in _var_encodings:
+        return VarColumn(field, layout.start, _var_encodings[data_type])
+    if data_type == 'String' or data_type == 'WString':
+        return StringColumn(field, key, layout.field.size, 1 if data_type == 'String' else 2)
+    if data_type == 'FixedDecimal':
+        return FloatObjectColumn(field, extractor)
+    return ObjectColumn(field, extractor)
+
+
+class NumericColumn:
+    per_record = False
+
+    def __init__(self, field: YxdbField, key: str):
+        self.field = field
+        self.key = key
+
+    def finish(self, records) -> YxdbColumn:
+        view = records[self.key]
+        values = numpy().ascontiguousarray(view['value'])
+        return YxdbColumn(self.field, values, view['null'] == 1)
+
+
+class BoolColumn:
+    per_record = False
+
+    def __init__(self, field: YxdbField, key: str):
+        self.field = field
+        self.key = key
+
+    def finish(self, records) -> YxdbColumn:
+        flags = records[self.key]['value']
+        return YxdbColumn(self.field, flags == 1, flags == 2)
+
+
+class DateColumn:
+    per_record = False
+
+    def __init__(self, field: YxdbField, key: str, width: int):
+        self.field = field
+        self.key = key
+        self.width = width
+
+    def finish(self, records) -> YxdbColumn:
+        view = records[self.key]
+        nulls = view['null'] == 1
+        values = parse_dates(view['value'], self.width, nulls)
+        return YxdbColumn(self.field, values, nulls)
+
+
+def parse_dates(text, width: int, nulls):
+    """
+    Converts an array of fixed-layout YYYY-MM-DD or YYYY-MM-DD HH:MM:SS byte strings into datetime64[s].
+
+    The digits are decoded with vectorized arithmetic on the raw bytes. Null entries become NaT.
+    """
+    np = numpy()
+    raw = np.ascontiguousarray(text).view(np.uint8).reshape(len(text), width)
+    present = raw[~nulls]
+    kind = 'date' if width == 10 else 'date time'
+    separators = [(4, 45), (7, 45)] if width == 10 else [(4, 45), (7, 45), (10, 32), (13, 58), (16, 58)]
+    invalid = np.zeros(len(present), dtype=bool)
+    for position, separator in separators:
+        invalid |= present[:, position] != separator
+    _raise_invalid_date(present, invalid, kind)
+
+    digits = present.astype(np.int64) - 48
+    digit_positions = [0, 1, 2, 3, 5, 6, 8, 9] if width == 10 else [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+    checked = digits[:, digit_positions]
+    if ((checked < 0) | (checked > 9)).any():
+        raise ValueError("date contains an invalid digit")
+
+    year = (digits[:, 0] * 1000) + (digits[:, 1] * 100) + (digits[:, 2] * 10) + digits[:, 3]
+    month = (digits[:, 5] * 10) + digits[:, 6]
+    day = (digits[:, 8] * 10) + digits[:, 9]
+    leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    month_days = np.array(_days_in_month)[np.clip(month, 1, 12) - 1] + ((month == 2) & leap)
+    invalid = (year < 1) | (month < 1) | (month > 12) | (day < 1) | (day > month_days)
+    seconds = _days_from_civil(year, month, day) * 86400
+    if width == 19:
+        hour = (digits[:, 11] * 10) + digits[:, 12]
+        minute = (digits[:, 14] * 10) + digits[:, 15]
+        second = (digits[:, 17] * 10) + digits[:, 18]
+        invalid |= (hour > 23) | (minute > 59) | (second > 59)
+        seconds += (hour * 3600) + (minute * 60) + second
+    _raise_invalid_date(present, invalid, kind)
+
+    values = np.full(len(text), np.datetime64('NaT'), dtype='datetime64[s]')
+    values[~nulls] = seconds.view('datetime64[s]')
+    return values
+
+
+def _raise_invalid_date(raw, invalid, kind: str):
+    if invalid.any():
+        value = raw[invalid.argmax()].tobytes()
+        raise ValueError(f"'{str(value, 'latin1')}' is not a valid {kind}")
+
+
+def string_lengths(text, size: int, char_size: int):
+    """
+    Returns the byte length of every null-terminated value in an array of fixed-width String or WString fields.
+
+    The terminator is found for the whole column at once: a NUL byte for String fields and a NUL
+    UTF-16 code unit for WString fields. Values without a terminator fill the field.
+    """
+    np = numpy()
+    units = np.ascontiguousarray(text).view(np.uint8 if char_size == 1 else '<u2').reshape(len(text), size)
+    terminators = units == 0
+    return np.where(terminators.any(axis=1), terminators.argmax(axis=1), size) * char_size
+
+
+class StringColumn:
+    per_record = False
+
+    def __init__(self, field: YxdbField, key: str, size: int, char_size: int):
+        self.field = field
+        self.key = key
+        self.size = size
+        self.char_size = char_size
+        self.encoding = 'latin1' if char_size == 1 else 'utf_16_le'
+
+    def finish(self, records) -> YxdbColumn:
+        np = numpy()
+        view = records[self.key]
+        nulls = view['null'] == 1
+        text = np.ascontiguousarray(view['value'])
+        lengths = string_lengths(text, self.size, self.char_size)
+        data = text.tobytes()
+        width = self.size * self.char_size
+        encoding = self.encoding
+        values = np.empty(len(text), dtype=object)
+        values[:] = [None if is_null else str(data[offset:offset + length], encoding)
+                     for offset, length, is_null in zip(range(0, len(data), width), lengths.tolist(), nulls.tolist())]
+        return YxdbColumn(self.field, values, nulls)
+
+
+def _days_from_civil(year, month, day):
+    # days since 1970-01-01 in the proleptic Gregorian calendar (Howard Hinnant's algorithm)
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - (era * 400)
+    day_of_year = (((153 * (month + numpy().where(month > 2, -3, 9))) + 2) // 5) + day - 1
+    day_of_era = (year_of_era * 365) + (year_of_era // 4) - (year_of_era // 100) + day_of_year
+    return (era * 146097) + day_of_era - 719468
+
+
+class ObjectColumn:
+    per_record = False
+
+    def __init__(self, field: YxdbField, extractor):
+        self.field = field
+        self.extractor = extractor
+
+    def finish(self, records) -> YxdbColumn:
+        np = numpy()
+        extracted = self._extract(records)
+        values = np.empty(len(extracted), dtype=object)
+        values[:] = extracted
+        nulls = np.array([value is None for value in extracted], dtype=bool)
+        return YxdbColumn(self.field, values, nulls)
+
+    def _extract(self, records) -> List:
+        fixed_size = records.dtype.itemsize
+        raw = memoryview(records.view(numpy().uint8))
+        extractor = self.extractor
+        return [extractor(raw[offset:offset + fixed_size]) for offset in range(0, len(raw), fixed_size)]
+
+
+class FloatObjectColumn(ObjectColumn):
+    def finish(self, records) -> YxdbColumn:
+        np = numpy()
+        extracted = self._extract(records)
+        nulls = np.array([value is None for value in extracted], dtype=bool)
+        values = np.array([0.0 if value is None else value for value in extracted], dtype=np.float64)
+        return YxdbColumn(self.field, values, nulls)
+
+
+class VarColumn:
+    per_record = True
+
+    def __init__(self, field: YxdbField, start: int, encoding: str):
+        self.field = field
+        self.start = start
+        self.encoding = encoding
+        self.data = bytearray()
+        self.offsets = [0]
+        self.null_flags = []
+
+    def append(self, buffer: memoryview):
+        span = get_blob_span(buffer, self.start)
+        if span is None:
+            self.null_flags.append(True)
+        else:
+            self.null_flags.append(False)
+            self.data += buffer[span[0]:span[1]]
+        self.offsets.append(len(self.data))
+
+    def finish(self, records) -> YxdbColumn:
+        np = numpy()
+        data = memoryview(self.data)
+        values = np.empty(len(self.null_flags), dtype=object)
+        for index, is_null in enumerate(self.null_flags):
+            if is_null:
+                continue
+            value = data[self.offsets[index]:self.offsets[index + 1]].tobytes()
+            values[index] = value if self.encoding is None else str(value, self.encoding)
+        return YxdbColumn(self.field, values, np.array(self.null_flags, dtype=bool))
+
+
+class DictionaryVarColumn:
+    """Interns the raw bytes of a V_String or V_WString field, decoding each distinct value once."""
+
+    per_record = True
+
+    def __init__(self, field: YxdbField, start: int, encoding: str):
+        self.field = field
+        self.start = start
+        self.encoding = encoding
+        self.lookup = {}
+        self.codes = []
+
+    def append(self, buffer: memoryview):
+        span = get_blob_span(buffer, self.start)
+        if span is None:
+            self.codes.append(-1)
+            return
+        key = buffer[span[0]:span[1]].tobytes()
+        code = self.lookup.get(key)
+        if code is None:
+            code = len(self.lookup)
+            self.lookup[key] = code
+        self.codes.append(code)
+
+    def finish(self, records) -> YxdbColumn:
+        np = numpy()
+        codes = np.array(self.codes, dtype=np.int32)
+        dictionary = np.empty(len(self.lookup), dtype=object)
+        dictionary[:] = [str(key, self.encoding) for key in self.lookup]
+        return YxdbColumn(self.field, codes, codes < 0, dictionary)
+
+
+class DictionaryStringColumn:
+    """Finds the distinct raw values of a String or WString field with NumPy and decodes each one once."""
+
+    per_record = False
+
+    def __init__(self, field: YxdbField, key: str, size: int, char_size: int):
+        self.field = field
+        self.key = key
+        self.size = size
+        self.char_size = char_size
+
+    def finish(self, records) -> YxdbColumn:
+        np = numpy()
+        view = records[self.key]
+        nulls = view['null'] == 1
+        width = self.size * self.char_size
+        unique, inverse = np.unique(view['value'][~nulls], return_inverse=True)
+        lookup = {}
+        remap = np.empty(len(unique), dtype=np.int32)
+        for position, value in enumerate(unique):
+            # numpy strips trailing zero bytes, and bytes after the terminator may differ between equal strings
+            text = _get_string(memoryview(value.ljust(width, b'\x00')), 0, self.size, self.char_size)
+            remap[position] = lookup.setdefault(text, len(lookup))
+        codes = np.full(len(view), -1, dtype=np.int32)
+        codes[~nulls] = remap[inverse.reshape(-1)]
+        dictionary = np.empty(len(lookup), dtype=object)
+        dictionary[:] = list(lookup)
+        return YxdbColumn(self.field, codes, nulls, dictionary)
@@ -1,5 +1,11 @@
 import datetime
 import struct
+from typing import Dict
+
+from yxdb.lazy_value import LazyBytes, LazyString
+
+date_cache_size = 65536
+string_chunk_size = 64
 
 
 def new_bool_extractor(start: int):
@@ -68,19 +74,39 @@ def new_double_extractor(start: int):
     return e
 
 
-def new_date_extractor(start: int):
+def new_date_extractor(start: int, cache: Dict[bytes, datetime.datetime] = None):
+    if cache is not None:
+        return _new_cached_date_extractor(start, 10, _parse_date, cache)
+
     def e(buffer: memoryview):
         if buffer[start+10] == 1:
             return None
-        return _parse_date(buffer, start, 10, "%Y-%m-%d")
+        return _parse_date(buffer, start)
     return e
 
 
-def new_date_time_extractor(start: int):
+def new_date_time_extractor(start: int, cache: Dict[bytes, datetime.datetime] = None):
+    if cache is not None:
+        return _new_cached_date_extractor(start, 19, _parse_date_time, cache)
+
     def e(buffer: memoryview):
         if buffer[start+19] == 1:
             return None
-        return _parse_date(buffer, start, 19, "%Y-%m-%d %H:%M:%S")
+        return _parse_date_time(buffer, start)
+    return e
+
+
+def _new_cached_date_extractor(start: int, length: int, parse, cache: Dict[bytes, datetime.datetime]):
+    def e(buffer: memoryview):
+        if buffer[start+length] == 1:
+            return None
+        key = buffer[start:start+length].tobytes()
+        value = cache.get(key)
+        if value is None:
+            value = parse(buffer, start)
+            if len(cache) < date_cache_size:
+                cache[key] = value
+        return value
     return e
 
 
@@ -124,74 +150,144 @@ def new_blob_extractor(start: int):
     return e
 
 
-def _parse_date(buffer: memoryview, start: int, length: int, fmt: str):
-    value = str(buffer[start:start+length].tobytes(), 'latin1')
-    return datetime.datetime.strptime(value, fmt)
+def new_lazy_v_string_extractor(start: int):
+    return _new_lazy_extractor(start, lambda view: LazyString(view, 'latin1'))
+
+
+def new_lazy_v_wstring_extractor(start: int):
+    return _new_lazy_extractor(start, lambda view: LazyString(view, 'utf_16_le'))
+
+
+def new_lazy_blob_extractor(start: int):
+    return _new_lazy_extractor(start, LazyBytes)
+
+
+def _new_lazy_extractor(start: int, wrap):
+    def e(buffer: memoryview):
+        span = get_blob_span(buffer, start)
+        if span is None:
+            return None
+        return wrap(buffer[span[0]:span[1]])
+    return e
+
+
+def _parse_date(buffer: memoryview, start: int) -> datetime.datetime:
+    # the layout is always YYYY-MM-DD, so the digits are decoded directly instead of using strptime
+    if buffer[start+4] != 45 or buffer[start+7] != 45:
+        raise ValueError(f"'{str(buffer[start:start+10].tobytes(), 'latin1')}' is not a valid date")
+    return datetime.datetime(_parse_digits(buffer, start, 4), _parse_2_digits(buffer, start+5), _parse_2_digits(buffer, start+8))
+
+
+def _parse_date_time(buffer: memoryview, start: int) -> datetime.datetime:
+    # the layout is always YYYY-MM-DD HH:MM:SS
+    if buffer[start+4] != 45 or buffer[start+7] != 45 or buffer[start+10] != 32 or buffer[start+13] != 58 or buffer[start+16] != 58:
+        raise ValueError(f"'{str(buffer[start:start+19].tobytes(), 'latin1')}' is not a valid date time")
+    return datetime.datetime(
+        _parse_digits(buffer, start, 4),
+        _parse_2_digits(buffer, start+5),
+        _parse_2_digits(buffer, start+8),
+        _parse_2_digits(buffer, start+11),
+        _parse_2_digits(buffer, start+14),
+        _parse_2_digits(buffer, start+17),
+    )
+
+
+def _parse_2_digits(buffer: memoryview, start: int) -> int:
+    tens = buffer[start] - 48
+    ones = buffer[start+1] - 48
+    if tens < 0 or tens > 9 or ones < 0 or ones > 9:
+        raise ValueError("date contains an invalid digit")
+    return tens * 10 + ones
+
+
+def _parse_digits(buffer: memoryview, start: int, count: int) -> int:
+    value = 0
+    for i in range(start, start+count):
+        digit = buffer[i] - 48
+        if digit < 0 or digit > 9:
+            raise ValueError("date contains an invalid digit")
+        value = (value * 10) + digit
+    return value
 
 
 def _get_string(buffer: memoryview, start: int, field_len: int, char_size: int):
-    end = _get_end_of_string_pos(buffer, start, field_len, char_size)
+    # copy the field in growing chunks so short values in wide fields stop at the terminator
+    end = start + (field_len * char_size)
+    raw = b''
+    chunk = string_chunk_size
+    while start < end:
+        part = buffer[start:min(end, start + chunk)].tobytes()
+        length = find_terminator(part, char_size)
+        raw += part[:length]
+        if length < len(part):
+            break
+        start += chunk
+        chunk *= 2
     if char_size == 1:
-        return str(buffer[start:end].tobytes(), 'latin1')
+        return str(raw, 'latin1')
     else:
-        return str(buffer[start:end].tobytes(), 'utf_16_le')
+        return str(raw, 'utf_16_le')
 
 
-def _get_end_of_string_pos(buffer: memoryview, start: int, field_len: int, char_size: int):
-    field_to = start + (field_len * char_size)
-    str_len = 0
-    i = start
-    while i < field_to:
-        if buffer[i] == 0 and buffer[i + (char_size-1)] == 0:
-            break
-        str_len += 1
-        i += char_size
-    return start + (str_len * char_size)
+def find_terminator(raw: bytes, char_size: int) -> int:
+    """Returns the byte length of a null-terminated String (char_size 1) or WString (char_size 2) value."""
+    if char_size == 1:
+        end = raw.find(0)
+        return len(raw) if end < 0 else end
+    # a UTF-16 terminator must start on a character boundary
+    end = raw.find(b'\x00\x00')
+    while end > 0 and end % 2 == 1:
+        end = raw.find(b'\x00\x00', end + 1)
+    return len(raw) if end < 0 else end
 
 
 def _parse_blob(buffer: memoryview, start: int) -> bytes:
+    span = get_blob_span(buffer, start)
+    if span is None:
+        return None
+    blob_start, blob_end = span
+    return buffer[blob_start:blob_end].tobytes()
+
+
+def get_blob_span(buffer: memoryview, start: int):
     fixed_portion = int.from_bytes(buffer[start:start+4], 'little')
     if fixed_portion == 0:
-        return bytearray(0)
+        return start, start
     if fixed_portion == 1:
         return None
 
     if _is_tiny(fixed_portion):
-        return _get_tiny_blob(start, buffer)
+        return _get_tiny_blob_span(start, fixed_portion)
 
     block_start = start + (fixed_portion & 0x7fffffff)
     block_first_byte = buffer[block_start]
     if _is_small_block(block_first_byte):
-        return _get_small_blob(buffer, block_start)
+        return _get_small_blob_span(buffer, block_start)
     else:
-        return _get_normal_blob(buffer, block_start)
+        return _get_normal_blob_span(buffer, block_start)
 
 
 def _is_tiny(fixed_portion: int) -> bool:
     return fixed_portion & 0x80000000 == 0 and fixed_portion & 0x30000000 != 0
 
 
-def _get_tiny_blob(start: int, buffer: memoryview) -> bytes:
-    value = int.from_bytes(buffer[start:start+4], 'little')
-    length = value >> 28
-    end = start + length
-    return buffer[start:end].tobytes()
+def _get_tiny_blob_span(start: int, fixed_portion: int):
+    length = fixed_portion >> 28
+    return start, start + length
 
 
 def _is_small_block(value) -> bool:
     return (value & 1) == 1
 
 
-def _get_small_blob(buffer: memoryview, block_start: int) -> bytes:
+def _get_small_blob_span(buffer: memoryview, block_start: int):
     first_byte = buffer[block_start]
     blob_len = first_byte >> 1
     blob_start = block_start + 1
-    blob_end = blob_start + blob_len
-    return buffer[blob_start:blob_end].tobytes()
+    return blob_start, blob_start + blob_len
 
 
-def _get_normal_blob(buffer: memoryview, block_start: int):
+def _get_normal_blob_span(buffer: memoryview, block_start: int):
     blob_len = int(int.from_bytes(buffer[block_start:block_start+4], 'little') / 2)
     blob_start = block_start + 4
-    blob_end = blob_start + blob_len
-    return buffer[blob_start:blob_end].tobytes()
+    return blob_start, blob_start + blob_len
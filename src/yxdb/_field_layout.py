@@ -0,0 +1,7 @@
+from yxdb._metainfo_field import MetaInfoField
+
+
+class FieldLayout:
+    def __init__(self, field: MetaInfoField, start: int):
+        self.field = field
+        self.start = start
@@ -0,0 +1,154 @@
+import operator
+import struct
+from typing import List
+
+from yxdb import _columnar
+from yxdb._field_layout import FieldLayout
+from yxdb._record_encoder import date_bytes
+from yxdb._row_decoder import struct_formats, struct_sizes
+from yxdb._yxdb_record import YxdbRecord, var_types
+
+_comparisons = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+_null_tests = {'is_null', 'is_not_null'}
+
+_date_widths = {
+    'Date': 10,
+    'DateTime': 19,
+}
+
+
+class RowFilter:
+    """
+    RowFilter evaluates a list of conditions against the raw bytes of a record.
+
+    Each condition is a tuple of (field, operator, value) or (field, 'is_null') / (field, 'is_not_null'),
+    where field is a field name or index. Supported operators are ==, !=, <, <=, > and >=. A record
+    matches when every condition is true; null values never satisfy a comparison.
+
+    Comparisons are supported on numeric, Byte, Bool, Date and DateTime fields. Null tests are
+    supported on every field.
+    """
+
+    def __init__(self, record: YxdbRecord, conditions: List[tuple]):
+        self.conditions = []
+        for condition in conditions:
+            layout = record.layouts[record.get_index(condition[0])]
+            op = condition[1]
+            if op in _null_tests:
+                self.conditions.append((layout, op, None))
+                continue
+            if op not in _comparisons:
+                raise Exception(f"'{op}' is not a valid filter operator")
+            self.conditions.append((layout, op, _constant(layout, op, condition[2])))
+        self.matches = self._compile()
+
+    def mask(self, records):
+        """Returns a boolean NumPy array that is True for every row of a record_dtype array that matches."""
+
+        np = _columnar.numpy()
+        raw = records.view(np.uint8).reshape(len(records), records.dtype.itemsize)
+        mask = np.ones(len(records), dtype=bool)
+        for layout, op, value in self.conditions:
+            field_dtype = _columnar._field_dtype(layout.field)
+            width = field_dtype.itemsize
+            view = np.ascontiguousarray(raw[:, layout.start:layout.start + width]).view(field_dtype).reshape(len(records))
+            nulls = _null_mask(layout, view)
+            if op == 'is_null':
+                mask &= nulls
+            elif op == 'is_not_null':
+                mask &= ~nulls
+            else:
+                flags = view['value']
+                if layout.field.data_type == 'Bool':
+                    flags = flags == 1
+                elif layout.field.data_type == 'Float':
+                    # the row path widens Float values to Python floats, so compare in the same precision
+                    flags = flags.astype('f8')
+                mask &= ~nulls & _comparisons[op](flags, value)
+        return mask
+
+    def _compile(self):
+        namespace = {}
+        expressions = []
+        for index, (layout, op, value) in enumerate(self.conditions):
+            null_expression = _null_expression(namespace, layout)
+            if op == 'is_null':
+                expressions.append(f'({null_expression})')
+                continue
+            if op == 'is_not_null':
+                expressions.append(f'not ({null_expression})')
+                continue
+            namespace[f'c{index}'] = value
+            expressions.append(f'not ({null_expression}) and ({_value_expression(namespace, layout)} {op} c{index})')
+        body = ' and '.join(expressions) if expressions else 'True'
+        exec(f'def matches(buffer):\n    return {body}', namespace)
+        return namespace['matches']
+
+
+def _constant(layout: FieldLayout, op: str, value):
+    data_type = layout.field.data_type
+    if data_type in struct_formats:
+        return value
+    if data_type == 'Bool':
+        if op not in ('==', '!='):
+            raise TypeError(f"Bool field '{layout.field.name}' only supports == and != in a filter")
+        return bool(value)
+    if data_type in _date_widths:
+        try:
+            return date_bytes(value, _date_widths[data_type])
+        except TypeError:
+            raise TypeError("date filters require a str, datetime.date or datetime.datetime value")
+    raise TypeError(f"{data_type} field '{layout.field.name}' cannot be compared in a filter")
+
+
+def _value_width(layout: FieldLayout) -> int:
+    data_type = layout.field.data_type
+    if data_type in struct_sizes:
+        return struct_sizes[data_type]
+    if data_type in _date_widths:
+        return _date_widths[data_type]
+    if data_type == 'WString':
+        return layout.field.size * 2
+    return layout.field.size
+
+
+def _null_expression(namespace: dict, layout: FieldLayout) -> str:
+    start = layout.start
+    data_type = layout.field.data_type
+    if data_type == 'Bool':
+        return f'buffer[{start}] == 2'
+    if data_type in var_types:
+        namespace['unpack_uint32'] = struct.Struct('<I').unpack_from
+        return f'unpack_uint32(buffer, {start})[0] == 1'
+    return f'buffer[{start + _value_width(layout)}] == 1'
+
+
+def _value_expression(namespace: dict, layout: FieldLayout) -> str:
+    start = layout.start
+    data_type = layout.field.data_type
+    if data_type == 'Byte':
+        return f'buffer[{start}]'
+    if data_type == 'Bool':
+        return f'(buffer[{start}] == 1)'
+    if data_type in _date_widths:
+        return f'bytes(buffer[{start}:{start + _date_widths[data_type]}])'
+    name = f'unpack_{data_type.lower()}'
+    namespace[name] = struct.Struct('<' + struct_formats[data_type]).unpack_from
+    return f'{name}(buffer, {start})[0]'
+
+
+def _null_mask(layout: FieldLayout, view):
+    data_type = layout.field.data_type
+    if data_type == 'Bool':
+        return view['value'] == 2
+    if data_type in var_types:
+        return view['value'] == 1
+    return view['null'] == 1
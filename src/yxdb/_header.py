@@ -0,0 +1,88 @@
+import xml.etree.ElementTree as ET
+from typing import List
+from xml.sax.saxutils import escape
+
+from yxdb._metainfo_field import MetaInfoField
+
+header_size = 512
+invalid_yxdb_msg = "file is not a valid YXDB format"
+
+_file_description = b'Alteryx Database File'
+_file_id = 0x00440204
+_compression_version = 1
+_attribute_entities = {'"': '&quot;'}
+_sized_types = {'String', 'WString', 'V_String', 'V_WString', 'FixedDecimal', 'Blob', 'SpatialObj'}
+
+
+class Header:
+    def __init__(self, buffer: memoryview):
+        self.file_type = str(bytes(buffer[0:21]), 'latin1')
+        self.meta_info_size = int.from_bytes(buffer[80:84], 'little')
+        self.spatial_index_pos = int.from_bytes(buffer[88:96], 'little')
+        self.record_block_index_pos = int.from_bytes(buffer[96:104], 'little')
+        self.num_records = int.from_bytes(buffer[104:108], 'little')
+
+    def is_valid(self) -> bool:
+        return self.file_type == "Alteryx Database File"
+
+    def first_block_pos(self) -> int:
+        return header_size + (self.meta_info_size * 2)
+
+    def records_end_pos(self) -> int:
+        if self.spatial_index_pos != 0:
+            return self.spatial_index_pos
+        return self.record_block_index_pos
+
+
+def build_header(meta_info_size: int, record_block_index_pos: int, num_records: int, created: int) -> bytes:
+    header = bytearray(header_size)
+    header[0:len(_file_description)] = _file_description
+    header[64:68] = _file_id.to_bytes(4, 'little')
+    header[68:72] = created.to_bytes(4, 'little')
+    header[80:84] = meta_info_size.to_bytes(4, 'little')
+    header[96:104] = record_block_index_pos.to_bytes(8, 'little')
+    header[104:112] = num_records.to_bytes(8, 'little')
+    header[112:116] = _compression_version.to_bytes(4, 'little')
+    return bytes(header)
+
+
+def format_fields(fields: List[MetaInfoField]) -> str:
+    lines = ['<RecordInfo>']
+    for field in fields:
+        attributes = 'name="' + escape(field.name, _attribute_entities) + '"'
+        if field.data_type in _sized_types:
+            attributes += f' size="{field.size}"'
+        if field.data_type == 'FixedDecimal':
+            attributes += f' scale="{field.scale}"'
+        lines.append(f'\t<Field {attributes} type="{field.data_type}"/>')
+    lines.append('</RecordInfo>')
+    return '\n'.join(lines) + '\n'
+
+
+def parse_fields(meta_info_str: str) -> List[MetaInfoField]:
+    root = ET.fromstring(meta_info_str)
+    if root.tag == "RecordInfo":
+        record_info = root
+    else:
+        record_info = root.find("RecordInfo")
+    fields = []
+    for field in record_info.iter(tag="Field"):
+        name = _parse_string(field.get("name"))
+        data_type = _parse_string(field.get("type"))
+        size = _parse_int(field.get("size"))
+        scale = _parse_int(field.get("scale"))
+
+        fields.append(MetaInfoField(name, data_type, size, scale))
+    return fields
+
+
+def _parse_int(value) -> int:
+    if value is None:
+        return 0
+    return int(value)
+
+
+def _parse_string(value) -> str:
+    if value is None:
+        raise IOError("YXDB metadata is invalid")
+    return value
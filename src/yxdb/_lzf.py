@@ -1,3 +1,9 @@
+try:
+    import lzf as _native_lzf
+except ImportError:
+    _native_lzf = None
+
+
 class Lzf:
     def __init__(self, in_bytes: memoryview, out_bytes: memoryview):
         self.in_bytes = in_bytes
@@ -62,3 +68,162 @@ class Lzf:
         self.out_bytes[self.oidx:self.oidx+size] = self.out_bytes[reference:reference+size]
         self.oidx += size
         return reference + size
+
+    def compress(self, length: int, tight: bool = False) -> int:
+        """
+        Compresses the first length bytes of in_bytes into out_bytes and returns the compressed size.
+
+        Raises AttributeError when the compressed block does not fit into out_bytes.
+        """
+        compressed = _compress(bytes(self.in_bytes[:length]), len(self.out_bytes) + 1, tight)
+        if compressed is None:
+            raise AttributeError
+        self.out_bytes[:len(compressed)] = compressed
+        return len(compressed)
+
+
+class NativeLzf:
+    """
+    Decompresses LZF blocks using the compiled python-lzf extension.
+
+    NativeLzf has the same interface as Lzf and raises the same AttributeError
+    when the decompressed block does not fit into the output buffer.
+    """
+
+    def __init__(self, in_bytes: memoryview, out_bytes: memoryview):
+        if _native_lzf is None:
+            raise ImportError("the native LZF backend requires the 'python-lzf' package")
+        self.in_bytes = in_bytes
+        self.out_bytes = out_bytes
+
+    def decompress(self, length: int) -> int:
+        if length == 0:
+            return 0
+
+        decompressed = _native_lzf.decompress(self.in_bytes[:length].tobytes(), len(self.out_bytes))
+        if decompressed is None:
+            raise AttributeError
+
+        written = len(decompressed)
+        self.out_bytes[:written] = decompressed
+        return written
+
+    def compress(self, length: int, tight: bool = False) -> int:
+        """Compresses like Lzf.compress. The compiled compressor has a single mode, so tight is ignored."""
+        if length == 0 or len(self.out_bytes) == 0:
+            raise AttributeError
+
+        compressed = _native_lzf.compress(self.in_bytes[:length].tobytes(), len(self.out_bytes))
+        if compressed is None:
+            raise AttributeError
+
+        written = len(compressed)
+        self.out_bytes[:written] = compressed
+        return written
+
+
+backends = {'python': Lzf}
+if _native_lzf is not None:
+    backends['native'] = NativeLzf
+
+default_backend = NativeLzf if _native_lzf is not None else Lzf
+
+
+def new_lzf(in_bytes: memoryview, out_bytes: memoryview, backend=None):
+    """
+    Creates an LZF decompressor over the provided buffers.
+
+    backend is any callable taking (in_bytes, out_bytes) and returning an object with a
+    decompress(length) -> int method. When omitted, the native backend is used if
+    python-lzf is installed and the pure Python Lzf class is used otherwise.
+    """
+    if backend is None:
+        backend = default_backend
+    return backend(in_bytes, out_bytes)
+
+
+def compress_block(data: bytes, backend=None, tight: bool = False):
+    """
+    Compresses a block of record data.
+
+    Returns None when the compressed block would not be smaller than data; the caller then stores
+    the block uncompressed with the 0x80000000 flag. backend is chosen like in new_lzf, and tight
+    makes the pure Python compressor search harder for matches.
+    """
+    if len(data) < 2:
+        return None
+    out_bytes = memoryview(bytearray(len(data) - 1))
+    lzf = new_lzf(memoryview(data), out_bytes, backend)
+    try:
+        written = lzf.compress(len(data), tight)
+    except AttributeError:
+        return None
+    return out_bytes[:written].tobytes()
+
+
+_max_literals = 32
+_max_match = 264
+_max_distance = 8192
+
+
+def _compress(data: bytes, limit: int, tight: bool):
+    # Matches are found through a hash table keyed by the next 3 bytes. The fast mode only records
+    # the position where a match starts and the last position it covers; the tight mode records
+    # every position and defers a match by one byte when the next position has a longer one.
+    out = bytearray()
+    table = {}
+    length = len(data)
+    end = length - 2
+    literal_start = 0
+    index = 0
+    while index < end:
+        key = data[index:index + 3]
+        reference = table.get(key)
+        table[key] = index
+        if reference is None or index - reference > _max_distance:
+            index += 1
+            continue
+        match = _match_length(data, reference, index, min(length - index, _max_match))
+        if tight and index + 1 < end:
+            next_reference = table.get(data[index + 1:index + 4])
+            if next_reference is not None and index + 1 - next_reference <= _max_distance and \
+                    _match_length(data, next_reference, index + 1, min(length - index - 1, _max_match)) > match + 1:
+                index += 1
+                continue
+        _append_literals(out, data, literal_start, index)
+        distance = index - reference - 1
+        encoded_length = match - 2
+        if encoded_length < 7:
+            out.append((encoded_length << 5) | (distance >> 8))
+        else:
+            out.append(0xe0 | (distance >> 8))
+            out.append(encoded_length - 7)
+        out.append(distance & 0xff)
+        if len(out) >= limit:
+            return None
+        if tight:
+            for position in range(index + 1, min(index + match, end)):
+                table[data[position:position + 3]] = position
+        elif index + match - 1 < end:
+            table[data[index + match - 1:index + match + 2]] = index + match - 1
+        index += match
+        literal_start = index
+    _append_literals(out, data, literal_start, length)
+    return out if len(out) < limit else None
+
+
+def _match_length(data: bytes, reference: int, index: int, max_length: int) -> int:
+    match = 3
+    while match + 16 <= max_length and data[reference + match:reference + match + 16] == data[index + match:index + match + 16]:
+        match += 16
+    while match < max_length and data[reference + match] == data[index + match]:
+        match += 1
+    return match
+
+
+def _append_literals(out: bytearray, data: bytes, start: int, stop: int):
+    while start < stop:
+        count = min(stop - start, _max_literals)
+        out.append(count - 1)
+        out += data[start:start + count]
+        start += count
@@ -0,0 +1,65 @@
+import mmap
+from io import BytesIO
+
+from yxdb._buffered_record_reader import BufferedRecordReader
+
+
+class MmapRecordReader(BufferedRecordReader):
+    """
+    MmapRecordReader reads LZF blocks directly from a memory map of the YXDB file.
+
+    Compressed blocks are handed to the decompressor as slices of the map, and uncompressed
+    blocks are served straight from the map without being copied.
+    """
+
+    def __init__(self, stream: BytesIO, *args, **kwargs):
+        super().__init__(stream, *args, **kwargs)
+        self.position = stream.tell()
+        self._map(stream)
+
+    def close(self):
+        self._set_lzf_buffers(self.lzf_in, self.lzf_out)
+        self._release_lzf_buffers()
+        self.view.release()
+        try:
+            self.mmap.close()
+        except BufferError:
+            # a caller still holds a view into the map; it is unmapped when that view is collected
+            pass
+        self.stream.close()
+
+    def reopen(self, stream: BytesIO):
+        super().reopen(stream)
+        self._map(stream)
+
+    def seek(self, position: int, current_record: int):
+        self.position = position
+        self.current_record = current_record
+        self.lzf_out_size = 0
+        self.lzf_out_index = 0
+
+    def _map(self, stream: BytesIO):
+        self.mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mmap)
+
+    def _read_next_lzf_block(self) -> int:
+        lzf_block_length = self._read_lzf_block_length()
+        start = self.position
+        checkbit = lzf_block_length & 0x80000000
+        if checkbit > 0:
+            lzf_block_length &= 0x7fffffff
+            self.position += lzf_block_length
+            self.block = self.view[start:self.position]
+            return len(self.block)
+        else:
+            self.position += lzf_block_length
+            self.lzf.in_bytes = self.view[start:self.position]
+            self.block = self.lzf_out
+            return self._decompress(len(self.lzf.in_bytes))
+
+    def _read_lzf_block_length(self):
+        start = self.position
+        self.position += 4
+        if self.position > len(self.view):
+            raise IOError
+        return int.from_bytes(self.view[start:self.position], "little")
@@ -0,0 +1,53 @@
+from typing import List
+
+from yxdb._utility import import_optional
+from yxdb.yxdb_batch import YxdbColumn
+from yxdb.yxdb_reader import YxdbReader
+
+_integer_types = {'Int16', 'Int32', 'Int64', 'Byte'}
+
+_float_types = {'Float', 'Double', 'FixedDecimal'}
+
+_string_types = {'String', 'WString', 'V_String', 'V_WString'}
+
+
+def pandas():
+    return import_optional('pandas', 'pandas')
+
+
+def read_dataframe(path: str, columns: List = None, nrows: int = None, filter: List = None, dictionary: List = None):
+    """
+    Reads a YXDB file into a pandas DataFrame.
+
+    :param path: The path to a YXDB file
+    :param columns: An optional list of field names or indices to read. Other fields are not decoded.
+    :param nrows: An optional maximum number of records to read
+    :param filter: An optional list of conditions records must match, see YxdbReader
+    :param dictionary: An optional list of string field names or indices to read as pandas Categorical columns
+    :return: A DataFrame with one column per field, using nullable pandas dtypes for null values
+    """
+    pd = pandas()
+    yxdb = YxdbReader(path=path, columns=columns, filter=filter, dictionary=dictionary)
+    try:
+        n = yxdb.num_records if nrows is None else min(nrows, yxdb.num_records)
+        batch = yxdb.read_batch(n)
+        data = {}
+        for column, layout in zip(batch.columns, yxdb._record.layouts):
+            data[column.name] = _to_series(pd, column, layout.field.data_type)
+        return pd.DataFrame(data, columns=[column.name for column in batch.columns])
+    finally:
+        yxdb.close()
+
+
+def _to_series(pd, column: YxdbColumn, data_type: str):
+    if column.dictionary is not None:
+        return pd.Series(pd.Categorical.from_codes(column.values, categories=column.dictionary))
+    if data_type in _integer_types:
+        return pd.Series(pd.arrays.IntegerArray(column.values, column.nulls))
+    if data_type in _float_types:
+        return pd.Series(pd.arrays.FloatingArray(column.values, column.nulls))
+    if data_type == 'Bool':
+        return pd.Series(pd.arrays.BooleanArray(column.values, column.nulls))
+    if data_type in _string_types:
+        return pd.Series(pd.array(column.values, dtype='string'))
+    return pd.Series(column.values)
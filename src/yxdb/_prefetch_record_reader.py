@@ -0,0 +1,133 @@
+import queue
+import threading
+import weakref
+from io import BytesIO
+
+from yxdb._buffered_record_reader import BufferedRecordReader, decompress_growing
+from yxdb._utility import memview
+
+
+class PrefetchRecordReader(BufferedRecordReader):
+    """
+    PrefetchRecordReader reads and decompresses LZF blocks on a background thread.
+
+    The thread fills up to read_ahead blocks ahead of the consumer. Blocks are decompressed into a
+    fixed pool of buffers; a buffer goes back to the pool when the consumer moves on to the next
+    block, so memory use is bounded no matter how far behind the consumer falls.
+    """
+
+    def __init__(self, stream: BytesIO, *args, read_ahead: int = 4, end_position: int = None, **kwargs):
+        super().__init__(stream, *args, **kwargs)
+        self.read_ahead = max(1, read_ahead)
+        self.end_position = end_position
+        self._free = queue.Queue()
+        for _ in range(self.read_ahead + 1):
+            self._free.put(memview(self.lzf_buffer_size))
+        self._ready = queue.Queue()
+        self._held = None
+        self._worker: threading.Thread = None
+        self._stopping = False
+        self._resume_position = 0
+        # wakes a worker parked on the free queue when the reader is dropped without close()
+        weakref.finalize(self, self._free.put, None)
+
+    def close(self):
+        self._stop_worker()
+        super().close()
+
+    def seek(self, position: int, current_record: int):
+        self._stop_worker()
+        super().seek(position, current_record)
+
+    def release_stream(self):
+        # the block being consumed is kept, and the stream is moved back to the first block the
+        # consumer has not received so a restarted worker picks up where the consumer left off
+        if self._worker is None:
+            return
+        self._stop_worker(keep_held=True)
+        self.stream.seek(self._resume_position)
+
+    def _read_next_lzf_block(self) -> int:
+        if self._worker is None:
+            self._start_worker()
+        if self._held is not None:
+            self._free.put(self._held)
+            self._held = None
+        item = self._ready.get()
+        if isinstance(item, Exception):
+            # the worker exits after posting an error, so the next read restarts it at the failed block
+            self._stop_worker()
+            self.stream.seek(self._resume_position)
+            raise item
+        self._held, length, self._resume_position = item
+        self.block = self._held
+        return length
+
+    def _start_worker(self):
+        self._stopping = False
+        self._resume_position = self.stream.tell()
+        # the worker only holds a weak reference so a dropped reader can be collected
+        self._worker = threading.Thread(target=_fill, args=(weakref.ref(self), self._free, self._ready, self._resume_position, self.end_position), daemon=True)
+        self._worker.start()
+
+    def _stop_worker(self, keep_held: bool = False):
+        if self._worker is None:
+            return
+        self._stopping = True
+        self._free.put(None)
+        self._worker.join()
+        self._worker = None
+        buffers = []
+        if not keep_held and self._held is not None:
+            buffers.append(self._held)
+            self._held = None
+        while not self._ready.empty():
+            item = self._ready.get()
+            if not isinstance(item, Exception):
+                buffers.append(item[0])
+        while not self._free.empty():
+            buffer = self._free.get()
+            if buffer is not None:
+                buffers.append(buffer)
+        for buffer in buffers:
+            self._free.put(buffer)
+        if not keep_held:
+            self.block = self.lzf_out
+
+    def _read_block_into(self, buffer: memoryview):
+        lzf_block_length = self._read_lzf_block_length()
+        checkbit = lzf_block_length & 0x80000000
+        if checkbit > 0:
+            lzf_block_length &= 0x7fffffff
+            if lzf_block_length > len(buffer):
+                buffer = memview(lzf_block_length)
+            read = self.stream.readinto(buffer[:lzf_block_length])
+            return buffer, read, read
+        if lzf_block_length > len(self.lzf_in):
+            self.lzf_in = memview(lzf_block_length)
+            self.lzf.in_bytes = self.lzf_in
+        read_in = self.stream.readinto(self.lzf_in[:lzf_block_length])
+        self.lzf.out_bytes = buffer
+        length = decompress_growing(self.lzf, read_in)
+        return self.lzf.out_bytes, length, read_in
+
+
+def _fill(reader_ref, free: queue.Queue, ready: queue.Queue, position: int, end_position: int):
+    while end_position is None or position < end_position:
+        buffer = free.get()
+        reader = reader_ref()
+        if buffer is None or reader is None or reader._stopping:
+            if buffer is not None:
+                free.put(buffer)
+            return
+        try:
+            buffer, length, read = reader._read_block_into(buffer)
+        except Exception as ex:
+            free.put(buffer)
+            ready.put(ex)
+            return
+        finally:
+            del reader
+        position += 4 + read
+        ready.put((buffer, length, position))
+    ready.put(IOError("read past the last record block"))
@@ -0,0 +1,236 @@
+import datetime
+import struct
+from typing import Callable, List
+
+from yxdb import _columnar
+from yxdb._yxdb_record import YxdbRecord
+
+_struct_formats = {
+    'Int16': '<h',
+    'Int32': '<i',
+    'Int64': '<q',
+    'Float': '<f',
+    'Double': '<d',
+}
+
+_date_widths = {
+    'Date': 10,
+    'DateTime': 19,
+}
+
+_var_encodings = {
+    'V_String': 'latin1',
+    'V_WString': 'utf_16_le',
+    'Blob': None,
+    'SpatialObj': None,
+}
+
+
+def new_row_encoder(record: YxdbRecord) -> Callable[[list], bytes]:
+    """
+    Creates a function that encodes a sequence of values, one per field, into the bytes of a record.
+
+    None values are written as nulls. Records with variable-length fields are followed by the
+    4-byte length of their variable-length data and the data itself.
+    """
+    fixed_size = record.fixed_size
+    var_start = fixed_size + 4
+    encoders = [_new_field_encoder(layout.field, layout.start, var_start) for layout in record.layouts]
+    has_var = record.has_var
+
+    def encode(row) -> bytes:
+        if len(row) != len(encoders):
+            raise ValueError(f"expected {len(encoders)} values but got {len(row)}")
+        fixed = bytearray(fixed_size)
+        var = bytearray()
+        for encoder, value in zip(encoders, row):
+            encoder(value, fixed, var)
+        if not has_var:
+            return bytes(fixed)
+        return bytes(fixed) + len(var).to_bytes(4, 'little') + bytes(var)
+    return encode
+
+
+def _new_field_encoder(field, start: int, var_start: int):
+    data_type = field.data_type
+    if data_type in _struct_formats:
+        return _new_struct_encoder(start, struct.Struct(_struct_formats[data_type]))
+    if data_type == 'Byte':
+        def encode_byte(value, fixed: bytearray, var: bytearray):
+            if value is None:
+                fixed[start+1] = 1
+            else:
+                fixed[start] = value
+        return encode_byte
+    if data_type == 'Bool':
+        def encode_bool(value, fixed: bytearray, var: bytearray):
+            fixed[start] = 2 if value is None else (1 if value else 0)
+        return encode_bool
+    if data_type in _date_widths:
+        width = _date_widths[data_type]
+
+        def encode_date(value, fixed: bytearray, var: bytearray):
+            if value is None:
+                fixed[start+width] = 1
+            else:
+                encoded = date_bytes(value, width)
+                fixed[start:start+len(encoded)] = encoded
+        return encode_date
+    if data_type == 'FixedDecimal':
+        size = field.size
+        scale = field.scale
+
+        def encode_decimal(value, fixed: bytearray, var: bytearray):
+            if value is None:
+                fixed[start+size] = 1
+            else:
+                encoded = decimal_bytes(value, size, scale)
+                fixed[start:start+len(encoded)] = encoded
+        return encode_decimal
+    if data_type == 'String' or data_type == 'WString':
+        encoding = 'latin1' if data_type == 'String' else 'utf_16_le'
+        width = field.size if data_type == 'String' else field.size * 2
+
+        def encode_string(value, fixed: bytearray, var: bytearray):
+            if value is None:
+                fixed[start+width] = 1
+            else:
+                encoded = value.encode(encoding)[:width]
+                fixed[start:start+len(encoded)] = encoded
+        return encode_string
+    if data_type in _var_encodings:
+        encoding = _var_encodings[data_type]
+
+        def encode_var(value, fixed: bytearray, var: bytearray):
+            if value is None:
+                fixed[start:start+4] = b'\x01\x00\x00\x00'
+                return
+            data = bytes(value) if encoding is None else value.encode(encoding)
+            fixed[start:start+4] = append_blob(data, start, var_start, var).to_bytes(4, 'little')
+        return encode_var
+    raise NameError
+
+
+def _new_struct_encoder(start: int, value_struct: struct.Struct):
+    pack_into = value_struct.pack_into
+    null_at = start + value_struct.size
+
+    def encode(value, fixed: bytearray, var: bytearray):
+        if value is None:
+            fixed[null_at] = 1
+        else:
+            pack_into(fixed, start, value)
+    return encode
+
+
+def append_blob(data: bytes, start: int, var_start: int, var: bytearray) -> int:
+    """
+    Appends a blob to the variable-length data of a record and returns the 4-byte fixed portion of the field.
+
+    Blobs of up to 3 bytes are stored inside the fixed portion. Longer blobs are stored in var with a
+    1-byte length prefix when shorter than 128 bytes, and a 4-byte length prefix otherwise, and the
+    fixed portion holds the offset from the field to the prefix.
+    """
+    length = len(data)
+    if length == 0:
+        return 0
+    if length <= 3:
+        return int.from_bytes(bytes(data), 'little') | (length << 28)
+    offset = var_start + len(var) - start
+    if length < 128:
+        var.append((length << 1) | 1)
+    else:
+        var += (length * 2).to_bytes(4, 'little')
+    var += data
+    if offset & 0x30000000:
+        # keep the offset from being mistaken for a tiny blob
+        offset |= 0x80000000
+    return offset
+
+
+def date_bytes(value, width: int) -> bytes:
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, datetime.datetime):
+        text = f'{value.year:04d}-{value.month:02d}-{value.day:02d} {value.hour:02d}:{value.minute:02d}:{value.second:02d}'
+    elif isinstance(value, datetime.date):
+        text = f'{value.year:04d}-{value.month:02d}-{value.day:02d} 00:00:00'
+    else:
+        raise TypeError(f"{value!r} is not a valid date")
+    return bytes(text[:width], 'latin1')
+
+
+def decimal_bytes(value, size: int, scale: int) -> bytes:
+    text = value if isinstance(value, str) else f'{value:.{scale}f}'
+    if len(text) > size:
+        raise ValueError(f"'{text}' does not fit in a FixedDecimal field of size {size}")
+    return bytes(text, 'latin1')
+
+
+def encode_columns(record: YxdbRecord, columns: List, count: int) -> bytes:
+    """
+    Encodes count records from columns of (values, nulls) NumPy arrays, one per field.
+
+    The fixed-width portion of every record is built with vectorized assignments into a NumPy
+    structured array. Only the variable-length fields are encoded record by record.
+    """
+    np = _columnar.numpy()
+    records = np.zeros(count, dtype=_columnar.record_dtype(record))
+    var_columns = []
+    for index, (layout, (values, nulls)) in enumerate(zip(record.layouts, columns)):
+        data_type = layout.field.data_type
+        view = records[_columnar.field_key(index)]
+        if data_type in _var_encodings:
+            var_columns.append((layout.start, _var_encodings[data_type], values, nulls))
+            continue
+        if data_type == 'Bool':
+            view['value'] = np.where(nulls, 2, _fill_nulls(np, values, nulls, False).astype(bool))
+            continue
+        view['null'] = nulls
+        if data_type in _date_widths:
+            view['value'] = _date_column(np, values, nulls, _date_widths[data_type])
+        elif data_type == 'FixedDecimal':
+            view['value'] = [b'' if is_null else decimal_bytes(value, layout.field.size, layout.field.scale) for value, is_null in zip(values, nulls)]
+        elif data_type == 'String' or data_type == 'WString':
+            encoding = 'latin1' if data_type == 'String' else 'utf_16_le'
+            view['value'] = [b'' if is_null else value.encode(encoding) for value, is_null in zip(values, nulls)]
+        else:
+            view['value'] = _fill_nulls(np, values, nulls, 0)
+    if not record.has_var:
+        return records.tobytes()
+    return _append_var_data(records, record.fixed_size, var_columns)
+
+
+def _fill_nulls(np, values, nulls, fill):
+    if values.dtype != object:
+        return np.where(nulls, fill, values)
+    return np.array([fill if is_null else value for value, is_null in zip(values, nulls)])
+
+
+def _date_column(np, values, nulls, width: int):
+    if values.dtype.kind != 'M':
+        values = np.array([None if is_null else value for value, is_null in zip(values, nulls)], dtype='datetime64[s]')
+    text = np.char.replace(np.datetime_as_string(values.astype('datetime64[s]'), unit='s'), 'T', ' ')
+    encoded = np.char.encode(text, 'latin1').astype(f'S{width}')
+    encoded[nulls] = b''
+    return encoded
+
+
+def _append_var_data(records, fixed_size: int, var_columns: List) -> bytes:
+    fixed_records = records.tobytes()
+    var_start = fixed_size + 4
+    out = bytearray()
+    for index in range(len(records)):
+        fixed = bytearray(fixed_records[index * fixed_size:(index + 1) * fixed_size])
+        var = bytearray()
+        for start, encoding, values, nulls in var_columns:
+            if nulls[index]:
+                fixed[start:start+4] = b'\x01\x00\x00\x00'
+                continue
+            value = values[index]
+            data = bytes(value) if encoding is None else value.encode(encoding)
+            fixed[start:start+4] = append_blob(data, start, var_start, var).to_bytes(4, 'little')
+        out += fixed
+        out += len(var).to_bytes(4, 'little')
+        out += var
+    return bytes(out)
@@ -0,0 +1,67 @@
+import struct
+from typing import Callable, List
+
+from yxdb._yxdb_record import YxdbRecord
+
+struct_formats = {
+    'Int16': 'h',
+    'Int32': 'i',
+    'Int64': 'q',
+    'Float': 'f',
+    'Double': 'd',
+    'Byte': 'B',
+}
+
+struct_sizes = {
+    'Int16': 2,
+    'Int32': 4,
+    'Int64': 8,
+    'Float': 4,
+    'Double': 8,
+    'Byte': 1,
+}
+
+
+def new_row_decoder(record: YxdbRecord) -> Callable[[memoryview], tuple]:
+    """
+    Compiles a function that decodes every field of a record buffer into a tuple.
+
+    All numeric, byte and bool fields are unpacked with a single precompiled struct.Struct and their
+    null flags are checked inline. The remaining fields are decoded with the record's extractors.
+    """
+    namespace = {}
+    struct_format = '<'
+    struct_end = 0
+    unpacked = 0
+    expressions: List[str] = [''] * len(record.fields)
+    # a field projected more than once is unpacked once and its expression reused
+    unpacked_at = {}
+
+    order = sorted(range(len(record.fields)), key=lambda i: record.layouts[i].start)
+    for index in order:
+        layout = record.layouts[index]
+        data_type = layout.field.data_type
+        if layout.start in unpacked_at:
+            expressions[index] = unpacked_at[layout.start]
+        elif data_type in struct_formats:
+            struct_format += ('x' * (layout.start - struct_end)) + struct_formats[data_type] + 'B'
+            struct_end = layout.start + struct_sizes[data_type] + 1
+            expressions[index] = f'None if v[{unpacked + 1}] == 1 else v[{unpacked}]'
+            unpacked += 2
+        elif data_type == 'Bool':
+            struct_format += ('x' * (layout.start - struct_end)) + 'B'
+            struct_end = layout.start + 1
+            expressions[index] = f'None if v[{unpacked}] == 2 else v[{unpacked}] == 1'
+            unpacked += 1
+        else:
+            namespace[f'e{index}'] = record.get_extractor(index)
+            expressions[index] = f'e{index}(buffer)'
+        unpacked_at[layout.start] = expressions[index]
+
+    lines = ['def decode(buffer):']
+    if unpacked > 0:
+        namespace['unpack_from'] = struct.Struct(struct_format).unpack_from
+        lines.append('    v = unpack_from(buffer)')
+    lines.append(f"    return ({''.join(expression + ', ' for expression in expressions)})")
+    exec('\n'.join(lines), namespace)
+    return namespace['decode']
@@ -1,2 +1,12 @@
+import importlib
+
+
 def memview(size: int) -> memoryview:
     return memoryview(bytearray(size))
+
+
+def import_optional(module: str, extra: str):
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(f"this feature requires the '{module}' package, install it using 'pip install yxdb[{extra}]'")
@@ -1,17 +1,35 @@
-from typing import Dict, List, Callable
+import functools
+from typing import Dict, List, Callable, Set
 
 from yxdb import _extractors
+from yxdb._field_layout import FieldLayout
+from yxdb._header import parse_fields
 from yxdb._metainfo_field import MetaInfoField
 from yxdb.yxdb_field import YxdbField, DataType
 
+var_types = {'V_String', 'V_WString', 'Blob', 'SpatialObj'}
+
+record_cache_size = 256
+
+_dictionary_types = {'String', 'WString', 'V_String', 'V_WString'}
+
+_lazy_extractors = {
+    'V_String': _extractors.new_lazy_v_string_extractor,
+    'V_WString': _extractors.new_lazy_v_wstring_extractor,
+    'Blob': _extractors.new_lazy_blob_extractor,
+}
+
 
 class YxdbRecord:
     def __init__(self, fields: List[MetaInfoField]):
         self._name_to_index: Dict[str, int] = {}
         self.fields: List[YxdbField] = []
         self._extractors: List[Callable] = []
+        self.layouts: List[FieldLayout] = []
         self.has_var = False
+        self.uses_var = False
         self.fixed_size = 0
+        self.dictionary_indices: Set[int] = set()
 
         self._initialize(fields)
 
@@ -26,80 +44,131 @@ class YxdbRecord:
         index = self._name_to_index[name]
         return self._extractors[index](buffer)
 
+    def project(self, indices: List[int]) -> 'YxdbRecord':
+        projected = YxdbRecord([])
+        projected.has_var = self.has_var
+        projected.fixed_size = self.fixed_size
+        for index in indices:
+            layout = self.layouts[index]
+            projected._add_extractor(layout.field, self.fields[index].data_type, layout.start, self._extractors[index])
+        return projected
+
+    def with_date_cache(self) -> 'YxdbRecord':
+        cached = self.project(range(len(self.fields)))
+        cache = {}
+        for index, layout in enumerate(cached.layouts):
+            if layout.field.data_type == 'Date':
+                cached._extractors[index] = _extractors.new_date_extractor(layout.start, cache)
+            elif layout.field.data_type == 'DateTime':
+                cached._extractors[index] = _extractors.new_date_time_extractor(layout.start, cache)
+        return cached
+
+    def with_lazy_values(self) -> 'YxdbRecord':
+        lazy = self.project(range(len(self.fields)))
+        for index, layout in enumerate(lazy.layouts):
+            if layout.field.data_type in _lazy_extractors:
+                lazy._extractors[index] = _lazy_extractors[layout.field.data_type](layout.start)
+        return lazy
+
+    def with_dictionary(self, keys: List) -> 'YxdbRecord':
+        encoded = self.project(range(len(self.fields)))
+        for key in keys:
+            index = self.get_index(key)
+            layout = self.layouts[index]
+            if layout.field.data_type not in _dictionary_types:
+                raise TypeError(f"{layout.field.data_type} field '{layout.field.name}' cannot be dictionary-encoded")
+            encoded.dictionary_indices.add(index)
+        return encoded
+
+    def get_index(self, key) -> int:
+        if isinstance(key, str):
+            if key not in self._name_to_index:
+                raise Exception(f"'{key}' is not a valid field name")
+            return self._name_to_index[key]
+        if key < 0 or key >= len(self.fields):
+            raise Exception(f"index {key} is not a valid field index")
+        return key
+
+    def get_extractor(self, index: int) -> Callable:
+        return self._extractors[index]
+
     def _initialize(self, fields: List[MetaInfoField]):
         start_at = 0
         for field in fields:
             if field.data_type == 'Int16':
-                self._add_extractor(field.name, DataType.LONG, _extractors.new_int16_extractor(start_at))
+                self._add_extractor(field, DataType.LONG, start_at, _extractors.new_int16_extractor(start_at))
                 start_at += 3
                 continue
             if field.data_type == 'Int32':
-                self._add_extractor(field.name, DataType.LONG, _extractors.new_int32_extractor(start_at))
+                self._add_extractor(field, DataType.LONG, start_at, _extractors.new_int32_extractor(start_at))
                 start_at += 5
                 continue
             if field.data_type == 'Int64':
-                self._add_extractor(field.name, DataType.LONG, _extractors.new_int64_extractor(start_at))
+                self._add_extractor(field, DataType.LONG, start_at, _extractors.new_int64_extractor(start_at))
                 start_at += 9
                 continue
             if field.data_type == 'Float':
-                self._add_extractor(field.name, DataType.DOUBLE, _extractors.new_float_extractor(start_at))
+                self._add_extractor(field, DataType.DOUBLE, start_at, _extractors.new_float_extractor(start_at))
                 start_at += 5
                 continue
             if field.data_type == 'Double':
-                self._add_extractor(field.name, DataType.DOUBLE, _extractors.new_double_extractor(start_at))
+                self._add_extractor(field, DataType.DOUBLE, start_at, _extractors.new_double_extractor(start_at))
                 start_at += 9
                 continue
             if field.data_type == 'FixedDecimal':
                 size = field.size
-                self._add_extractor(field.name, DataType.DOUBLE, _extractors.new_fixed_decimal_extractor(start_at, size))
+                self._add_extractor(field, DataType.DOUBLE, start_at, _extractors.new_fixed_decimal_extractor(start_at, size))
                 start_at += size + 1
                 continue
             if field.data_type == 'String':
                 size = field.size
-                self._add_extractor(field.name, DataType.STRING, _extractors.new_string_extractor(start_at, size))
+                self._add_extractor(field, DataType.STRING, start_at, _extractors.new_string_extractor(start_at, size))
                 start_at += size + 1
                 continue
             if field.data_type == 'WString':
                 size = field.size
-                self._add_extractor(field.name, DataType.STRING, _extractors.new_wstring_extractor(start_at, size))
+                self._add_extractor(field, DataType.STRING, start_at, _extractors.new_wstring_extractor(start_at, size))
                 start_at += (size * 2) + 1
                 continue
             if field.data_type == "V_String":
-                self._add_extractor(field.name, DataType.STRING, _extractors.new_v_string_extractor(start_at))
+                self._add_extractor(field, DataType.STRING, start_at, _extractors.new_v_string_extractor(start_at))
                 start_at += 4
                 self.has_var = True
                 continue
             if field.data_type == "V_WString":
-                self._add_extractor(field.name, DataType.STRING, _extractors.new_v_wstring_extractor(start_at))
+                self._add_extractor(field, DataType.STRING, start_at, _extractors.new_v_wstring_extractor(start_at))
                 start_at += 4
                 self.has_var = True
                 continue
             if field.data_type == "Date":
-                self._add_extractor(field.name, DataType.DATE, _extractors.new_date_extractor(start_at))
+                self._add_extractor(field, DataType.DATE, start_at, _extractors.new_date_extractor(start_at))
                 start_at += 11
                 continue
             if field.data_type == "DateTime":
-                self._add_extractor(field.name, DataType.DATE, _extractors.new_date_time_extractor(start_at))
+                self._add_extractor(field, DataType.DATE, start_at, _extractors.new_date_time_extractor(start_at))
                 start_at += 20
                 continue
             if field.data_type == "Bool":
-                self._add_extractor(field.name, DataType.BOOLEAN, _extractors.new_bool_extractor(start_at))
+                self._add_extractor(field, DataType.BOOLEAN, start_at, _extractors.new_bool_extractor(start_at))
                 start_at += 1
                 continue
             if field.data_type == "Byte":
-                self._add_extractor(field.name, DataType.BYTE, _extractors.new_byte_extractor(start_at))
+                self._add_extractor(field, DataType.BYTE, start_at, _extractors.new_byte_extractor(start_at))
                 start_at += 2
                 continue
             if field.data_type == "Blob" or field.data_type == "SpatialObj":
-                self._add_extractor(field.name, DataType.BLOB, _extractors.new_blob_extractor(start_at))
+                self._add_extractor(field, DataType.BLOB, start_at, _extractors.new_blob_extractor(start_at))
                 start_at += 4
                 self.has_var = True
                 continue
             raise NameError
         self.fixed_size = start_at
 
-    def _add_extractor(self, name: str, data_type: DataType, extractor):
-        self._add_field_name_to_index_map(name, data_type)
+    def _add_extractor(self, field: MetaInfoField, data_type: DataType, start_at: int, extractor):
+        self._add_field_name_to_index_map(field.name, data_type)
+        self.layouts.append(FieldLayout(field, start_at))
+        if field.data_type in var_types:
+            self.uses_var = True
         self._extractors.append(extractor)
 
     def _add_field_name_to_index_map(self, name: str, data_type: DataType):
@@ -107,3 +176,14 @@ class YxdbRecord:
         self.fields.append(YxdbField(name, data_type))
         self._name_to_index[name] = index
         return index
+
+
+@functools.lru_cache(maxsize=record_cache_size)
+def cached_record(meta_info_str: str) -> YxdbRecord:
+    """
+    Returns the YxdbRecord for a RecordInfo XML string, parsing it only the first time it is seen.
+
+    The returned record is shared by every reader of files with the same schema, so it must not be
+    modified; project() and with_date_cache() return new records.
+    """
+    return YxdbRecord(parse_fields(meta_info_str))
@@ -0,0 +1,229 @@
+import asyncio
+from collections import deque
+from typing import List
+
+from yxdb import _columnar
+from yxdb._buffered_record_reader import BufferedRecordReader, decompress_growing, default_lzf_buffer_size
+from yxdb._header import Header, header_size, invalid_yxdb_msg
+from yxdb._lzf import new_lzf
+from yxdb._utility import memview
+from yxdb._yxdb_record import YxdbRecord, cached_record
+from yxdb.yxdb_field import YxdbField
+
+
+class AsyncYxdbReader:
+    """
+    AsyncYxdbReader reads YXDB files from an asynchronous byte source.
+
+    Open a reader with the open() coroutine and iterate the records as YxdbBatch objects:
+
+        reader = await AsyncYxdbReader.open(path='file.yxdb')
+        async for batch in reader.batches():
+            # do something
+
+    Compressed blocks are read from the source by a background task and decompressed in an
+    executor. Up to `prefetch` blocks are read and decompressed ahead of the batch being decoded.
+    The batches require the optional numpy package.
+    """
+
+    def __init__(self, source, header: Header, record: YxdbRecord, prefetch: int, executor):
+        self._source = source
+        self._header = header
+        self._record = record
+        self._prefetch = max(1, prefetch)
+        self._executor = executor
+        self.num_records = header.num_records
+
+    @classmethod
+    async def open(cls, source=None, path: str = None, columns: List = None, prefetch: int = 4, executor=None):
+        """
+        Opens a YXDB file with 1 of the following parameters:
+            * source: an object with an `async read(size)` method returning bytes, positioned at
+              the start of a YXDB file
+            * path: a string containing the path to a YXDB file; the file is read in the executor
+
+        Optional parameters:
+            * columns: a list of field names or indices to read
+            * prefetch: the number of blocks to read and decompress ahead of the consumer
+            * executor: the concurrent.futures executor used for file reads and decompression.
+              Defaults to the event loop's default executor.
+        """
+
+        if source is None and path is None:
+            raise TypeError("either 'source' or 'path' must be provided")
+        if source is None:
+            if not isinstance(path, str):
+                raise TypeError("'path' must be a string")
+            source = _FileSource(open(path, 'rb'), executor)
+
+        try:
+            header = Header(memoryview(await _read_exactly(source, header_size)))
+            if not header.is_valid():
+                raise IOError(invalid_yxdb_msg)
+            meta_info_bytes = await _read_exactly(source, header.meta_info_size * 2)
+            record = cached_record(str(meta_info_bytes[:-2], 'utf_16_le'))
+        except Exception:
+            await _close_source(source)
+            raise Exception(invalid_yxdb_msg)
+
+        if columns is not None:
+            try:
+                record = record.project([record.get_index(column) for column in columns])
+            except Exception:
+                await _close_source(source)
+                raise
+        return cls(source, header, record, prefetch, executor)
+
+    def list_fields(self) -> List[YxdbField]:
+        """Provides the list of fields in the YXDB file"""
+
+        return list(self._record.fields)
+
+    async def batches(self, batch_size: int = 65536):
+        """Iterates the records in the file as YxdbBatch objects of up to batch_size records."""
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self._prefetch)
+        producer = loop.create_task(self._read_blocks(queue))
+        record = self._record
+        record_reader = _QueuedRecordReader(record.fixed_size, record.has_var, self.num_records, not record.uses_var)
+        counter = _RecordCounter(record.fixed_size, record.has_var)
+        try:
+            while record_reader.current_record < self.num_records:
+                wanted = min(record_reader.current_record + batch_size, self.num_records)
+                while counter.records < wanted:
+                    future = await queue.get()
+                    if future is None:
+                        raise IOError("unexpected end of YXDB file")
+                    block = await future
+                    record_reader.blocks.append(block)
+                    counter.feed(block)
+                yield _columnar.read_batch(record_reader, record, wanted - record_reader.current_record)
+        finally:
+            producer.cancel()
+            await self.close()
+
+    async def close(self):
+        """Closes the YXDB source."""
+
+        await _close_source(self._source)
+
+    async def _read_blocks(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        position = self._header.first_block_pos()
+        end = self._header.records_end_pos()
+        try:
+            while position < end:
+                length = int.from_bytes(await _read_exactly(self._source, 4), 'little')
+                raw = length & 0x80000000 > 0
+                length &= 0x7fffffff
+                payload = await _read_exactly(self._source, length)
+                position += 4 + length
+                await queue.put(loop.run_in_executor(self._executor, _decompress_block, payload, raw))
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            # hand the error to the consumer instead of leaving it waiting on the queue
+            failed = loop.create_future()
+            failed.set_exception(ex)
+            await queue.put(failed)
+        await queue.put(None)
+
+
+def _decompress_block(payload: bytes, raw: bool) -> memoryview:
+    if raw:
+        return memoryview(payload)
+    lzf = new_lzf(memoryview(payload), memview(default_lzf_buffer_size))
+    length = decompress_growing(lzf, len(payload))
+    return lzf.out_bytes[:length]
+
+
+async def _read_exactly(source, size: int) -> bytes:
+    data = await source.read(size)
+    if len(data) == size:
+        return data
+    chunks = [data]
+    received = len(data)
+    while received < size:
+        data = await source.read(size - received)
+        if len(data) == 0:
+            raise IOError("unexpected end of YXDB file")
+        chunks.append(data)
+        received += len(data)
+    return b''.join(chunks)
+
+
+async def _close_source(source):
+    close = getattr(source, 'close', None)
+    if close is None:
+        return
+    result = close()
+    if asyncio.iscoroutine(result):
+        await result
+
+
+class _FileSource:
+    def __init__(self, file, executor):
+        self.file = file
+        self.executor = executor
+
+    async def read(self, size: int) -> bytes:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.file.read, size)
+
+    def close(self):
+        self.file.close()
+
+
+class _QueuedRecordReader(BufferedRecordReader):
+    """Reads records from decompressed blocks that are appended to the blocks queue."""
+
+    def __init__(self, fixed_len: int, has_var_fields: bool, total_records: int, skip_var_data: bool):
+        super().__init__(None, fixed_len, has_var_fields, total_records, skip_var_data=skip_var_data)
+        self.blocks = deque()
+
+    def close(self):
+        pass
+
+    def _acquire_lzf_buffers(self):
+        # blocks arrive already decompressed, so no LZF buffers are needed
+        pass
+
+    def _read_next_lzf_block(self) -> int:
+        self.block = self.blocks.popleft()
+        return len(self.block)
+
+
+class _RecordCounter:
+    """Counts the records that are complete in the blocks received so far."""
+
+    def __init__(self, fixed_len: int, has_var_fields: bool):
+        self.fixed_len = fixed_len
+        self.has_var_fields = has_var_fields
+        self.received = 0
+        self.records = 0
+        self._length_at = fixed_len
+        self._length_bytes = b''
+        self._record_end = None
+
+    def feed(self, block: memoryview):
+        start = self.received
+        self.received += len(block)
+        if not self.has_var_fields:
+            self.records = self.received // self.fixed_len
+            return
+        while True:
+            if self._record_end is not None:
+                if self._record_end > self.received:
+                    return
+                self.records += 1
+                self._length_at = self._record_end + self.fixed_len
+                self._record_end = None
+            read_from = self._length_at + len(self._length_bytes)
+            if read_from >= self.received:
+                return
+            offset = read_from - start
+            self._length_bytes += bytes(block[offset:offset + 4 - len(self._length_bytes)])
+            if len(self._length_bytes) < 4:
+                return
+            self._record_end = self._length_at + 4 + int.from_bytes(self._length_bytes, 'little')
+            self._length_bytes = b''
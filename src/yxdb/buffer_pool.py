@@ -0,0 +1,47 @@
+import threading
+from typing import List
+
+from yxdb._utility import memview
+
+
+class BufferPool:
+    """
+    BufferPool holds LZF block buffers that are reused by the readers sharing the pool.
+
+    Pass the same pool to every YxdbReader opened by a process, e.g. YxdbReader(path=str,
+    buffer_pool=pool). A reader takes its block buffers from the pool when it is opened and
+    returns them when it is closed, so opening many small files does not allocate new buffers
+    for every file. The pool is safe to share between threads.
+    """
+
+    def __init__(self, buffer_size: int = 262144, max_buffers: int = 64):
+        """
+        :param buffer_size: The minimum size of the buffers handed out by the pool
+        :param max_buffers: The maximum number of idle buffers the pool keeps
+        """
+
+        self.buffer_size = buffer_size
+        self.max_buffers = max_buffers
+        self._free: List[memoryview] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, size: int = 0) -> memoryview:
+        """Returns an idle buffer of at least size bytes, allocating a new one if none is available."""
+
+        size = max(size, self.buffer_size)
+        with self._lock:
+            for index in range(len(self._free) - 1, -1, -1):
+                if len(self._free[index]) >= size:
+                    return self._free.pop(index)
+        return memview(size)
+
+    def release(self, buffer: memoryview):
+        """Returns a buffer to the pool."""
+
+        with self._lock:
+            if len(self._free) < self.max_buffers:
+                self._free.append(buffer)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._free)
@@ -0,0 +1,110 @@
+class LazyBytes:
+    """
+    LazyBytes is a Blob value that has not been copied out of the record buffer.
+
+    len(), equality, hashing, startswith() and prefix() work on the raw bytes in place. Call
+    bytes() or tobytes() to copy the value. LazyBytes values equal bytes objects with the same
+    contents and hash the same way.
+
+    The value points into the reader's record buffer, so it is only valid until the next record is
+    read. Convert values that must outlive the current record.
+    """
+
+    __slots__ = ('_view',)
+
+    def __init__(self, view: memoryview):
+        self._view = view
+
+    def tobytes(self) -> bytes:
+        return self._view.tobytes()
+
+    def startswith(self, prefix: bytes) -> bool:
+        return self._view[:len(prefix)] == prefix
+
+    def prefix(self, length: int) -> bytes:
+        """Returns the first length bytes of the value."""
+
+        return self._view[:length].tobytes()
+
+    def __bytes__(self) -> bytes:
+        return self._view.tobytes()
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __eq__(self, other):
+        if type(other) is LazyBytes:
+            return self._view == other._view
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            return self._view == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._view.tobytes())
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.tobytes()!r})'
+
+
+class LazyString(LazyBytes):
+    """
+    LazyString is a V_String or V_WString value that has not been decoded yet.
+
+    len(), equality with str and other LazyString values, startswith() and prefix() work on the
+    encoded bytes in place. len() counts characters for V_String values and UTF-16 code units for
+    V_WString values. The value is decoded by str() and by hash(), which hashes like the equal str
+    so lazy values and str keys can be mixed in sets and dicts.
+
+    Like LazyBytes, the value is only valid until the next record is read.
+    """
+
+    __slots__ = ('encoding', '_char_size')
+
+    def __init__(self, view: memoryview, encoding: str):
+        super().__init__(view)
+        self.encoding = encoding
+        self._char_size = 1 if encoding == 'latin1' else 2
+
+    def encode(self, encoding: str = 'utf-8', errors: str = 'strict') -> bytes:
+        """Returns the value encoded like str.encode(), copying the raw bytes when the encoding matches."""
+
+        if encoding == self.encoding:
+            return self._view.tobytes()
+        return str(self).encode(encoding, errors)
+
+    def startswith(self, prefix) -> bool:
+        if isinstance(prefix, str):
+            try:
+                prefix = prefix.encode(self.encoding)
+            except UnicodeEncodeError:
+                return False
+        return self._view[:len(prefix)] == prefix
+
+    def prefix(self, length: int) -> str:
+        """Returns the first length characters of the value."""
+
+        return str(self._view[:length * self._char_size], self.encoding)
+
+    def __str__(self) -> str:
+        return str(self._view, self.encoding)
+
+    def __len__(self) -> int:
+        return len(self._view) // self._char_size
+
+    def __eq__(self, other):
+        if isinstance(other, str):
+            try:
+                return self._view == other.encode(self.encoding)
+            except UnicodeEncodeError:
+                return False
+        if type(other) is LazyString:
+            if other.encoding == self.encoding:
+                return self._view == other._view
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        return f'LazyString({str(self)!r})'
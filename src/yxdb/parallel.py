@@ -0,0 +1,77 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List
+
+from yxdb.yxdb_batch import YxdbBatch
+from yxdb.yxdb_reader import YxdbReader, records_per_block_index_entry
+from yxdb.yxdb_schema import read_schema
+
+
+def read(path: str, workers: int = None, ordered: bool = True, columns: List = None, batch_size: int = records_per_block_index_entry, filter: List = None, dictionary: List = None):
+    """
+    read decodes a YXDB file in parallel using a pool of processes.
+
+    The file is split into ranges of compressed blocks using the record block index. Each range is
+    decompressed and decoded into a YxdbBatch by a separate process. Ranges are submitted as batches
+    are consumed, so at most twice as many batches as workers are decoded ahead of the caller.
+
+    :param path: The path to a YXDB file
+    :param workers: The number of processes to use. Defaults to the number of CPUs.
+    :param ordered: When True, batches are yielded in file order. When False, batches are yielded as soon as they are decoded.
+    :param columns: An optional list of field names or indices to read
+    :param batch_size: The number of records in each batch, rounded up to a multiple of 65536 records
+    :param filter: An optional list of conditions records must match, see YxdbReader. Each batch
+        only contains the matching records of its range.
+    :param dictionary: An optional list of string field names or indices to dictionary-encode, see YxdbReader.
+        Each batch has its own dictionary.
+    :return: An iterator of (start_record, YxdbBatch) tuples
+    """
+    workers = workers or os.cpu_count() or 1
+    # submit ranges as batches are consumed so at most this many decoded batches are held at once
+    max_in_flight = workers * 2
+    ranges = split_ranges(path, batch_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit(start, stop):
+            return executor.submit(_read_range, path, start, stop, columns, filter, dictionary)
+
+        if ordered:
+            pending = deque()
+            for start, stop in ranges:
+                if len(pending) == max_in_flight:
+                    first, future = pending.popleft()
+                    yield first, future.result()
+                pending.append((start, submit(start, stop)))
+            for start, future in pending:
+                yield start, future.result()
+        else:
+            starts = {}
+            for start, stop in ranges:
+                if len(starts) == max_in_flight:
+                    yield from _completed(starts)
+                starts[submit(start, stop)] = start
+            while starts:
+                yield from _completed(starts)
+
+
+def split_ranges(path: str, batch_size: int = records_per_block_index_entry):
+    """Splits a YXDB file into (start, stop) record ranges that begin on record block index entries."""
+
+    num_records = read_schema(path).num_records
+    entries = max(1, -(-batch_size // records_per_block_index_entry))
+    step = entries * records_per_block_index_entry
+    return [(start, min(start + step, num_records)) for start in range(0, num_records, step)]
+
+
+def _completed(starts: dict):
+    done, _ = wait(starts, return_when=FIRST_COMPLETED)
+    for future in done:
+        yield starts.pop(future), future.result()
+
+
+def _read_range(path: str, start: int, stop: int, columns: List, conditions: List, dictionary: List) -> YxdbBatch:
+    yxdb = YxdbReader(path=path, columns=columns, filter=conditions, dictionary=dictionary)
+    try:
+        return yxdb.read_range(start, stop)
+    finally:
+        yxdb.close()
@@ -1,10 +1,20 @@
 import json
 import struct
-from typing import List
+from typing import Iterable, List, Tuple
 
+from yxdb._utility import import_optional
 
 _bytes_per_point = 16
 
+_wkb_point = 1
+_wkb_line_string = 2
+_wkb_polygon = 3
+_wkb_multi_point = 4
+_wkb_multi_line_string = 5
+_wkb_multi_polygon = 6
+
+_geoarrow_metadata = '{"crs": "OGC:CRS84"}'
+
 
 def to_geojson(value: bytes) -> str:
     """
@@ -31,6 +41,183 @@ def to_geojson(value: bytes) -> str:
     raise TypeError("blob is not a spatial object")
 
 
+def to_coords(value: bytes):
+    """
+    to_coords translates a SpatialObj field into NumPy arrays of coordinates.
+
+    Requires the optional numpy package.
+
+    :param value: The object read from a SpatialObj field
+    :return: A tuple of (coords, part_offsets). coords is an (n, 2) float64 array of longitude and
+        latitude pairs. part_offsets is an int32 array where part i (a line, a polygon ring, or all
+        the points of a point object) spans coords[part_offsets[i]:part_offsets[i + 1]].
+        Returns None for a null value.
+    :raises TypeError: The blob is not a valid spatial object
+    """
+    if value is None:
+        return None
+    np = _numpy()
+    _, part_starts, total_points, coords_at = _get_layout(value)
+    coords = np.frombuffer(value, dtype='<f8', count=total_points * 2, offset=coords_at).reshape(total_points, 2)
+    return coords, np.array(part_starts + [total_points], dtype=np.int32)
+
+
+def to_coords_batch(values: Iterable[bytes]):
+    """
+    to_coords_batch translates a column of SpatialObj fields into flat NumPy coordinate arrays.
+
+    Requires the optional numpy package.
+
+    :param values: The objects read from a SpatialObj field, e.g. the values of a batch column
+    :return: A tuple of (coords, ring_offsets, geometry_offsets). coords is an (n, 2) float64 array
+        holding the coordinates of every object. Ring i spans coords[ring_offsets[i]:ring_offsets[i + 1]]
+        and object j spans rings geometry_offsets[j] to geometry_offsets[j + 1]. Null values are
+        empty objects.
+    :raises TypeError: A blob is not a valid spatial object
+    """
+    np = _numpy()
+    chunks = []
+    ring_offsets = [0]
+    geometry_offsets = [0]
+    total = 0
+    for value in values:
+        if value is not None:
+            _, part_starts, total_points, coords_at = _get_layout(value)
+            chunks.append(np.frombuffer(value, dtype='<f8', count=total_points * 2, offset=coords_at))
+            ring_offsets.extend(total + start for start in part_starts[1:])
+            total += total_points
+            ring_offsets.append(total)
+        geometry_offsets.append(len(ring_offsets) - 1)
+    coords = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float64)
+    return coords.reshape(total, 2), np.array(ring_offsets, dtype=np.int32), np.array(geometry_offsets, dtype=np.int32)
+
+
+def to_wkb(value: bytes) -> bytes:
+    """
+    to_wkb translates a SpatialObj field into little-endian well-known binary (WKB).
+
+    The geometry types match to_geojson: a single point, line or polygon ring becomes a Point,
+    LineString or Polygon, and objects with several parts become a MultiPoint, MultiLineString,
+    or a MultiPolygon holding one polygon with all the rings.
+
+    :param value: The object read from a SpatialObj field
+    :return: The WKB bytes representing the spatial object
+    :raises TypeError: The blob is not a valid spatial object
+    """
+    if value is None:
+        return None
+    obj_type, part_starts, total_points, coords_at = _get_layout(value)
+    if obj_type == 8:
+        if total_points == 1:
+            return _wkb_header(_wkb_point) + value[coords_at:coords_at + _bytes_per_point]
+        points = [_wkb_header(_wkb_point) + value[i:i + _bytes_per_point] for i in range(coords_at, coords_at + (total_points * _bytes_per_point), _bytes_per_point)]
+        return _wkb_header(_wkb_multi_point) + _wkb_count(total_points) + b''.join(points)
+
+    parts = []
+    ends = part_starts[1:] + [total_points]
+    for start, end in zip(part_starts, ends):
+        parts.append(_wkb_count(end - start) + value[coords_at + (start * _bytes_per_point):coords_at + (end * _bytes_per_point)])
+    if obj_type == 3:
+        if len(parts) == 1:
+            return _wkb_header(_wkb_line_string) + parts[0]
+        lines = [_wkb_header(_wkb_line_string) + part for part in parts]
+        return _wkb_header(_wkb_multi_line_string) + _wkb_count(len(lines)) + b''.join(lines)
+    polygon = _wkb_header(_wkb_polygon) + _wkb_count(len(parts)) + b''.join(parts)
+    if len(parts) == 1:
+        return polygon
+    return _wkb_header(_wkb_multi_polygon) + _wkb_count(1) + polygon
+
+
+def to_wkb_column(values: Iterable[bytes]) -> List[bytes]:
+    """
+    to_wkb_column translates a column of SpatialObj fields into WKB.
+
+    :param values: The objects read from a SpatialObj field, e.g. the values of a batch column
+    :return: A list containing the WKB bytes of each object, or None for null values
+    :raises TypeError: A blob is not a valid spatial object
+    """
+    return [to_wkb(value) for value in values]
+
+
+def to_geoarrow(values: Iterable[bytes], name: str = 'geometry'):
+    """
+    to_geoarrow translates a column of SpatialObj fields into a GeoArrow array.
+
+    Requires the optional pyarrow package. Columns containing only points are encoded as
+    geoarrow.multipoint, only lines as geoarrow.multilinestring and only polygons as
+    geoarrow.polygon, using interleaved coordinates. Columns mixing object types are encoded as
+    geoarrow.wkb.
+
+    :param values: The objects read from a SpatialObj field, e.g. the values of a batch column
+    :param name: The name of the returned field
+    :return: A tuple of (field, array). field is a pyarrow.Field carrying the GeoArrow extension
+        metadata, and array is the pyarrow array holding the geometries.
+    :raises TypeError: A blob is not a valid spatial object
+    """
+    pa = _pyarrow()
+    np = _numpy()
+    values = list(values)
+    nulls = np.array([value is None for value in values], dtype=bool)
+    obj_types = {int.from_bytes(value[0:4], byteorder='little') for value in values if value is not None and len(value) >= 4}
+    mask = pa.array(nulls) if nulls.any() else None
+    if len(obj_types) != 1:
+        array = pa.array(to_wkb_column(values), type=pa.binary())
+        return _geoarrow_field(pa, name, 'geoarrow.wkb', array.type), array
+
+    coords, ring_offsets, geometry_offsets = to_coords_batch(values)
+    xy = pa.FixedSizeListArray.from_arrays(pa.array(coords.reshape(-1)), type=pa.list_(pa.field('xy', pa.float64(), nullable=False), 2))
+    obj_type = obj_types.pop()
+    if obj_type == 8:
+        array = pa.ListArray.from_arrays(pa.array(ring_offsets[geometry_offsets]), xy, mask=mask)
+        extension = 'geoarrow.multipoint'
+    else:
+        rings = pa.ListArray.from_arrays(pa.array(ring_offsets), xy)
+        array = pa.ListArray.from_arrays(pa.array(geometry_offsets), rings, mask=mask)
+        extension = 'geoarrow.multilinestring' if obj_type == 3 else 'geoarrow.polygon'
+    return _geoarrow_field(pa, name, extension, array.type), array
+
+
+def _geoarrow_field(pa, name: str, extension: str, data_type):
+    return pa.field(name, data_type, metadata={'ARROW:extension:name': extension, 'ARROW:extension:metadata': _geoarrow_metadata})
+
+
+def _wkb_header(wkb_type: int) -> bytes:
+    return struct.pack('<BI', 1, wkb_type)
+
+
+def _wkb_count(count: int) -> bytes:
+    return struct.pack('<I', count)
+
+
+def _get_layout(value: bytes) -> Tuple[int, List[int], int, int]:
+    # returns (object type, the first point of each part, total points, offset of the first coordinate)
+    if len(value) < 20:
+        raise TypeError('blob is not a spatial object')
+    obj_type = int.from_bytes(value[0:4], byteorder='little')
+    if obj_type == 8:
+        total_points = int.from_bytes(value[36:40], byteorder='little')
+        coords_at = 40
+        part_starts = [0]
+    elif obj_type == 3 or obj_type == 5:
+        total_parts = int.from_bytes(value[36:40], byteorder='little')
+        total_points = int.from_bytes(value[40:44], byteorder='little')
+        coords_at = 44 + (total_parts * 4)
+        part_starts = [int.from_bytes(value[i:i + 4], byteorder='little') for i in range(44, coords_at, 4)]
+    else:
+        raise TypeError("blob is not a spatial object")
+    if coords_at + (total_points * _bytes_per_point) > len(value):
+        raise TypeError("blob is not a spatial object")
+    return obj_type, part_starts, total_points, coords_at
+
+
+def _numpy():
+    return import_optional('numpy', 'numpy')
+
+
+def _pyarrow():
+    return import_optional('pyarrow', 'arrow')
+
+
 def _parse_points(value: bytes) -> str:
     total_points = int.from_bytes(value[36:40], byteorder='little')
     if total_points == 1:
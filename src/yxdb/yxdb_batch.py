@@ -0,0 +1,67 @@
+from typing import Dict, List
+
+from yxdb.yxdb_field import YxdbField
+
+
+class YxdbColumn:
+    """
+    YxdbColumn contains the values of a single field for a batch of records.
+
+    values is a NumPy array. Numeric, bool and byte fields use the matching NumPy dtype, date fields
+    use datetime64[s], and string and blob fields use an object array.
+
+    nulls is a boolean NumPy array that is True where the field is null. The contents of values
+    at null positions are undefined.
+
+    For dictionary-encoded string fields, values is an int32 array of codes into dictionary, an
+    object array holding each distinct string once. Null entries have the code -1.
+    """
+
+    def __init__(self, field: YxdbField, values, nulls, dictionary=None):
+        self.field = field
+        self.values = values
+        self.nulls = nulls
+        self.dictionary = dictionary
+
+    @property
+    def name(self) -> str:
+        return self.field.name
+
+    def decoded(self):
+        """Returns the values of a dictionary-encoded column as an object array, or values for other columns."""
+
+        if self.dictionary is None:
+            return self.values
+        decoded = self.dictionary.take(self.values, mode='clip') if len(self.dictionary) > 0 else self.values.astype(object)
+        decoded[self.nulls] = None
+        return decoded
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class YxdbBatch:
+    """
+    YxdbBatch contains a batch of records decoded into one YxdbColumn per field.
+
+    Columns can be accessed by index or by name using the column() method.
+    """
+
+    def __init__(self, num_records: int, columns: List[YxdbColumn]):
+        self.num_records = num_records
+        self.columns = columns
+        self._name_to_index: Dict[str, int] = {column.name: index for index, column in enumerate(columns)}
+
+    def column(self, key) -> YxdbColumn:
+        """Returns a column, specified by either the field's index or the field's name."""
+
+        if isinstance(key, str):
+            if key not in self._name_to_index:
+                raise Exception(f"'{key}' is not a valid field name")
+            return self.columns[self._name_to_index[key]]
+        if key < 0 or key >= len(self.columns):
+            raise Exception(f"index {key} is not a valid field index")
+        return self.columns[key]
+
+    def __len__(self) -> int:
+        return self.num_records
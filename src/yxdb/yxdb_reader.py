@@ -1,13 +1,18 @@
-import xml.etree.ElementTree as ET
 from io import BytesIO
 from typing import List
 
-from yxdb._buffered_record_reader import BufferedRecordReader
-from yxdb._metainfo_field import MetaInfoField
-from yxdb._yxdb_record import YxdbRecord
+from yxdb import _arrow, _columnar, _row_decoder
+from yxdb._buffered_record_reader import BufferedRecordReader, default_lzf_buffer_size
+from yxdb._filter import RowFilter
+from yxdb._header import Header, header_size, invalid_yxdb_msg
+from yxdb._mmap_record_reader import MmapRecordReader
+from yxdb._prefetch_record_reader import PrefetchRecordReader
+from yxdb._yxdb_record import YxdbRecord, cached_record
+from yxdb.yxdb_batch import YxdbBatch
 from yxdb.yxdb_field import YxdbField
+from yxdb.yxdb_schema import YxdbSchema, read_schema
 
-invalid_yxdb_msg = "file is not a valid YXDB format"
+records_per_block_index_entry = 0x10000
 
 
 class YxdbReader:
@@ -25,7 +30,18 @@ class YxdbReader:
 
     The value returned will be a data type appropriate for that field.
 
-    Use the list_fields() method to obtain the list of fields in the YXDB file.
+    Use the seek() method to jump to a record, or read_range() to read a range of records.
+    Both use the record block index stored in the file so only the blocks containing the
+    requested records are decompressed.
+
+    To read every field of every record, use the iter_rows() or iter_dicts() methods, which
+    decode each record with a function compiled for the file's schema.
+
+    Alternatively, use the read_batch() or iter_batches() methods to decode records into
+    NumPy columns. The batch methods require the optional numpy package.
+
+    Use the list_fields() method to obtain the list of fields in the YXDB file. To read only the
+    schema of a file, use YxdbReader.probe(path) or yxdb.read_schema(path).
     """
 
     def __init__(self, *args, **kwargs):
@@ -33,6 +49,42 @@ class YxdbReader:
         Instantiate a YXDB reader with 1 of the following parameters:
             * path: a string containing the path to a YXDB file
             * stream: a BytesIO object that streams a YXDB file
+
+        Optional parameters:
+            * columns: a list of field names or indices to read. Fields not in the list are
+              never decoded, and list_fields(), read_index() and the batch methods only see
+              the requested fields, in the requested order.
+            * mmap: when True, records are read from a memory map of the file instead of
+              through buffered reads. Requires a path or a stream backed by a real file.
+            * zero_copy: when True, records that sit entirely inside a decompressed block are
+              read in place instead of being copied into a record buffer. Values must be read
+              before the next call to next(); the batch methods are unaffected.
+            * read_ahead: the number of blocks a background thread reads and decompresses ahead
+              of the records being decoded. Overlaps disk and network latency with decoding;
+              cannot be combined with mmap.
+            * lzf_buffer_size: the initial size of the block buffers. Buffers grow automatically
+              when the file contains larger blocks.
+            * buffer_pool: a yxdb.buffer_pool.BufferPool shared by many readers. The reader takes
+              its block buffers from the pool and returns them when it is closed.
+            * filter: a list of conditions that records must match, e.g.
+              [('Int32Field', '>=', 10), ('DateField', '<', '2020-01-01'), ('Name', 'is_not_null')].
+              Conditions are tuples of (field, operator, value) using ==, !=, <, <=, > or >=, or
+              (field, 'is_null') and (field, 'is_not_null'). Comparisons are supported on numeric,
+              Byte, Bool, Date and DateTime fields; the field does not need to be in columns.
+              Conditions are tested on the raw record bytes, and records that do not match are
+              skipped by next(), iter_rows(), iter_dicts() and the batch methods without being
+              decoded.
+            * date_cache: when True, Date and DateTime values read with read_index() and
+              read_name() are memoized by their raw bytes, so repeated dates are parsed once.
+            * lazy_values: when True, read_index(), read_name() and iter_rows() return V_String and
+              V_WString values as yxdb.lazy_value.LazyString and Blob values as LazyBytes. Lazy
+              values wrap the record buffer and are only decoded when converted with str() or
+              bytes(); they are only valid until the next record is read. The batch methods are
+              unaffected.
+            * dictionary: a list of String, WString, V_String or V_WString field names or indices
+              to dictionary-encode in the batch methods. Each distinct value is decoded once per
+              batch; the column holds int32 codes and a dictionary of strings, and maps to an Arrow
+              DictionaryArray in the Arrow methods.
         """
 
         stream: BytesIO = kwargs.get('stream', None)
@@ -48,22 +100,74 @@ class YxdbReader:
 
         self._stream = stream
         self._path = path
-        self._fields: List[MetaInfoField] = []
+        self._use_mmap: bool = kwargs.get('mmap', False)
+        self._zero_copy: bool = kwargs.get('zero_copy', False)
+        self._read_ahead: int = kwargs.get('read_ahead', 0)
+        self._lzf_buffer_size: int = kwargs.get('lzf_buffer_size', default_lzf_buffer_size)
+        self._buffer_pool = kwargs.get('buffer_pool', None)
+        if self._use_mmap and self._read_ahead > 0:
+            stream.close()
+            raise TypeError("'mmap' and 'read_ahead' cannot be combined")
         self.num_records = 0
         self._meta_info_size = 0
+        self._record_block_index_pos = 0
+        self._records_end_pos = 0
+        self._block_positions: List[int] = None
         self.meta_info_str = ''
         self._record: YxdbRecord = None
         self._record_reader: BufferedRecordReader = None
+        self._row_decoder = None
+        self._filter: RowFilter = None
 
         try:
             self._load_header_and_meta_info()
         except Exception:
             raise Exception(invalid_yxdb_msg)
+        self._record_reader = self._new_record_reader()
+
+        conditions = kwargs.get('filter', None)
+        if conditions is not None:
+            try:
+                self._filter = RowFilter(self._record, conditions)
+            except Exception:
+                self._stream.close()
+                raise
+        columns = kwargs.get('columns', None)
+        if columns is not None:
+            self._project(columns)
+        if kwargs.get('date_cache', False):
+            self._record = self._record.with_date_cache()
+        if kwargs.get('lazy_values', False):
+            self._record = self._record.with_lazy_values()
+        dictionary = kwargs.get('dictionary', None)
+        if dictionary is not None:
+            try:
+                self._record = self._record.with_dictionary(dictionary)
+            except Exception:
+                self._stream.close()
+                raise
+
+    @staticmethod
+    def probe(path: str) -> YxdbSchema:
+        """
+        Reads the fields, record count and meta info of a YXDB file without opening a reader.
+
+        Only the header and the meta info are read, and the file is closed right away.
+        """
+
+        return read_schema(path)
 
     def next(self) -> bool:
         """Returns True if a record is available and False if the end of the file is reached."""
 
-        return self._record_reader.next_record()
+        if self._filter is None:
+            return self._record_reader.next_record()
+        matches = self._filter.matches
+        record_reader = self._record_reader
+        while record_reader.next_record():
+            if matches(record_reader.record_buffer):
+                return True
+        return False
 
     def read_index(self, index: int):
         """Returns the value in a field, specified by the field's index."""
@@ -75,32 +179,174 @@ class YxdbReader:
 
         return self._record.extract_from_name(name, self._record_reader.record_buffer)
 
+    def iter_rows(self):
+        """Iterates the remaining records in the file as tuples containing one value per field."""
+
+        if self._row_decoder is None:
+            self._row_decoder = _row_decoder.new_row_decoder(self._record)
+        decode = self._row_decoder
+        record_reader = self._record_reader
+        if self._filter is None:
+            while record_reader.next_record():
+                yield decode(record_reader.record_buffer)
+            return
+        matches = self._filter.matches
+        while record_reader.next_record():
+            buffer = record_reader.record_buffer
+            if matches(buffer):
+                yield decode(buffer)
+
+    def iter_dicts(self):
+        """Iterates the remaining records in the file as dicts keyed by field name."""
+
+        names = [field.name for field in self._record.fields]
+        for row in self.iter_rows():
+            yield dict(zip(names, row))
+
+    def read_batch(self, n: int) -> YxdbBatch:
+        """
+        Reads up to n records into a YxdbBatch containing one NumPy column per field.
+
+        The returned batch contains fewer than n records when the end of the file is reached,
+        and 0 records once the file has been fully read. When a filter is set, only matching records
+        count towards n.
+        """
+
+        return _columnar.read_batch(self._record_reader, self._record, n, self._filter)
+
+    def iter_batches(self, batch_size: int = 65536):
+        """Iterates the remaining records in the file as YxdbBatch objects of up to batch_size records."""
+
+        while True:
+            batch = self.read_batch(batch_size)
+            if batch.num_records == 0:
+                return
+            yield batch
+
+    def iter_arrow_batches(self, batch_size: int = 65536):
+        """Iterates the remaining records in the file as pyarrow.RecordBatch objects of up to batch_size records."""
+
+        while True:
+            batches = _arrow.read_record_batches(self._record_reader, self._record, batch_size, self._filter)
+            if batches[0].num_rows == 0:
+                return
+            yield from batches
+
+    def to_arrow(self, batch_size: int = 65536):
+        """Reads the remaining records in the file into a pyarrow.Table."""
+
+        pa = _arrow.pyarrow()
+        return pa.Table.from_batches(list(self.iter_arrow_batches(batch_size)), schema=_arrow.schema(self._record))
+
+    def seek(self, record_number: int):
+        """
+        Positions the reader so the next call to next() reads the record at record_number (0-based).
+
+        The reader jumps straight to the compressed block containing the record using the file's
+        record block index, so the stream must be seekable.
+        """
+
+        if record_number < 0 or record_number > self.num_records:
+            raise IndexError(f"record {record_number} is out of range")
+        if self._block_positions is None:
+            # the block index is read from the shared stream, so background reads must stop first
+            self._record_reader.release_stream()
+            self._block_positions = self._load_block_index()
+        self._reopen_stream_if_closed()
+
+        entry = min(record_number // records_per_block_index_entry, len(self._block_positions) - 1)
+        entry_start = entry * records_per_block_index_entry
+        record_reader = self._record_reader
+        if not entry_start <= record_reader.current_record <= record_number:
+            record_reader.seek(self._block_positions[entry], entry_start)
+        record_reader.skip_records(record_number - record_reader.current_record)
+
+    def read_range(self, start: int, stop: int) -> YxdbBatch:
+        """
+        Reads the records from start (inclusive) to stop (exclusive) into a YxdbBatch.
+
+        Only the compressed blocks containing the requested records are decompressed. When a filter
+        is set, the batch only contains the records in the range that match it.
+        """
+
+        stop = min(stop, self.num_records)
+        if stop <= start:
+            return self.read_batch(0)
+        self.seek(start)
+        return _columnar.read_batch(self._record_reader, self._record, stop - start, self._filter, stop - start)
+
     def list_fields(self) -> List[YxdbField]:
         """Provides the list of fields in the YXDB file"""
 
-        return self._record.fields
+        return list(self._record.fields)
 
     def close(self):
         """Closes the YXDB stream early."""
 
-        self._stream.close()
+        self._record_reader.close()
 
     def _load_header_and_meta_info(self):
-        header = self._get_header()
-        file_type = str(header[0:21].tobytes(), 'latin1')
-        if "Alteryx Database File" != file_type:
+        header = Header(self._get_header())
+        if not header.is_valid():
             self._close_stream_and_raise()
 
-        self.num_records = int.from_bytes(header[104:108], 'little')
-        self._meta_info_size = int.from_bytes(header[80:84], 'little')
+        self.num_records = header.num_records
+        self._record_block_index_pos = header.record_block_index_pos
+        self._records_end_pos = header.records_end_pos()
+        self._meta_info_size = header.meta_info_size
         self._load_meta_info()
-        self._record = YxdbRecord(self._fields)
-        self._record_reader = BufferedRecordReader(self._stream, self._record.fixed_size, self._record.has_var, self.num_records)
+        self._record = cached_record(self.meta_info_str)
+
+    def _new_record_reader(self) -> BufferedRecordReader:
+        args = (self._stream, self._record.fixed_size, self._record.has_var, self.num_records)
+        options = {'zero_copy': self._zero_copy, 'lzf_buffer_size': self._lzf_buffer_size, 'buffer_pool': self._buffer_pool}
+        if self._read_ahead > 0:
+            return PrefetchRecordReader(*args, read_ahead=self._read_ahead, end_position=self._records_end_pos, **options)
+        if not self._use_mmap:
+            return BufferedRecordReader(*args, **options)
+        try:
+            return MmapRecordReader(*args, **options)
+        except Exception:
+            self._stream.close()
+            raise
+
+    def _project(self, columns: List):
+        try:
+            indices = [self._record.get_index(column) for column in columns]
+        except Exception:
+            self._stream.close()
+            raise
+        self._record = self._record.project(indices)
+        self._record_reader.skip_var_data = not self._record.uses_var
+
+    def _load_block_index(self) -> List[int]:
+        first_block = header_size + (self._meta_info_size * 2)
+        self._reopen_stream_if_closed()
+        position = self._stream.tell()
+        self._stream.seek(self._record_block_index_pos)
+        count = int.from_bytes(self._stream.read(4), 'little')
+        index = self._stream.read(count * 8)
+        positions = [int.from_bytes(index[i:i+8], 'little') for i in range(0, len(index), 8)]
+        expected = max(1, -(-self.num_records // records_per_block_index_entry))
+        if len(positions) != expected or (positions and positions[0] != first_block):
+            positions = [first_block]
+        self._stream.seek(position)
+        return positions
+
+    def _reopen_stream_if_closed(self):
+        if not self._stream.closed:
+            return
+        if self._path == '':
+            raise IOError("the YXDB stream is closed")
+        self._stream = open(self._path, 'rb')
+        self._record_reader.reopen(self._stream)
+        # the position and decompressed block of the closed stream are stale, so start over at record 0
+        self._record_reader.seek(header_size + (self._meta_info_size * 2), 0)
 
     def _get_header(self) -> memoryview:
-        buffer = memoryview(bytearray(512))
+        buffer = memoryview(bytearray(header_size))
         read = self._stream.readinto(buffer)
-        if read < 512:
+        if read < header_size:
             self._close_stream_and_raise()
         return buffer
 
@@ -111,34 +357,8 @@ class YxdbReader:
         if len(meta_info_bytes) != length:
             self._close_stream_and_raise()
         self.meta_info_str = str(meta_info_bytes, "utf_16_le")
-        self._get_fields()
-
-    def _get_fields(self):
-        root = ET.fromstring(self.meta_info_str)
-        if root.tag == "RecordInfo":
-            record_info = root
-        else:
-            record_info = root.find("RecordInfo")
-        for field in record_info.iter(tag="Field"):
-            name = _parse_string(field.get("name"))
-            data_type = _parse_string(field.get("type"))
-            size = _parse_int(field.get("size"))
-            scale = _parse_int(field.get("scale"))
-
-            self._fields.append(MetaInfoField(name, data_type, size, scale))
 
     def _close_stream_and_raise(self):
         self._stream.close()
         raise IOError(invalid_yxdb_msg)
 
-
-def _parse_int(value) -> int:
-    if value is None:
-        return 0
-    return int(value)
-
-
-def _parse_string(value) -> str:
-    if value is None:
-        raise IOError("YXDB metadata is invalid")
-    return value
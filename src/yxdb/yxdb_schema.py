@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List
+
+from yxdb._header import Header, header_size, invalid_yxdb_msg
+from yxdb._yxdb_record import cached_record
+from yxdb.yxdb_field import YxdbField
+
+
+class YxdbSchema:
+    """
+    YxdbSchema contains the metadata of a YXDB file: its fields, its record count and the
+    RecordInfo XML stored in the file.
+    """
+
+    def __init__(self, fields: List[YxdbField], num_records: int, meta_info_str: str):
+        self.fields = fields
+        self.num_records = num_records
+        self.meta_info_str = meta_info_str
+
+
+def read_schema(path: str) -> YxdbSchema:
+    """
+    Reads the schema of a YXDB file.
+
+    Only the 512-byte header and the meta info are read, no record buffers are allocated,
+    and the file is closed before the function returns.
+    """
+
+    with open(path, 'rb') as stream:
+        try:
+            header = Header(memoryview(stream.read(header_size)))
+            if not header.is_valid():
+                raise IOError(invalid_yxdb_msg)
+            length = (header.meta_info_size * 2) - 2
+            meta_info_bytes = stream.read(length)
+            if len(meta_info_bytes) != length:
+                raise IOError(invalid_yxdb_msg)
+            meta_info_str = str(meta_info_bytes, "utf_16_le")
+            fields = list(cached_record(meta_info_str).fields)
+        except Exception:
+            raise Exception(invalid_yxdb_msg)
+    return YxdbSchema(fields, header.num_records, meta_info_str)
+
+
+def read_schemas(paths: Iterable[str], workers: int = None) -> Iterator[YxdbSchema]:
+    """
+    Reads the schemas of many YXDB files concurrently using a pool of threads.
+
+    Schemas are yielded in the order of paths. The exception raised by an invalid file is
+    re-raised when its schema is reached.
+    """
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for schema in executor.map(read_schema, paths):
+            yield schema
@@ -0,0 +1,242 @@
+import functools
+import time
+from io import BytesIO
+from typing import List, Mapping
+
+from yxdb import _arrow, _columnar, _lzf, _record_encoder
+from yxdb._block_writer import BlockWriter
+from yxdb._header import build_header, format_fields, header_size
+from yxdb._lzf import Lzf, compress_block
+from yxdb._metainfo_field import MetaInfoField
+from yxdb._yxdb_record import YxdbRecord, cached_record
+from yxdb.yxdb_batch import YxdbBatch
+from yxdb.yxdb_field import DataType, YxdbField
+from yxdb.yxdb_reader import records_per_block_index_entry
+
+_default_sizes = {
+    'V_String': 2147483647,
+    'V_WString': 1073741823,
+    'Blob': 2147483647,
+    'SpatialObj': 2147483647,
+}
+
+_required_sizes = {'String', 'WString', 'FixedDecimal'}
+
+
+def _compress_native(block: bytes):
+    # the pure Python compressor runs at a few MB/s, so without python-lzf blocks are stored raw
+    native = _lzf.backends.get('native')
+    if native is None:
+        return None
+    return compress_block(block, native)
+
+
+_compressors = {
+    'fast': _compress_native,
+    'python': functools.partial(compress_block, backend=Lzf),
+    'tight': functools.partial(compress_block, tight=True),
+    None: lambda block: None,
+}
+
+_data_type_names = {
+    DataType.BLOB: 'Blob',
+    DataType.BOOLEAN: 'Bool',
+    DataType.BYTE: 'Byte',
+    DataType.DATE: 'DateTime',
+    DataType.DOUBLE: 'Double',
+    DataType.LONG: 'Int64',
+    DataType.STRING: 'V_WString',
+}
+
+
+class YxdbWriter:
+    """
+    YxdbWriter contains the public API for writing YXDB files
+
+    Instantiate YxdbWriter with a list of fields and either a string containing the path of the
+    YXDB file to create, or a seekable BytesIO object to write the file into.
+
+    Records can be written one at a time or in bulk:
+        * write_row() and write_rows(): write sequences or dicts of values
+        * write_columns(): write a dict or list of columns (lists or NumPy arrays)
+        * write_batch(): write a YxdbBatch read from another file
+        * write_arrow(): write a pyarrow.Table or pyarrow.RecordBatch
+
+    None values are written as nulls. The bulk methods require the optional numpy package and
+    encode the fixed-width fields of every record with vectorized NumPy operations.
+
+    Call close() (or use the writer as a context manager) to write the record block index and
+    the final header.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Instantiate a YXDB writer with the following parameters:
+            * fields: a list of MetaInfoField or YxdbField objects. MetaInfoField sets the exact
+              Alteryx type, e.g. MetaInfoField('Name', 'V_String', 0, 0); size is required for
+              String, WString and FixedDecimal fields. YxdbField uses Int64, Double, Bool, Byte,
+              DateTime, V_WString and Blob fields for its data types.
+            * path: a string containing the path of the YXDB file to create
+            * stream: a seekable BytesIO object to write the YXDB file into
+
+        Optional parameters:
+            * compression: 'fast' (the default) LZF-compresses record blocks with python-lzf and
+              stores them uncompressed when it is not installed. 'python' always uses the pure
+              Python compressor, which is much slower, and 'tight' uses python-lzf or a pure Python
+              compressor that searches harder for matches. None stores every block uncompressed.
+              Blocks that do not get smaller are always stored uncompressed.
+        """
+
+        fields = kwargs.get('fields', None)
+        if fields is None:
+            raise TypeError("'fields' must be provided")
+        meta_fields = [_to_meta_info_field(field) for field in fields]
+
+        compression = kwargs.get('compression', 'fast')
+        if compression not in _compressors:
+            raise ValueError(f"'{compression}' is not a valid compression, use 'fast', 'python', 'tight' or None")
+
+        stream: BytesIO = kwargs.get('stream', None)
+        path: str = kwargs.get('path', None)
+        if stream is None and path is None:
+            raise TypeError("either 'path' or 'stream' must be provided")
+        self._owns_stream = stream is None
+        if stream is None:
+            if not isinstance(path, str):
+                raise TypeError("'path' must be a string")
+            stream = open(path, 'wb')
+
+        self.meta_info_str = format_fields(meta_fields)
+        self.num_records = 0
+        self._record: YxdbRecord = cached_record(self.meta_info_str)
+        self._names = [field.name for field in self._record.fields]
+        self._encode_row = _record_encoder.new_row_encoder(self._record)
+        self._stream = stream
+        self._start = stream.tell()
+        self._closed = False
+
+        stream.write(bytes(header_size))
+        stream.write(bytes(self.meta_info_str, 'utf_16_le') + b'\x00\x00')
+        self._blocks = BlockWriter(stream, _compressors[compression], self._start)
+
+    def write_row(self, row):
+        """Writes a record from a sequence with one value per field, or a dict keyed by field name."""
+
+        if isinstance(row, Mapping):
+            row = [row.get(name) for name in self._names]
+        record = self._encode_row(row)
+        if self.num_records % records_per_block_index_entry == 0:
+            self._blocks.start_index_entry()
+        self._blocks.write(record)
+        self.num_records += 1
+
+    def write_rows(self, rows):
+        """Writes every record in an iterable of sequences or dicts."""
+
+        for row in rows:
+            self.write_row(row)
+
+    def write_columns(self, columns):
+        """
+        Writes records from columns of values.
+
+        columns is either a dict keyed by field name or a list with one column per field. Each
+        column is a list or a NumPy array; None, NaT and masked entries are written as nulls.
+        """
+
+        np = _columnar.numpy()
+        if isinstance(columns, Mapping):
+            columns = [columns[name] for name in self._names]
+        self._write_arrays([_to_arrays(np, values, None) for values in columns])
+
+    def write_batch(self, batch: YxdbBatch):
+        """Writes the records of a YxdbBatch, matching its columns to the fields by position."""
+
+        np = _columnar.numpy()
+        self._write_arrays([_to_arrays(np, column.decoded(), column.nulls) for column in batch.columns])
+
+    def write_arrow(self, data):
+        """Writes the records of a pyarrow.Table or pyarrow.RecordBatch, matching its columns to the fields by name."""
+
+        np = _columnar.numpy()
+        pa = _arrow.pyarrow()
+        arrays = []
+        for name in self._names:
+            column = data.column(name)
+            nulls = column.is_null().to_numpy(zero_copy_only=False)
+            if column.null_count > 0 and (pa.types.is_integer(column.type) or pa.types.is_boolean(column.type)):
+                # to_numpy() turns integer columns with nulls into float64, which loses precision
+                column = column.fill_null(False if pa.types.is_boolean(column.type) else 0)
+            arrays.append(_to_arrays(np, column.to_numpy(zero_copy_only=False), nulls))
+        self._write_arrays(arrays)
+
+    def close(self):
+        """Writes the record block index and the header, and closes the stream if the writer opened it."""
+
+        if self._closed:
+            return
+        self._closed = True
+        index_position = self._blocks.write_block_index()
+        end = self._stream.tell()
+        self._stream.seek(self._start)
+        # the header counts UTF-16 code units, including the terminator
+        meta_info_size = (len(self.meta_info_str.encode('utf_16_le')) // 2) + 1
+        self._stream.write(build_header(meta_info_size, index_position, self.num_records, int(time.time())))
+        self._stream.seek(end)
+        if self._owns_stream:
+            self._stream.close()
+        else:
+            self._stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_arrays(self, arrays: List):
+        if len(arrays) != len(self._names):
+            raise ValueError(f"expected {len(self._names)} columns but got {len(arrays)}")
+        count = len(arrays[0][0]) if arrays else 0
+        for values, _ in arrays:
+            if len(values) != count:
+                raise ValueError("all columns must have the same length")
+        start = 0
+        while start < count:
+            offset = self.num_records % records_per_block_index_entry
+            if offset == 0:
+                self._blocks.start_index_entry()
+            end = min(count, start + records_per_block_index_entry - offset)
+            chunk = [(values[start:end], nulls[start:end]) for values, nulls in arrays]
+            self._blocks.write(_record_encoder.encode_columns(self._record, chunk, end - start))
+            self.num_records += end - start
+            start = end
+
+
+def _to_meta_info_field(field) -> MetaInfoField:
+    if isinstance(field, YxdbField):
+        field = MetaInfoField(field.name, _data_type_names[field.data_type], 0, 0)
+    data_type = field.data_type
+    size = field.size
+    if data_type in _default_sizes and size == 0:
+        size = _default_sizes[data_type]
+    if data_type in _required_sizes and size <= 0:
+        raise ValueError(f"field '{field.name}' of type {data_type} requires a size")
+    return MetaInfoField(field.name, data_type, size, field.scale)
+
+
+def _to_arrays(np, values, nulls):
+    if isinstance(values, np.ma.MaskedArray):
+        mask = np.ma.getmaskarray(values)
+        nulls = mask if nulls is None else (np.asarray(nulls, dtype=bool) | mask)
+        values = values.data
+    if not isinstance(values, np.ndarray):
+        values = np.array(values, dtype=object)
+    if nulls is None:
+        if values.dtype == object:
+            nulls = np.array([value is None for value in values], dtype=bool)
+        elif values.dtype.kind == 'M':
+            nulls = np.isnat(values)
+        else:
+            nulls = np.zeros(len(values), dtype=bool)
+    return values, np.asarray(nulls, dtype=bool)
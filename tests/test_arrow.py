@@ -0,0 +1,141 @@
+import datetime
+import unittest
+from unittest.mock import patch
+
+from yxdb import _arrow
+from yxdb.yxdb_reader import YxdbReader
+
+try:
+    import numpy as np
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+@unittest.skipUnless(pa is not None, "pyarrow is not installed")
+class TestArrow(unittest.TestCase):
+    def test_all_normal_fields(self):
+        yxdb = YxdbReader(path="./test_files/AllNormalFields.yxdb")
+        table = yxdb.to_arrow()
+
+        self.assertEqual(1, table.num_rows)
+        self.assertEqual(16, table.num_columns)
+        self.assertEqual(pa.uint8(), table.schema.field("ByteField").type)
+        self.assertEqual(pa.int16(), table.schema.field("Int16Field").type)
+        self.assertEqual(pa.date32(), table.schema.field("DateField").type)
+        self.assertEqual(pa.timestamp('s'), table.schema.field("DateTimeField").type)
+        row = table.to_pylist()[0]
+        self.assertEqual(1, row["ByteField"])
+        self.assertEqual(True, row["BoolField"])
+        self.assertEqual(16, row["Int16Field"])
+        self.assertEqual(32, row["Int32Field"])
+        self.assertEqual(64, row["Int64Field"])
+        self.assertEqual(123.45, row["FixedDecimalField"])
+        self.assertEqual(0.12345, row["DoubleField"])
+        self.assertEqual("A", row["StringField"])
+        self.assertEqual("AB", row["WStringField"])
+        self.assertEqual("ABC", row["V_StringShortField"])
+        self.assertEqual("B" * 500, row["V_StringLongField"])
+        self.assertEqual("XZY", row["V_WStringShortField"])
+        self.assertEqual("W" * 500, row["V_WStringLongField"])
+        self.assertEqual(datetime.date(2020, 1, 1), row["DateField"])
+        self.assertEqual(datetime.datetime(2020, 2, 3, 4, 5, 6), row["DateTimeField"])
+
+    def test_iter_arrow_batches(self):
+        yxdb = YxdbReader(path="./test_files/LotsOfRecords.yxdb")
+        sizes = []
+        total = 0
+        for batch in yxdb.iter_arrow_batches(40000):
+            sizes.append(batch.num_rows)
+            total += sum(batch.column(0).to_pylist())
+
+        self.assertEqual([40000, 40000, 20000], sizes)
+        self.assertEqual(5000050000, total)
+
+    def test_tutorial_data_matches_read_index(self):
+        expected = []
+        yxdb = YxdbReader(path="./test_files/TutorialData.yxdb")
+        while yxdb.next():
+            expected.append([yxdb.read_index(i) for i in range(len(yxdb.list_fields()))])
+
+        table = YxdbReader(path="./test_files/TutorialData.yxdb").to_arrow(1000)
+        self.assertEqual(len(expected), table.num_rows)
+        for index, column in enumerate(table.columns):
+            self.assertEqual([row[index] for row in expected], column.to_pylist())
+
+    def test_null_spatial(self):
+        table = YxdbReader(path="./test_files/null-spatial.yxdb").to_arrow()
+        self.assertEqual(pa.binary(), table.schema.field(len(table.schema) - 1).type)
+        self.assertEqual([None], table.column(len(table.schema) - 1).to_pylist())
+
+    def test_spatial_blob(self):
+        expected = None
+        yxdb = YxdbReader(path="./test_files/poly.yxdb")
+        while yxdb.next():
+            expected = yxdb.read_index(len(yxdb.list_fields()) - 1)
+
+        table = YxdbReader(path="./test_files/poly.yxdb").to_arrow()
+        self.assertEqual([expected], table.column(len(table.schema) - 1).to_pylist())
+
+    def test_repeated_columns(self):
+        table = YxdbReader(path="./test_files/AllNormalFields.yxdb", columns=['Int32Field', 'Int32Field']).to_arrow()
+        self.assertEqual(['Int32Field', 'Int32Field'], table.column_names)
+        self.assertEqual([[32], [32]], [column.to_pylist() for column in table.columns])
+
+    def test_split_batches_over_offset_limit(self):
+        for path in ["./test_files/TutorialData.yxdb", "./test_files/VeryLongField.yxdb"]:
+            with self.subTest(path=path):
+                expected = YxdbReader(path=path).to_arrow()
+                with patch.object(_arrow, '_max_offset', 5000):
+                    batches = list(YxdbReader(path=path).iter_arrow_batches())
+                    table = YxdbReader(path=path).to_arrow()
+                self.assertTrue(table.equals(expected))
+                self.assertLess(1, len(batches))
+                self.assertEqual(expected.num_rows, sum(batch.num_rows for batch in batches))
+                for batch in batches:
+                    self.assertEqual(expected.schema, batch.schema)
+
+    def test_empty_table_keeps_schema(self):
+        yxdb = YxdbReader(path="./test_files/AllNormalFields.yxdb")
+        yxdb.to_arrow()
+        table = yxdb.to_arrow()
+        self.assertEqual(0, table.num_rows)
+        self.assertEqual(16, table.num_columns)
+
+    def test_dictionary_columns(self):
+        path = "./test_files/TutorialData.yxdb"
+        table = YxdbReader(path=path, dictionary=["Country", "Prefix"]).to_arrow(batch_size=1000)
+        expected = YxdbReader(path=path).to_arrow()
+        self.assertEqual(pa.dictionary(pa.int32(), pa.string()), table.schema.field("Country").type)
+        self.assertEqual(pa.string(), table.schema.field("First").type)
+        for name in ["Country", "Prefix"]:
+            self.assertEqual(expected.column(name).to_pylist(), table.column(name).to_pylist())
+
+    def test_transcode_latin1(self):
+        values = ['abc', 'caf\u00e9', '', '\u00ff\u00fe']
+        offsets, data = _offsets_and_data([value.encode('latin1') for value in values])
+        utf8_offsets, utf8_data = _arrow._latin1_to_utf8(offsets, data)
+        self.assertEqual(values, _decode(utf8_offsets, utf8_data))
+
+    def test_transcode_utf16(self):
+        values = ['abc', 'caf\u00e9', '', '\u4e2d\u6587', '\U0001f600x']
+        offsets, data = _offsets_and_data([value.encode('utf_16_le') for value in values])
+        utf8_offsets, utf8_data = _arrow._utf16_to_utf8(offsets, data)
+        self.assertEqual(values, _decode(utf8_offsets, utf8_data))
+
+
+def _offsets_and_data(encoded):
+    data = bytearray()
+    offsets = [0]
+    for value in encoded:
+        data += value
+        offsets.append(len(data))
+    return np.array(offsets, dtype=np.int64), data
+
+
+def _decode(offsets, data):
+    return [str(data[offsets[i]:offsets[i + 1]], 'utf-8') for i in range(len(offsets) - 1)]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import asyncio
+import unittest
+from io import BytesIO
+
+from yxdb.async_reader import AsyncYxdbReader, _QueuedRecordReader, _RecordCounter
+from yxdb.yxdb_reader import YxdbReader
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ChunkedSource:
+    """An async byte source that returns at most chunk_size bytes per read."""
+
+    def __init__(self, path: str, chunk_size: int):
+        with open(path, 'rb') as file:
+            self.stream = BytesIO(file.read())
+        self.chunk_size = chunk_size
+        self.closed = False
+
+    async def read(self, size: int) -> bytes:
+        await asyncio.sleep(0)
+        return self.stream.read(min(size, self.chunk_size))
+
+    async def close(self):
+        self.closed = True
+
+
+async def read_all(batch_size: int, **kwargs):
+    reader = await AsyncYxdbReader.open(**kwargs)
+    return [batch async for batch in reader.batches(batch_size)]
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestAsyncYxdbReader(unittest.TestCase):
+    def test_lots_of_records(self):
+        batches = run(read_all(30000, path="./test_files/LotsOfRecords.yxdb", prefetch=2))
+        self.assertEqual([30000, 30000, 30000, 10000], [batch.num_records for batch in batches])
+        values = np.concatenate([batch.column(0).values for batch in batches])
+        self.assertEqual(list(range(1, 100001)), values.tolist())
+
+    def test_matches_yxdb_reader(self):
+        for path in ["./test_files/TutorialData.yxdb", "./test_files/VeryLongField.yxdb", "./test_files/AllNormalFields.yxdb"]:
+            batches = run(read_all(1000, source=ChunkedSource(path, 100000)))
+            expected = YxdbReader(path=path).read_batch(100000)
+            self.assertEqual(expected.num_records, sum(batch.num_records for batch in batches), path)
+            for index, column in enumerate(expected.columns):
+                values = [value for batch in batches for value in batch.columns[index].values.tolist()]
+                self.assertEqual(column.values.tolist(), values, f"{path} {column.name}")
+
+    def test_columns(self):
+        batches = run(read_all(65536, path="./test_files/TutorialData.yxdb", columns=['Last', 'UserID']))
+        self.assertEqual(['Last', 'UserID'], [column.name for column in batches[0].columns])
+        self.assertEqual(8716, batches[0].num_records)
+
+    def test_source_is_closed(self):
+        source = ChunkedSource("./test_files/TutorialData.yxdb", 1000)
+        run(read_all(100, source=source))
+        self.assertTrue(source.closed)
+
+    def test_invalid_file(self):
+        with self.assertRaises(Exception) as context:
+            run(read_all(100, path="./test_files/invalid.txt"))
+        self.assertEqual("file is not a valid YXDB format", str(context.exception))
+
+    def test_queued_reader_skips_lzf_buffers(self):
+        record_reader = _QueuedRecordReader(4, False, 2, False)
+        self.assertIsNone(record_reader.lzf_in)
+        self.assertIsNone(record_reader.lzf_out)
+        record_reader.blocks.append(memoryview(bytes(range(8))))
+        self.assertTrue(record_reader.next_record())
+        self.assertEqual(bytes(range(4)), record_reader.record_buffer.tobytes())
+
+
+class TestRecordCounter(unittest.TestCase):
+    def test_var_length_split_across_blocks(self):
+        # two records with a fixed part of 2 bytes and var data of 3 and 0 bytes
+        data = b'\x01\x02' + (3).to_bytes(4, 'little') + b'abc' + b'\x03\x04' + (0).to_bytes(4, 'little')
+        for split in range(len(data) + 1):
+            counter = _RecordCounter(2, True)
+            counter.feed(memoryview(data[:split]))
+            counter.feed(memoryview(data[split:]))
+            self.assertEqual(2, counter.records, split)
+
+    def test_fixed_records(self):
+        counter = _RecordCounter(4, False)
+        counter.feed(memoryview(bytes(10)))
+        self.assertEqual(2, counter.records)
+        counter.feed(memoryview(bytes(2)))
+        self.assertEqual(3, counter.records)
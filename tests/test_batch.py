@@ -0,0 +1,233 @@
+import datetime
+import unittest
+from io import BytesIO
+
+from yxdb import _columnar, _extractors
+from yxdb._metainfo_field import MetaInfoField
+from yxdb.yxdb_reader import YxdbReader
+from yxdb.yxdb_writer import YxdbWriter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestBatch(unittest.TestCase):
+    def test_all_normal_fields(self):
+        yxdb = YxdbReader(path="./test_files/AllNormalFields.yxdb")
+        batch = yxdb.read_batch(10)
+
+        self.assertEqual(1, batch.num_records)
+        self.assertEqual(16, len(batch.columns))
+        self.assertEqual(np.uint8, batch.column("ByteField").values.dtype)
+        self.assertEqual(1, batch.column("ByteField").values[0])
+        self.assertEqual(np.bool_, batch.column("BoolField").values.dtype)
+        self.assertEqual(True, batch.column("BoolField").values[0])
+        self.assertEqual(np.int16, batch.column("Int16Field").values.dtype)
+        self.assertEqual(16, batch.column("Int16Field").values[0])
+        self.assertEqual(np.int32, batch.column("Int32Field").values.dtype)
+        self.assertEqual(32, batch.column("Int32Field").values[0])
+        self.assertEqual(np.int64, batch.column("Int64Field").values.dtype)
+        self.assertEqual(64, batch.column("Int64Field").values[0])
+        self.assertEqual(123.45, batch.column("FixedDecimalField").values[0])
+        self.assertEqual(np.float32, batch.column("FloatField").values.dtype)
+        self.assertEqual(np.float64, batch.column("DoubleField").values.dtype)
+        self.assertEqual(0.12345, batch.column("DoubleField").values[0])
+        self.assertEqual("A", batch.column("StringField").values[0])
+        self.assertEqual("AB", batch.column("WStringField").values[0])
+        self.assertEqual("ABC", batch.column("V_StringShortField").values[0])
+        self.assertEqual("B" * 500, batch.column("V_StringLongField").values[0])
+        self.assertEqual("XZY", batch.column("V_WStringShortField").values[0])
+        self.assertEqual("W" * 500, batch.column("V_WStringLongField").values[0])
+        self.assertEqual(np.datetime64('2020-01-01T00:00:00'), batch.column("DateField").values[0])
+        self.assertEqual(np.datetime64('2020-02-03T04:05:06'), batch.column("DateTimeField").values[0])
+        for column in batch.columns:
+            self.assertFalse(column.nulls[0], column.name)
+
+        self.assertEqual(0, yxdb.read_batch(10).num_records)
+
+    def test_lots_of_records(self):
+        yxdb = YxdbReader(path="./test_files/LotsOfRecords.yxdb")
+        sizes = []
+        total = 0
+        for batch in yxdb.iter_batches(30000):
+            sizes.append(batch.num_records)
+            total += int(batch.column(0).values.sum())
+
+        self.assertEqual([30000, 30000, 30000, 10000], sizes)
+        self.assertEqual(5000050000, total)
+
+    def test_batches_match_read_index(self):
+        expected = []
+        yxdb = YxdbReader(path="./test_files/TutorialData.yxdb")
+        while yxdb.next():
+            expected.append([yxdb.read_index(i) for i in range(len(yxdb.list_fields()))])
+
+        yxdb = YxdbReader(path="./test_files/TutorialData.yxdb")
+        row = 0
+        for batch in yxdb.iter_batches(1000):
+            for i in range(batch.num_records):
+                for index, column in enumerate(batch.columns):
+                    value = None if column.nulls[i] else _to_python(column.values[i])
+                    self.assertEqual(expected[row][index], value)
+                row += 1
+        self.assertEqual(len(expected), row)
+
+    def test_columns(self):
+        yxdb = YxdbReader(path="./test_files/AllNormalFields.yxdb", columns=["Int32Field", "V_StringShortField"])
+        batch = yxdb.read_batch(10)
+
+        self.assertEqual(["Int32Field", "V_StringShortField"], [column.name for column in batch.columns])
+        self.assertEqual(32, batch.column(0).values[0])
+        self.assertEqual("ABC", batch.column(1).values[0])
+
+    def test_read_range(self):
+        yxdb = YxdbReader(path="./test_files/LotsOfRecords.yxdb")
+        batch = yxdb.read_range(99000, 100010)
+
+        self.assertEqual(1000, batch.num_records)
+        self.assertEqual(list(range(99001, 100001)), batch.column(0).values.tolist())
+        self.assertEqual([66, 67], yxdb.read_range(65, 67).column(0).values.tolist())
+        self.assertEqual(0, yxdb.read_range(10, 10).num_records)
+
+    def test_record_dtype(self):
+        yxdb = YxdbReader(path="./test_files/AllNormalFields.yxdb")
+        dtype = _columnar.record_dtype(yxdb._record)
+
+        self.assertEqual(yxdb._record.fixed_size, dtype.itemsize)
+        names = [field.name for field in yxdb.list_fields()]
+        self.assertEqual([f'f{index}' for index in range(len(names))], list(dtype.names))
+        int32 = dtype[_columnar.field_key(names.index("Int32Field"))]
+        self.assertEqual(np.dtype('<i4'), int32["value"])
+        self.assertEqual(np.dtype('u1'), int32["null"])
+        self.assertEqual(np.dtype('S19'), dtype[_columnar.field_key(names.index("DateTimeField"))]["value"])
+        self.assertEqual(("value",), dtype[_columnar.field_key(names.index("BoolField"))].names)
+        for index, layout in enumerate(yxdb._record.layouts):
+            self.assertEqual(layout.start, dtype.fields[_columnar.field_key(index)][1])
+
+    def test_repeated_columns(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        columns = ['Int32Field', 'Int32Field', 'StringField', 'DateField', 'StringField']
+        batch = YxdbReader(path=path, columns=columns).read_batch(10)
+        row = next(YxdbReader(path=path, columns=columns).iter_rows())
+        self.assertEqual(columns, [column.name for column in batch.columns])
+        self.assertEqual(list(row), [column.values.tolist()[0] for column in batch.columns])
+        dictionary = YxdbReader(path=path, columns=columns, dictionary=['StringField']).read_batch(10)
+        self.assertEqual(dictionary.columns[2].decoded().tolist(), dictionary.columns[4].decoded().tolist())
+
+    def test_fixed_records_view_block(self):
+        yxdb = YxdbReader(path="./test_files/LotsOfRecords.yxdb")
+        count, records = yxdb._record_reader.read_fixed_records(1000)
+        self.assertEqual(1000, count)
+        self.assertIs(yxdb._record_reader.block.obj, records.obj)
+
+        count, records = yxdb._record_reader.read_fixed_records(200000)
+        self.assertEqual(99000, count)
+        values = np.frombuffer(records, dtype=[('value', '<i4'), ('null', 'u1')])['value']
+        self.assertEqual(list(range(1001, 100001)), values.tolist())
+
+    def test_parse_dates(self):
+        text = np.array([b'2020-02-29', b'1969-12-31', b'0001-01-01', b'9999-12-31', b'xxxxxxxxxx'], dtype='S10')
+        nulls = np.array([False, False, False, False, True])
+        values = _columnar.parse_dates(text, 10, nulls)
+
+        self.assertEqual(np.dtype('datetime64[s]'), values.dtype)
+        self.assertEqual(text[:4].astype('datetime64[s]').tolist(), values[:4].tolist())
+        self.assertTrue(np.isnat(values[4]))
+
+    def test_parse_date_times(self):
+        text = np.array([b'2020-02-29 23:59:58', b'1900-03-01 00:00:01'], dtype='S19')
+        values = _columnar.parse_dates(text, 19, np.array([False, False]))
+        self.assertEqual([np.datetime64('2020-02-29T23:59:58'), np.datetime64('1900-03-01T00:00:01')], list(values))
+
+    def test_parse_invalid_dates(self):
+        nulls = np.array([False])
+        self.assertRaises(ValueError, lambda: _columnar.parse_dates(np.array([b'2020-0x-01'], dtype='S10'), 10, nulls))
+        self.assertRaises(ValueError, lambda: _columnar.parse_dates(np.array([b'2020-13-01'], dtype='S10'), 10, nulls))
+        invalid = [b'2021-02-30', b'2021-04-31', b'2019-02-29', b'2021/01/01', b'0000-01-01',
+                   b'2021-01-01 25:00:00', b'2021-01-01 00:61:00', b'2021-01-01 00:00:61', b'2021-01-01T00:00:00']
+        for value in invalid:
+            with self.subTest(value=value):
+                width = len(value)
+                parse_row = _extractors._parse_date if width == 10 else _extractors._parse_date_time
+                self.assertRaises(ValueError, lambda: parse_row(memoryview(value), 0))
+                text = np.array([b'2020-01-01 00:00:00'[:width], value], dtype=f'S{width}')
+                self.assertRaises(ValueError, lambda: _columnar.parse_dates(text, width, np.array([False, False])))
+
+    def test_null_spatial(self):
+        yxdb = YxdbReader(path="./test_files/null-spatial.yxdb")
+        batch = yxdb.read_batch(1)
+        self.assertTrue(batch.columns[-1].nulls[0])
+
+    def test_invalid_column(self):
+        yxdb = YxdbReader(path="./test_files/AllNormalFields.yxdb")
+        batch = yxdb.read_batch(1)
+        self.assertRaises(Exception, lambda: batch.column("invalid field"))
+        self.assertRaises(Exception, lambda: batch.column(100))
+
+    def test_string_lengths(self):
+        text = np.array([b'ab\x00cd', b'abcde', b'', b'\x00bcde'], dtype='S5')
+        self.assertEqual([2, 5, 0, 0], _columnar.string_lengths(text, 5, 1).tolist())
+        wide = np.array([b'a\x00b\x00\x00\x00c\x00', b'\x00\x01\x00\x02\x00\x03\x00\x04', b'\x00a\x00\x00'], dtype='S8')
+        self.assertEqual([4, 8, 2], _columnar.string_lengths(wide, 4, 2).tolist())
+
+    def test_wide_fixed_strings(self):
+        fields = [MetaInfoField('Code', 'String', 255, 0), MetaInfoField('Name', 'WString', 100, 0)]
+        rows = [['x' * 255, 'y' * 100], ['', ''], [None, None], ['abc', '\u0100\u0200'], ['\xe9t\xe9', None]]
+        stream = BytesIO()
+        with YxdbWriter(stream=stream, fields=fields) as writer:
+            writer.write_rows(rows)
+        stream.seek(0)
+        batch = YxdbReader(stream=stream).read_batch(10)
+        self.assertEqual([row[0] for row in rows], batch.column('Code').values.tolist())
+        self.assertEqual([row[1] for row in rows], batch.column('Name').values.tolist())
+        self.assertEqual([False, False, True, False, False], batch.column('Code').nulls.tolist())
+
+    def test_dictionary_columns(self):
+        path = "./test_files/TutorialData.yxdb"
+        names = ["First", "Prefix", "Gender", "Country"]
+        expected = YxdbReader(path=path).read_batch(1000)
+        batch = YxdbReader(path=path, dictionary=names).read_batch(1000)
+        for name in names:
+            with self.subTest(name=name):
+                column = batch.column(name)
+                self.assertEqual(np.int32, column.values.dtype)
+                self.assertEqual(len(set(column.dictionary)), len(column.dictionary))
+                self.assertTrue((column.values[column.nulls] == -1).all())
+                self.assertEqual(expected.column(name).nulls.tolist(), column.nulls.tolist())
+                decoded = column.decoded()
+                valid = ~column.nulls
+                self.assertEqual(expected.column(name).values[valid].tolist(), decoded[valid].tolist())
+        self.assertEqual(15, len(batch.column("Country").dictionary))
+        self.assertIsNone(batch.column("UserID").dictionary)
+
+    def test_dictionary_fixed_and_wide_strings(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        batch = YxdbReader(path=path, dictionary=["StringField", "WStringField", "V_WStringShortField"]).read_batch(1)
+        self.assertEqual(["A"], batch.column("StringField").decoded().tolist())
+        self.assertEqual(["AB"], batch.column("WStringField").decoded().tolist())
+        self.assertEqual(["XZY"], batch.column("V_WStringShortField").decoded().tolist())
+
+    def test_dictionary_with_columns(self):
+        yxdb = YxdbReader(path="./test_files/TutorialData.yxdb", columns=["Country", "UserID"], dictionary=[0])
+        batch = yxdb.read_batch(5)
+        self.assertIsNotNone(batch.column("Country").dictionary)
+
+    def test_invalid_dictionary_column(self):
+        path = "./test_files/TutorialData.yxdb"
+        self.assertRaises(TypeError, lambda: YxdbReader(path=path, dictionary=["UserID"]))
+        self.assertRaises(Exception, lambda: YxdbReader(path=path, dictionary=["invalid field"]))
+
+
+def _to_python(value):
+    if isinstance(value, np.datetime64):
+        return value.astype(datetime.datetime)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+if __name__ == '__main__':
+    unittest.main()
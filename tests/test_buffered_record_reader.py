@@ -1,7 +1,9 @@
 import unittest
 
-from yxdb._buffered_record_reader import BufferedRecordReader
+from yxdb._buffered_record_reader import BufferedRecordReader, decompress_growing
+from yxdb._lzf import backends, new_lzf
 from yxdb._utility import memview
+from yxdb.buffer_pool import BufferPool
 
 
 class TestBufferedRecordReader(unittest.TestCase):
@@ -21,14 +23,68 @@ class TestBufferedRecordReader(unittest.TestCase):
             self.assertEqual(records_read, reader.record_buffer[0])
         self.assertEqual(3, records_read)
 
+    def test_all_lzf_backends(self):
+        for name, backend in backends.items():
+            with self.subTest(backend=name):
+                reader = generate_reader("./test_files/LotsOfRecords.yxdb", 5, False, backend)
+                records_read = 0
+                while reader.next_record():
+                    records_read += 1
+                    self.assertEqual(records_read, int.from_bytes(reader.record_buffer[0:4], 'little'))
+                self.assertEqual(100000, records_read)
 
-def generate_reader(path: str, fixed_len: int, has_var_fields: bool):
+    def test_small_buffers_grow(self):
+        for name, backend in backends.items():
+            with self.subTest(backend=name):
+                reader = generate_reader("./test_files/VeryLongField.yxdb", 6, True, backend, lzf_buffer_size=1024)
+                records_read = 0
+                while reader.next_record():
+                    records_read += 1
+                    self.assertEqual(records_read, reader.record_buffer[0])
+                self.assertEqual(3, records_read)
+                self.assertGreater(len(reader.lzf_out), 1024)
+
+    def test_decompress_growing(self):
+        for name, backend in backends.items():
+            with self.subTest(backend=name):
+                compressed = memview(5)
+                compressed[:] = b'\x00A\xe0\xfb\x00'  # a literal 'A' then a back reference repeating it 260 times
+                lzf = new_lzf(compressed, memview(16), backend)
+                self.assertEqual(261, decompress_growing(lzf, 5))
+                self.assertEqual(b'A' * 261, lzf.out_bytes[:261].tobytes())
+                self.assertEqual(512, len(lzf.out_bytes))
+
+    def test_buffer_pool(self):
+        pool = BufferPool(max_buffers=2)
+        reader = generate_reader("./test_files/LotsOfRecords.yxdb", 5, False, buffer_pool=pool)
+        lzf_in, lzf_out = reader.lzf_in, reader.lzf_out
+        while reader.next_record():
+            pass
+        self.assertEqual(2, len(pool))
+        reader = generate_reader("./test_files/LotsOfRecords.yxdb", 5, False, buffer_pool=pool)
+        self.assertEqual({id(lzf_in), id(lzf_out)}, {id(reader.lzf_in), id(reader.lzf_out)})
+        self.assertEqual(0, len(pool))
+        reader.close()
+        reader.close()
+        self.assertEqual(2, len(pool))
+
+    def test_buffer_pool_limit(self):
+        pool = BufferPool(buffer_size=16, max_buffers=1)
+        buffers = [pool.acquire(), pool.acquire(32)]
+        self.assertEqual([16, 32], [len(buffer) for buffer in buffers])
+        for buffer in buffers:
+            pool.release(buffer)
+        self.assertEqual(1, len(pool))
+        self.assertIs(buffers[0], pool.acquire())
+
+
+def generate_reader(path: str, fixed_len: int, has_var_fields: bool, lzf_backend=None, **kwargs):
     stream = open(path, "rb")
     header = memview(512)
     stream.readinto(header)
     meta_info_size = int.from_bytes(header[80:84], 'little') * 2
     total_records = int.from_bytes(header[104:108], 'little')
     stream.seek(512 + meta_info_size)
-    return BufferedRecordReader(stream, fixed_len, has_var_fields, total_records)
+    return BufferedRecordReader(stream, fixed_len, has_var_fields, total_records, lzf_backend, **kwargs)
 
 
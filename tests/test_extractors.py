@@ -1,6 +1,7 @@
 import unittest
 
 from yxdb._extractors import *
+from yxdb.lazy_value import LazyBytes, LazyString
 
 
 class TestExtractors(unittest.TestCase):
@@ -129,6 +130,33 @@ class TestExtractors(unittest.TestCase):
                                   53, 1]))
         self.assertEqual(None, result)
 
+    def test_extract_invalid_date(self):
+        extract = new_date_extractor(0)
+        self.assertRaises(ValueError, lambda: extract(memview(b'2021/01/01\x00')))
+        self.assertRaises(ValueError, lambda: extract(memview(b'2021-0a-01\x00')))
+        self.assertRaises(ValueError, lambda: extract(memview(b'2021-13-01\x00')))
+
+    def test_extract_invalid_datetime(self):
+        extract = new_date_time_extractor(0)
+        self.assertRaises(ValueError, lambda: extract(memview(b'2021-01-02 03-04-05\x00')))
+        self.assertRaises(ValueError, lambda: extract(memview(b'2021-01-02 25:04:05\x00')))
+
+    def test_extract_cached_date(self):
+        cache = {}
+        extract = new_date_extractor(0, cache)
+        first = extract(memview(b'2021-01-02\x00'))
+        second = extract(memview(b'2021-01-02\x00'))
+        self.assertEqual(datetime.datetime(2021, 1, 2), first)
+        self.assertIs(first, second)
+        self.assertEqual({b'2021-01-02': first}, cache)
+        self.assertEqual(None, extract(memview(b'2021-01-02\x01')))
+
+    def test_extract_cached_datetime(self):
+        cache = {}
+        extract = new_date_time_extractor(0, cache)
+        self.assertEqual(datetime.datetime(2021, 1, 2, 3, 4, 5), extract(memview(b'2021-01-02 03:04:05\x00')))
+        self.assertEqual(1, len(cache))
+
     def test_extract_string(self):
         extract = new_string_extractor(2, 15)
         result = extract(memview([0, 0, 104, 101, 108, 108, 111, 32, 119, 111, 114, 108, 100, 33, 0, 23, 77, 0]))
@@ -177,6 +205,28 @@ class TestExtractors(unittest.TestCase):
                                   100, 0, 0, 0, 12, 0, 44, 0, 55, 0, 0]))
         self.assertEqual("", result)
 
+    def test_find_terminator(self):
+        self.assertEqual(3, find_terminator(b'abc\x00def', 1))
+        self.assertEqual(7, find_terminator(b'abcdefg', 1))
+        self.assertEqual(0, find_terminator(b'\x00abc', 1))
+        self.assertEqual(4, find_terminator(b'a\x00b\x00\x00\x00c\x00', 2))
+        self.assertEqual(4, find_terminator(b'\x00a\x00\x01\x00\x00', 2))
+        self.assertEqual(4, find_terminator(b'a\x00b\x00', 2))
+
+    def test_extract_string_with_bytes_after_terminator(self):
+        extract = new_string_extractor(0, 6)
+        self.assertEqual("ab", extract(memview(b'ab\x00cd\x00\x00')))
+        extract = new_wstring_extractor(0, 3)
+        self.assertEqual("\u0100", extract(memview(b'\x00\x01\x00\x00c\x00\x00')))
+
+    def test_extract_wide_string(self):
+        for length in [0, 63, 64, 65, 200, 300]:
+            with self.subTest(length=length):
+                text = 'x' * length
+                self.assertEqual(text, new_string_extractor(0, 300)(memview(text.encode('latin1').ljust(301, b'\x00'))))
+                self.assertEqual(text, new_wstring_extractor(0, 300)(memview(text.encode('utf_16_le').ljust(601, b'\x00'))))
+        self.assertEqual('\u0100' * 40, new_wstring_extractor(0, 100)(memview(('\u0100' * 40).encode('utf_16_le') + b'\x00' * 121)))
+
     def test_extract_normal_blob(self):
         extract = new_blob_extractor(6)
         result = extract(memview(normal_blob))
@@ -234,6 +284,50 @@ class TestExtractors(unittest.TestCase):
         result = extract(memview([0, 0, 0, 0, 0, 0, 4, 0, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8]))
         self.assertEqual('', result)
 
+    def test_extract_lazy_v_string(self):
+        extract = new_lazy_v_string_extractor(6)
+        result = extract(memview(small_blob))
+        self.assertIsInstance(result, LazyString)
+        self.assertEqual(100, len(result))
+        self.assertEqual("B" * 100, result)
+        self.assertNotEqual("B" * 99, result)
+        self.assertTrue(result.startswith("BBB"))
+        self.assertFalse(result.startswith("\u0100"))
+        self.assertEqual("BB", result.prefix(2))
+        self.assertEqual("B" * 100, str(result))
+        self.assertEqual(b"B" * 100, result.encode("latin1"))
+        self.assertEqual(hash(extract(memview(small_blob))), hash(result))
+
+    def test_extract_lazy_v_wstring(self):
+        extract = new_lazy_v_wstring_extractor(2)
+        result = extract(memview(normal_blob))
+        self.assertEqual(100, len(result))
+        self.assertEqual("A" * 100, result)
+        self.assertEqual("AAA", result.prefix(3))
+        self.assertEqual("A" * 100, str(result))
+        self.assertEqual(b"A" * 100, result.encode())
+        self.assertEqual(LazyString(memview(b"A" * 100), "latin1"), result)
+        self.assertEqual(hash("A" * 100), hash(result))
+        self.assertEqual(1, {"A" * 100: 1}[result])
+        self.assertIn(result, {"A" * 100})
+        self.assertEqual(1, len({result, "A" * 100, LazyString(memview(b"A" * 100), "latin1")}))
+
+    def test_extract_lazy_blob(self):
+        extract = new_lazy_blob_extractor(6)
+        result = extract(memview(normal_blob))
+        self.assertIsInstance(result, LazyBytes)
+        self.assertEqual(200, len(result))
+        self.assertEqual(b'B' * 200, result)
+        self.assertEqual(hash(b'B' * 200), hash(result))
+        self.assertTrue(result.startswith(b'BB'))
+        self.assertEqual(b'B' * 200, bytes(result))
+        self.assertNotEqual('B' * 200, result)
+
+    def test_extract_lazy_null_and_tiny_values(self):
+        self.assertIsNone(new_lazy_v_string_extractor(2)(memview([0, 0, 1, 0, 0, 0])))
+        self.assertEqual("", new_lazy_v_string_extractor(2)(memview([0, 0, 0, 0, 0, 0])))
+        self.assertEqual(b'B', new_lazy_blob_extractor(6)(memview([1, 0, 65, 0, 0, 32, 66, 0, 0, 16, 0, 0, 0, 0])))
+
 
 def memview(data):
     return memoryview(bytes(data))
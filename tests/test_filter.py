@@ -0,0 +1,108 @@
+import datetime
+import unittest
+from io import BytesIO
+
+from yxdb._metainfo_field import MetaInfoField
+from yxdb.yxdb_reader import YxdbReader
+from yxdb.yxdb_writer import YxdbWriter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+_tutorial = "./test_files/TutorialData.yxdb"
+_lots = "./test_files/LotsOfRecords.yxdb"
+_all_normal = "./test_files/AllNormalFields.yxdb"
+
+
+def expected_rows(path: str, predicate):
+    return [row for row in YxdbReader(path=path).iter_rows() if predicate(row)]
+
+
+class TestFilter(unittest.TestCase):
+    def test_iter_rows_range(self):
+        rows = list(YxdbReader(path=_tutorial, filter=[('UserID', '>=', 200), ('UserID', '<', 300)]).iter_rows())
+        self.assertEqual(expected_rows(_tutorial, lambda row: 200 <= row[0] < 300), rows)
+        self.assertEqual(100, len(rows))
+
+    def test_next(self):
+        yxdb = YxdbReader(path=_lots, filter=[('RowCount', '==', 5000)])
+        self.assertTrue(yxdb.next())
+        self.assertEqual(5000, yxdb.read_index(0))
+        self.assertFalse(yxdb.next())
+
+    def test_date_time(self):
+        cutoff = datetime.datetime(1990, 1, 1)
+        for value in [cutoff, cutoff.date(), '1990-01-01 00:00:00']:
+            with self.subTest(value=value):
+                rows = list(YxdbReader(path=_tutorial, filter=[('Birth Date', '<', value)]).iter_rows())
+                self.assertEqual(expected_rows(_tutorial, lambda row: row[5] is not None and row[5] < cutoff), rows)
+
+    def test_is_null(self):
+        for op, predicate in [('is_null', lambda row: row[3] is None), ('is_not_null', lambda row: row[3] is not None)]:
+            with self.subTest(op=op):
+                rows = list(YxdbReader(path=_tutorial, filter=[('Prefix', op)]).iter_rows())
+                self.assertEqual(expected_rows(_tutorial, predicate), rows)
+
+    def test_all_normal_fields(self):
+        conditions = [('ByteField', '==', 1), ('BoolField', '==', True), ('Int16Field', '>', 15), ('Int64Field', '<=', 64),
+                      ('FloatField', '>', 0), ('DoubleField', '!=', 0), ('DateField', '>=', '2020-01-01'), ('StringField', 'is_not_null')]
+        self.assertEqual(1, len(list(YxdbReader(path=_all_normal, filter=conditions).iter_rows())))
+        self.assertEqual(0, len(list(YxdbReader(path=_all_normal, filter=[('BoolField', '==', False)]).iter_rows())))
+        self.assertEqual(0, len(list(YxdbReader(path=_all_normal, filter=[('V_StringShortField', 'is_null')]).iter_rows())))
+
+    def test_filter_field_not_in_columns(self):
+        rows = list(YxdbReader(path=_tutorial, columns=['Email'], filter=[('UserID', '<', 105)]).iter_rows())
+        self.assertEqual([(row[7],) for row in expected_rows(_tutorial, lambda row: row[0] < 105)], rows)
+
+    def test_invalid_conditions(self):
+        self.assertRaises(Exception, lambda: YxdbReader(path=_tutorial, filter=[('Missing', '==', 1)]))
+        self.assertRaises(Exception, lambda: YxdbReader(path=_tutorial, filter=[('UserID', '=~', 1)]))
+        self.assertRaises(TypeError, lambda: YxdbReader(path=_tutorial, filter=[('Email', '==', 'a')]))
+        self.assertRaises(TypeError, lambda: YxdbReader(path=_all_normal, filter=[('BoolField', '<', True)]))
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestFilterBatches(unittest.TestCase):
+    def test_fixed_records(self):
+        yxdb = YxdbReader(path=_lots, filter=[('RowCount', '>', 1000), ('RowCount', '<=', 91000)])
+        batches = list(yxdb.iter_batches(30000))
+        self.assertEqual([30000, 30000, 30000], [batch.num_records for batch in batches])
+        values = np.concatenate([batch.column(0).values for batch in batches])
+        self.assertEqual(list(range(1001, 91001)), values.tolist())
+
+    def test_variable_records(self):
+        yxdb = YxdbReader(path=_tutorial, columns=['UserID', 'Email'], filter=[('Birth Date', '>=', '1990-01-01')])
+        batch = yxdb.read_batch(100000)
+        expected = expected_rows(_tutorial, lambda row: row[5] is not None and row[5] >= datetime.datetime(1990, 1, 1))
+        self.assertEqual([row[0] for row in expected], batch.column('UserID').values.tolist())
+        self.assertEqual([row[7] for row in expected], batch.column('Email').values.tolist())
+
+    def test_read_range(self):
+        yxdb = YxdbReader(path=_lots, filter=[('RowCount', '<=', 70010)])
+        batch = yxdb.read_range(70000, 80000)
+        self.assertEqual(list(range(70001, 70011)), batch.column(0).values.tolist())
+        yxdb = YxdbReader(path=_tutorial, filter=[('UserID', '<', 110)])
+        self.assertEqual(list(range(105, 110)), yxdb.read_range(5, 20).column(0).values.tolist())
+
+    def test_float_rows_and_batches_agree(self):
+        stream = BytesIO()
+        with YxdbWriter(stream=stream, fields=[MetaInfoField('Value', 'Float', 4, 0)]) as writer:
+            writer.write_rows([[0.1], [0.2], [None]])
+        data = stream.getvalue()
+        for condition in [('Value', '==', 0.1), ('Value', '>', 0.1), ('Value', '<=', 0.2), ('Value', '!=', 0.2)]:
+            with self.subTest(condition=condition):
+                rows = [row[0] for row in YxdbReader(stream=BytesIO(data), filter=[condition]).iter_rows()]
+                batch = YxdbReader(stream=BytesIO(data), filter=[condition]).read_batch(10)
+                self.assertEqual(rows, batch.column(0).values.astype('f8').tolist())
+
+    @unittest.skipUnless(pa is not None, "pyarrow is not installed")
+    def test_arrow(self):
+        table = YxdbReader(path=_lots, filter=[('RowCount', '>', 99990)]).to_arrow()
+        self.assertEqual(list(range(99991, 100001)), table.column(0).to_pylist())
@@ -1,6 +1,6 @@
 import unittest
 
-from yxdb._lzf import Lzf
+from yxdb._lzf import Lzf, NativeLzf, backends, compress_block, new_lzf
 
 
 class TestLzf(unittest.TestCase):
@@ -78,6 +78,75 @@ class TestLzf(unittest.TestCase):
         self.assertEqual(3, written)
         self.assertEqual(bytearray([6, 7, 8, 4, 5]), out_bytes)
 
+    def test_new_lzf_uses_requested_backend(self):
+        in_bytes = memoryview(bytearray([4, 1, 2, 3, 4, 5]))
+        out_bytes = memoryview(bytearray(5))
+
+        lzf = new_lzf(in_bytes, out_bytes, Lzf)
+        self.assertIsInstance(lzf, Lzf)
+        self.assertEqual(5, lzf.decompress(6))
+
+    def test_compress_round_trip(self):
+        pattern = bytes(range(7)) * 3
+        blocks = [b'abcabcabcabcabc', bytes(300000), b'hello world ' * 1000, pattern + bytes(range(256)) * 40 + pattern]
+        for block in blocks:
+            for tight in (False, True):
+                with self.subTest(size=len(block), tight=tight):
+                    compressed = compress_block(block, Lzf, tight)
+                    self.assertLess(len(compressed), len(block))
+                    out_bytes = memoryview(bytearray(len(block)))
+                    written = Lzf(memoryview(compressed), out_bytes).decompress(len(compressed))
+                    self.assertEqual(block, out_bytes[:written].tobytes())
+
+    def test_compress_long_literal_runs_and_matches(self):
+        block = bytes(range(100)) + bytes(1000) + bytes(range(100))
+        compressed = compress_block(block, Lzf)
+        self.assertEqual(bytes([31]) + bytes(range(32)), compressed[:33])
+        out_bytes = memoryview(bytearray(len(block)))
+        self.assertEqual(len(block), Lzf(memoryview(compressed), out_bytes).decompress(len(compressed)))
+        self.assertEqual(block, out_bytes.tobytes())
+
+    def test_compress_incompressible_block(self):
+        self.assertIsNone(compress_block(bytes(range(256)), Lzf))
+        self.assertIsNone(compress_block(b'a', Lzf))
+        self.assertIsNone(compress_block(b'', Lzf))
+
+    def test_compress_output_array_too_small(self):
+        in_bytes = memoryview(bytearray(b'hello world ' * 10))
+        lzf = Lzf(in_bytes, memoryview(bytearray(4)))
+        self.assertRaises(AttributeError, lambda: lzf.compress(len(in_bytes)))
+
+
+@unittest.skipUnless('native' in backends, "python-lzf is not installed")
+class TestNativeLzf(unittest.TestCase):
+    def test_empty_input(self):
+        lzf = NativeLzf(memoryview(bytearray(0)), memoryview(bytearray(0)))
+        self.assertEqual(0, lzf.decompress(0))
+
+    def test_output_array_too_small_for_large_control_value(self):
+        in_bytes = memoryview(bytearray([8, 1, 2, 3, 4, 5, 6, 7, 8, 9, 224, 1, 8]))
+        out_bytes = memoryview(bytearray(17))
+        lzf = NativeLzf(in_bytes, out_bytes)
+
+        self.assertRaises(AttributeError, lambda: lzf.decompress(13))
+
+    def test_matches_python_backend(self):
+        in_bytes = memoryview(bytearray([8, 1, 2, 3, 4, 5, 6, 7, 8, 9, 224, 1, 8, 2, 1, 2, 3, 32, 1]))
+        python_out = memoryview(bytearray(30))
+        native_out = memoryview(bytearray(30))
+
+        python_written = Lzf(in_bytes, python_out).decompress(19)
+        native_written = NativeLzf(in_bytes, native_out).decompress(19)
+        self.assertEqual(python_written, native_written)
+        self.assertEqual(python_out[:python_written], native_out[:native_written])
+
+    def test_python_decompresses_native_blocks(self):
+        block = b'hello world ' * 1000 + bytes(range(256))
+        compressed = compress_block(block, NativeLzf)
+        out_bytes = memoryview(bytearray(len(block)))
+        written = Lzf(memoryview(compressed), out_bytes).decompress(len(compressed))
+        self.assertEqual(block, out_bytes[:written].tobytes())
+
 
 if __name__ == '__main__':
     unittest.main()
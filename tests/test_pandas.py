@@ -0,0 +1,86 @@
+import datetime
+import unittest
+
+import yxdb
+from yxdb.yxdb_reader import YxdbReader
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+@unittest.skipUnless(pd is not None, "pandas is not installed")
+class TestPandas(unittest.TestCase):
+    def test_all_normal_fields(self):
+        df = yxdb.read_dataframe("./test_files/AllNormalFields.yxdb")
+
+        self.assertEqual((1, 16), df.shape)
+        self.assertEqual('UInt8', str(df["ByteField"].dtype))
+        self.assertEqual('boolean', str(df["BoolField"].dtype))
+        self.assertEqual('Int16', str(df["Int16Field"].dtype))
+        self.assertEqual('Int32', str(df["Int32Field"].dtype))
+        self.assertEqual('Int64', str(df["Int64Field"].dtype))
+        self.assertEqual('Float64', str(df["FixedDecimalField"].dtype))
+        self.assertEqual('Float32', str(df["FloatField"].dtype))
+        self.assertEqual('Float64', str(df["DoubleField"].dtype))
+        self.assertEqual('string', str(df["StringField"].dtype))
+        self.assertEqual('string', str(df["V_WStringLongField"].dtype))
+        row = df.iloc[0]
+        self.assertEqual(1, row["ByteField"])
+        self.assertEqual(True, row["BoolField"])
+        self.assertEqual(64, row["Int64Field"])
+        self.assertEqual(123.45, row["FixedDecimalField"])
+        self.assertEqual("AB", row["WStringField"])
+        self.assertEqual("B" * 500, row["V_StringLongField"])
+        self.assertEqual(datetime.datetime(2020, 1, 1), row["DateField"])
+        self.assertEqual(datetime.datetime(2020, 2, 3, 4, 5, 6), row["DateTimeField"])
+
+    def test_repeated_columns(self):
+        df = yxdb.read_dataframe("./test_files/AllNormalFields.yxdb", columns=["Int32Field", "Int32Field", "ByteField"])
+        self.assertEqual(["Int32Field", "Int32Field", "ByteField"], list(df.columns))
+        self.assertEqual([32, 32, 1], df.iloc[0].tolist())
+
+    def test_columns_and_nrows(self):
+        df = yxdb.read_dataframe("./test_files/TutorialData.yxdb", columns=["Prefix", 0], nrows=100)
+
+        self.assertEqual(100, len(df))
+        self.assertEqual(["Prefix", YxdbReader(path="./test_files/TutorialData.yxdb").list_fields()[0].name], list(df.columns))
+
+    def test_tutorial_data_matches_read_index(self):
+        reader = YxdbReader(path="./test_files/TutorialData.yxdb")
+        expected = []
+        while reader.next():
+            expected.append([reader.read_index(i) for i in range(len(reader.list_fields()))])
+
+        df = yxdb.read_dataframe("./test_files/TutorialData.yxdb")
+        self.assertEqual(len(expected), len(df))
+        self.assertEqual(4068, int((df["Prefix"] == "Mr").sum()))
+        for index, name in enumerate(df.columns):
+            actual = [None if pd.isna(value) else value for value in df[name].tolist()]
+            self.assertEqual([row[index] for row in expected], actual, name)
+
+    def test_lots_of_records(self):
+        df = yxdb.read_dataframe("./test_files/LotsOfRecords.yxdb")
+        self.assertEqual(5000050000, int(df.iloc[:, 0].sum()))
+
+    def test_null_spatial(self):
+        df = yxdb.read_dataframe("./test_files/null-spatial.yxdb")
+        self.assertTrue(df.iloc[:, -1].isna().all())
+
+    def test_dictionary_columns(self):
+        path = "./test_files/TutorialData.yxdb"
+        df = yxdb.read_dataframe(path, dictionary=["Country", "Prefix"])
+        expected = yxdb.read_dataframe(path)
+        self.assertEqual("category", df["Country"].dtype.name)
+        self.assertEqual("string", df["First"].dtype.name)
+        for name in ["Country", "Prefix"]:
+            self.assertEqual(expected[name].isna().tolist(), df[name].isna().tolist())
+            self.assertEqual(expected[name].dropna().tolist(), df[name].dropna().astype(str).tolist())
+
+    def test_invalid_column(self):
+        self.assertRaises(Exception, lambda: yxdb.read_dataframe("./test_files/TutorialData.yxdb", columns=["invalid field"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
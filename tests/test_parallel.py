@@ -0,0 +1,67 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from yxdb import parallel
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestParallel(unittest.TestCase):
+    def test_split_ranges(self):
+        self.assertEqual([(0, 65536), (65536, 100000)], parallel.split_ranges("./test_files/LotsOfRecords.yxdb"))
+        self.assertEqual([(0, 100000)], parallel.split_ranges("./test_files/LotsOfRecords.yxdb", 100000))
+        self.assertEqual([(0, 8716)], parallel.split_ranges("./test_files/TutorialData.yxdb", 1))
+
+    def test_ordered(self):
+        values = []
+        starts = []
+        for start, batch in parallel.read("./test_files/LotsOfRecords.yxdb", workers=2):
+            starts.append(start)
+            values.extend(batch.column(0).values.tolist())
+
+        self.assertEqual([0, 65536], starts)
+        self.assertEqual(list(range(1, 100001)), values)
+
+    def test_unordered(self):
+        batches = dict(parallel.read("./test_files/LotsOfRecords.yxdb", workers=2, ordered=False))
+
+        self.assertEqual({0, 65536}, set(batches.keys()))
+        self.assertEqual(65536, batches[0].num_records)
+        self.assertEqual(34464, batches[65536].num_records)
+        self.assertEqual(65537, batches[65536].column(0).values[0])
+
+    def test_columns(self):
+        batches = [batch for _, batch in parallel.read("./test_files/TutorialData.yxdb", workers=2, columns=["Prefix"])]
+
+        self.assertEqual(1, len(batches))
+        self.assertEqual(["Prefix"], [column.name for column in batches[0].columns])
+        self.assertEqual(4068, int((batches[0].column(0).values == "Mr").sum()))
+
+    def test_bounded_in_flight(self):
+        submitted = []
+
+        class CountingExecutor(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                submitted.append(args[2])
+                return super().submit(*args, **kwargs)
+
+        ranges = [(start, start + 10) for start in range(0, 300, 10)]
+        for ordered in [True, False]:
+            with self.subTest(ordered=ordered):
+                submitted.clear()
+                yielded = []
+                with patch.object(parallel, 'ProcessPoolExecutor', CountingExecutor), patch.object(parallel, 'split_ranges', return_value=ranges):
+                    for start, batch in parallel.read("./test_files/LotsOfRecords.yxdb", workers=2, ordered=ordered):
+                        self.assertLessEqual(len(submitted) - len(yielded), 4)
+                        self.assertEqual(list(range(start + 1, start + 11)), batch.column(0).values.tolist())
+                        yielded.append(start)
+                self.assertEqual([start for start, _ in ranges], yielded if ordered else sorted(yielded))
+
+
+if __name__ == '__main__':
+    unittest.main()
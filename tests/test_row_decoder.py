@@ -0,0 +1,63 @@
+import datetime
+import struct
+import unittest
+
+from yxdb._metainfo_field import MetaInfoField
+from yxdb._row_decoder import new_row_decoder
+from yxdb._yxdb_record import YxdbRecord
+
+
+class TestRowDecoder(unittest.TestCase):
+    def test_numeric_fields(self):
+        record = YxdbRecord([
+            MetaInfoField("int16", "Int16", 2, 0),
+            MetaInfoField("bool", "Bool", 1, 0),
+            MetaInfoField("double", "Double", 8, 0),
+            MetaInfoField("byte", "Byte", 1, 0),
+        ])
+        decode = new_row_decoder(record)
+
+        source = struct.pack('<hBBdBBB', -5, 0, 1, 1.5, 0, 7, 0)
+        self.assertEqual((-5, True, 1.5, 7), decode(memoryview(source)))
+
+    def test_null_fields(self):
+        record = YxdbRecord([
+            MetaInfoField("int32", "Int32", 4, 0),
+            MetaInfoField("bool", "Bool", 1, 0),
+            MetaInfoField("string", "String", 3, 0),
+        ])
+        decode = new_row_decoder(record)
+
+        source = struct.pack('<iBB3sB', 5, 1, 2, b'abc', 1)
+        self.assertEqual((None, None, None), decode(memoryview(source)))
+
+    def test_projected_fields_out_of_order(self):
+        record = YxdbRecord([
+            MetaInfoField("int16", "Int16", 2, 0),
+            MetaInfoField("date", "Date", 10, 0),
+            MetaInfoField("int64", "Int64", 8, 0),
+        ]).project([2, 0])
+        decode = new_row_decoder(record)
+
+        source = struct.pack('<hB10sBqB', 3, 0, b'2020-01-01', 0, 64, 0)
+        self.assertEqual((64, 3), decode(memoryview(source)))
+
+    def test_repeated_fields(self):
+        record = YxdbRecord([
+            MetaInfoField("int16", "Int16", 2, 0),
+            MetaInfoField("date", "Date", 10, 0),
+            MetaInfoField("int32", "Int32", 4, 0),
+        ]).project([0, 0, 2, 1, 2, 1])
+        decode = new_row_decoder(record)
+
+        source = struct.pack('<hB10sBiB', 3, 0, b'2020-01-01', 0, 32, 0)
+        date = datetime.datetime(2020, 1, 1)
+        self.assertEqual((3, 3, 32, date, 32, date), decode(memoryview(source)))
+
+    def test_no_fields(self):
+        decode = new_row_decoder(YxdbRecord([]))
+        self.assertEqual((), decode(memoryview(b'')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,23 @@
+import json
+import struct
 import unittest
 
+from yxdb import spatial
 from yxdb.spatial import to_geojson
 from yxdb.yxdb_reader import YxdbReader
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+_spatial_files = ['point', 'multi-point', 'line', 'multi-line', 'poly', 'multi-poly', 'multi-poly-holes', 'null-spatial']
+
 
 class TestSpatialReaders(unittest.TestCase):
     def test_point(self):
@@ -61,3 +76,149 @@ class TestSpatialReaders(unittest.TestCase):
             self.assertEqual(expected, json_str)
 
         yxdb.close()
+
+
+def read_spatial(name: str):
+    yxdb = YxdbReader(path=f'./test_files/{name}.yxdb')
+    yxdb.next()
+    value = yxdb.read_index(1)
+    yxdb.close()
+    return value
+
+
+def geojson_parts(value) -> list:
+    # the GeoJSON coordinates of a spatial object flattened into a list of parts
+    geojson = json.loads(to_geojson(value))
+    coordinates = geojson['coordinates']
+    if geojson['type'] == 'Point':
+        return [[coordinates]]
+    if geojson['type'] in ('MultiPoint', 'LineString'):
+        return [coordinates]
+    if geojson['type'] == 'MultiPolygon':
+        return coordinates[0]
+    return coordinates
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestSpatialCoords(unittest.TestCase):
+    def test_to_coords_matches_geojson(self):
+        for name in _spatial_files[:-1]:
+            with self.subTest(name=name):
+                value = read_spatial(name)
+                coords, offsets = spatial.to_coords(value)
+                self.assertEqual(np.float64, coords.dtype)
+                self.assertEqual(2, coords.shape[1])
+                parts = [coords[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+                self.assertEqual(geojson_parts(value), parts)
+
+    def test_to_coords_null(self):
+        self.assertIsNone(spatial.to_coords(None))
+
+    def test_to_coords_invalid(self):
+        self.assertRaises(TypeError, lambda: spatial.to_coords(b'\x03\x00\x00\x00'))
+        self.assertRaises(TypeError, lambda: spatial.to_coords(b'\x01' + bytes(40)))
+        truncated = read_spatial('multi-line')[:-8]
+        self.assertRaises(TypeError, lambda: spatial.to_coords(truncated))
+
+    def test_to_coords_batch(self):
+        values = [read_spatial(name) for name in _spatial_files]
+        values.insert(3, None)
+        coords, ring_offsets, geometry_offsets = spatial.to_coords_batch(values)
+        self.assertEqual(len(values) + 1, len(geometry_offsets))
+        self.assertEqual(len(coords), ring_offsets[-1])
+        for index, value in enumerate(values):
+            rings = range(geometry_offsets[index], geometry_offsets[index + 1])
+            parts = [coords[ring_offsets[ring]:ring_offsets[ring + 1]].tolist() for ring in rings]
+            self.assertEqual([] if value is None else geojson_parts(value), parts)
+
+    def test_to_coords_batch_empty(self):
+        coords, ring_offsets, geometry_offsets = spatial.to_coords_batch([])
+        self.assertEqual((0, 2), coords.shape)
+        self.assertEqual([0], ring_offsets.tolist())
+        self.assertEqual([0], geometry_offsets.tolist())
+
+
+def parse_wkb(value: bytes, at: int = 0):
+    # returns (geojson-like type and coordinates, next offset) for little-endian 2D WKB
+    byte_order, wkb_type = struct.unpack_from('<BI', value, at)
+    assert byte_order == 1
+    at += 5
+    if wkb_type == 1:
+        return ('Point', list(struct.unpack_from('<2d', value, at))), at + 16
+    count = struct.unpack_from('<I', value, at)[0]
+    at += 4
+    if wkb_type == 2:
+        return ('LineString', [list(struct.unpack_from('<2d', value, at + (i * 16))) for i in range(count)]), at + (count * 16)
+    if wkb_type == 3:
+        rings = []
+        for _ in range(count):
+            points = struct.unpack_from('<I', value, at)[0]
+            at += 4
+            rings.append([list(struct.unpack_from('<2d', value, at + (i * 16))) for i in range(points)])
+            at += points * 16
+        return ('Polygon', rings), at
+    names = {4: 'MultiPoint', 5: 'MultiLineString', 6: 'MultiPolygon'}
+    children = []
+    for _ in range(count):
+        (_, coordinates), at = parse_wkb(value, at)
+        children.append(coordinates)
+    return (names[wkb_type], children), at
+
+
+class TestSpatialWkb(unittest.TestCase):
+    def test_to_wkb_matches_geojson(self):
+        for name in _spatial_files[:-1]:
+            with self.subTest(name=name):
+                value = read_spatial(name)
+                geojson = json.loads(to_geojson(value))
+                (wkb_type, coordinates), end = parse_wkb(spatial.to_wkb(value))
+                self.assertEqual(geojson['type'], wkb_type)
+                self.assertEqual(geojson['coordinates'], coordinates)
+                self.assertEqual(len(spatial.to_wkb(value)), end)
+
+    def test_to_wkb_column(self):
+        values = [read_spatial(name) for name in _spatial_files]
+        wkb = spatial.to_wkb_column(values)
+        self.assertEqual([spatial.to_wkb(value) for value in values], wkb)
+        self.assertIsNone(wkb[-1])
+
+    def test_to_wkb_invalid(self):
+        self.assertRaises(TypeError, lambda: spatial.to_wkb(b'\x03\x00\x00\x00'))
+
+
+@unittest.skipUnless(pa is not None and np is not None, "pyarrow is not installed")
+class TestSpatialGeoArrow(unittest.TestCase):
+    def test_polygons(self):
+        values = [read_spatial('poly'), None, read_spatial('multi-poly-holes')]
+        field, array = spatial.to_geoarrow(values, name='shape')
+        self.assertEqual('shape', field.name)
+        self.assertEqual(b'geoarrow.polygon', field.metadata[b'ARROW:extension:name'])
+        self.assertEqual(3, len(array))
+        self.assertEqual(1, array.null_count)
+        rows = array.to_pylist()
+        self.assertIsNone(rows[1])
+        self.assertEqual(geojson_parts(values[0]), rows[0])
+        self.assertEqual(geojson_parts(values[2]), rows[2])
+
+    def test_lines(self):
+        values = [read_spatial('line'), read_spatial('multi-line')]
+        field, array = spatial.to_geoarrow(values)
+        self.assertEqual(b'geoarrow.multilinestring', field.metadata[b'ARROW:extension:name'])
+        self.assertEqual([geojson_parts(value) for value in values], array.to_pylist())
+
+    def test_points(self):
+        values = [read_spatial('point'), read_spatial('multi-point'), None]
+        field, array = spatial.to_geoarrow(values)
+        self.assertEqual(b'geoarrow.multipoint', field.metadata[b'ARROW:extension:name'])
+        self.assertEqual([geojson_parts(values[0])[0], geojson_parts(values[1])[0], None], array.to_pylist())
+
+    def test_mixed_types_use_wkb(self):
+        values = [read_spatial('point'), read_spatial('poly'), None]
+        field, array = spatial.to_geoarrow(values)
+        self.assertEqual(b'geoarrow.wkb', field.metadata[b'ARROW:extension:name'])
+        self.assertEqual(spatial.to_wkb_column(values), array.to_pylist())
+
+    def test_table(self):
+        field, array = spatial.to_geoarrow([read_spatial('poly')])
+        table = pa.Table.from_arrays([array], schema=pa.schema([field]))
+        self.assertEqual(b'geoarrow.polygon', table.schema.field('geometry').metadata[b'ARROW:extension:name'])
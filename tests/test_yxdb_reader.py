@@ -1,8 +1,16 @@
 import datetime
+import gc
+import threading
+import time
 import traceback
 import unittest
+from io import BytesIO
 
+from yxdb._metainfo_field import MetaInfoField
+from yxdb.buffer_pool import BufferPool
+from yxdb.lazy_value import LazyBytes, LazyString
 from yxdb.yxdb_reader import YxdbReader
+from yxdb.yxdb_writer import YxdbWriter
 
 
 class TestYxdbReader(unittest.TestCase):
@@ -118,6 +126,340 @@ class TestYxdbReader(unittest.TestCase):
             self.assertEqual("'invalid field' is not a valid field name", str(e))
             traceback.print_exc()
 
+    def test_columns_by_name_and_index(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        yxdb = YxdbReader(path=path, columns=["DateTimeField", 2, "V_WStringLongField"])
+        self.assertEqual(["DateTimeField", "Int16Field", "V_WStringLongField"], [field.name for field in yxdb.list_fields()])
+
+        read = 0
+        while yxdb.next():
+            self.assertEqual(datetime.datetime(2020, 2, 3, 4, 5, 6), yxdb.read_index(0))
+            self.assertEqual(16, yxdb.read_index(1))
+            self.assertEqual(16, yxdb.read_name("Int16Field"))
+            self.assertEqual("W" * 500, yxdb.read_name("V_WStringLongField"))
+            read += 1
+        self.assertEqual(1, read)
+
+    def test_columns_skip_var_data(self):
+        path = "./test_files/TutorialData.yxdb"
+        expected = []
+        yxdb = YxdbReader(path=path)
+        while yxdb.next():
+            expected.append(yxdb.read_name("Prefix"))
+
+        yxdb = YxdbReader(path=path, columns=["Prefix"])
+        self.assertEqual(False, yxdb._record_reader.skip_var_data)
+
+        actual = []
+        while yxdb.next():
+            actual.append(yxdb.read_index(0))
+        self.assertEqual(expected, actual)
+
+    def test_columns_without_var_fields_skip_var_data(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        yxdb = YxdbReader(path=path, columns=["Int64Field", "DateField"])
+        self.assertEqual(True, yxdb._record_reader.skip_var_data)
+        while yxdb.next():
+            self.assertEqual(64, yxdb.read_index(0))
+            self.assertEqual(datetime.datetime(2020, 1, 1), yxdb.read_index(1))
+            self.assertEqual(yxdb._record.fixed_size + 4, yxdb._record_reader.record_buffer_index)
+
+        yxdb = YxdbReader(path="./test_files/VeryLongField.yxdb", columns=[0])
+        read = 0
+        while yxdb.next():
+            read += 1
+            self.assertEqual(read, yxdb.read_index(0))
+        self.assertEqual(3, read)
+
+    def test_repeated_columns(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        self.assertEqual([(16, 16, 32)], list(YxdbReader(path=path, columns=['Int16Field', 'Int16Field', 'Int32Field']).iter_rows()))
+        self.assertEqual([(32, 32)], list(YxdbReader(path=path, columns=['Int32Field', 'Int32Field']).iter_rows()))
+
+    def test_invalid_column(self):
+        path = "./test_files/TutorialData.yxdb"
+        self.assertRaises(Exception, lambda: YxdbReader(path=path, columns=["invalid field"]))
+
+    def test_seek(self):
+        path = "./test_files/LotsOfRecords.yxdb"
+        yxdb = YxdbReader(path=path)
+
+        for record_number in [99999, 65536, 65535, 0, 70000, 70001, 12345]:
+            yxdb.seek(record_number)
+            self.assertTrue(yxdb.next())
+            self.assertEqual(record_number + 1, yxdb.read_index(0))
+
+        yxdb.seek(100000)
+        self.assertFalse(yxdb.next())
+        yxdb.seek(5)
+        self.assertTrue(yxdb.next())
+        self.assertEqual(6, yxdb.read_index(0))
+        yxdb.close()
+
+    def test_seek_after_reading_all_records(self):
+        path = "./test_files/TutorialData.yxdb"
+        yxdb = YxdbReader(path=path)
+        prefixes = []
+        while yxdb.next():
+            prefixes.append(yxdb.read_name("Prefix"))
+
+        yxdb.seek(len(prefixes) - 10)
+        for expected in prefixes[-10:]:
+            self.assertTrue(yxdb.next())
+            self.assertEqual(expected, yxdb.read_name("Prefix"))
+        self.assertFalse(yxdb.next())
+
+    def test_seek_after_close(self):
+        for options in [{}, {'mmap': True}, {'read_ahead': 4}]:
+            with self.subTest(options=options):
+                yxdb = YxdbReader(path="./test_files/LotsOfRecords.yxdb", **options)
+                for _ in range(10):
+                    self.assertTrue(yxdb.next())
+                yxdb.close()
+                yxdb.seek(60000)
+                self.assertTrue(yxdb.next())
+                self.assertEqual(60001, yxdb.read_index(0))
+                yxdb.close()
+
+    def test_seek_out_of_range(self):
+        yxdb = YxdbReader(path="./test_files/LotsOfRecords.yxdb")
+        self.assertRaises(IndexError, lambda: yxdb.seek(100001))
+        self.assertRaises(IndexError, lambda: yxdb.seek(-1))
+
+    def test_mmap_matches_buffered_reads(self):
+        for file in ["AllNormalFields.yxdb", "TutorialData.yxdb", "VeryLongField.yxdb", "TestNewYxdb.yxdb", "null-spatial.yxdb", "poly.yxdb"]:
+            with self.subTest(file=file):
+                path = "./test_files/" + file
+                self.assertEqual(read_all(YxdbReader(path=path)), read_all(YxdbReader(path=path, mmap=True)))
+
+    def test_mmap_lots_of_records(self):
+        yxdb = YxdbReader(path="./test_files/LotsOfRecords.yxdb", mmap=True)
+        total = 0
+        while yxdb.next():
+            total += yxdb.read_index(0)
+        self.assertEqual(5000050000, total)
+
+        yxdb.seek(99999)
+        self.assertTrue(yxdb.next())
+        self.assertEqual(100000, yxdb.read_index(0))
+        yxdb.close()
+
+    def test_zero_copy_matches_buffered_reads(self):
+        for file in ["AllNormalFields.yxdb", "TutorialData.yxdb", "VeryLongField.yxdb", "TestNewYxdb.yxdb", "null-spatial.yxdb", "LotsOfRecords.yxdb"]:
+            for use_mmap in [False, True]:
+                with self.subTest(file=file, mmap=use_mmap):
+                    path = "./test_files/" + file
+                    expected = read_all(YxdbReader(path=path))
+                    self.assertEqual(expected, read_all(YxdbReader(path=path, zero_copy=True, mmap=use_mmap)))
+
+    def test_zero_copy_with_projection(self):
+        path = "./test_files/TutorialData.yxdb"
+        expected = [row[0] for row in read_all(YxdbReader(path=path, columns=[0]))]
+        actual = [row[0] for row in read_all(YxdbReader(path=path, columns=[0], zero_copy=True))]
+        self.assertEqual(expected, actual)
+
+    def test_zero_copy_seek(self):
+        path = "./test_files/TutorialData.yxdb"
+        expected = read_all(YxdbReader(path=path))
+        for use_mmap in [False, True]:
+            yxdb = YxdbReader(path=path, zero_copy=True, mmap=use_mmap)
+            yxdb.next()
+            yxdb.seek(5000)
+            self.assertEqual(expected[5000:], read_all(yxdb))
+
+    def test_zero_copy_views_decompressed_block(self):
+        yxdb = YxdbReader(path="./test_files/LotsOfRecords.yxdb", zero_copy=True)
+        yxdb.next()
+        record_reader = yxdb._record_reader
+        self.assertIsNot(record_reader.copy_buffer, record_reader.record_buffer)
+        self.assertEqual(5, len(record_reader.record_buffer))
+        self.assertEqual(1, yxdb.read_index(0))
+        yxdb.close()
+
+    def test_read_ahead_matches_buffered_reads(self):
+        for file in ["AllNormalFields.yxdb", "TutorialData.yxdb", "VeryLongField.yxdb", "null-spatial.yxdb", "LotsOfRecords.yxdb"]:
+            for zero_copy in [False, True]:
+                with self.subTest(file=file, zero_copy=zero_copy):
+                    path = "./test_files/" + file
+                    expected = read_all(YxdbReader(path=path))
+                    self.assertEqual(expected, read_all(YxdbReader(path=path, read_ahead=2, zero_copy=zero_copy)))
+
+    def test_read_ahead_seek(self):
+        path = "./test_files/LotsOfRecords.yxdb"
+        yxdb = YxdbReader(path=path, read_ahead=3)
+        yxdb.next()
+        yxdb.seek(70000)
+        self.assertTrue(yxdb.next())
+        self.assertEqual(70001, yxdb.read_index(0))
+        yxdb.seek(5)
+        self.assertTrue(yxdb.next())
+        self.assertEqual(6, yxdb.read_index(0))
+        yxdb.close()
+        self.assertIsNone(yxdb._record_reader._worker)
+
+    def test_read_ahead_seek_while_worker_reads(self):
+        stream = SlowStream()
+        with YxdbWriter(stream=stream, fields=[MetaInfoField('Value', 'Int64', 8, 0)], compression=None) as writer:
+            writer.write_rows([i] for i in range(300000))
+        for target in [5, 250000, 140000]:
+            with self.subTest(target=target):
+                stream.seek(0)
+                yxdb = YxdbReader(stream=stream, read_ahead=16)
+                self.assertTrue(yxdb.next())
+                yxdb.seek(target)
+                self.assertTrue(yxdb.next())
+                self.assertEqual(target, yxdb.read_index(0))
+                self.assertTrue(yxdb.next())
+                self.assertEqual(target + 1, yxdb.read_index(0))
+                yxdb._record_reader._stop_worker()
+
+    def test_read_ahead_error_then_next(self):
+        stream = FlakyStream()
+        with YxdbWriter(stream=stream, fields=[MetaInfoField('Value', 'Int64', 8, 0)], compression=None) as writer:
+            writer.write_rows([i] for i in range(300000))
+        stream.seek(0)
+        yxdb = YxdbReader(stream=stream, read_ahead=1)
+        self.assertTrue(yxdb.next())
+        stream.failures = 1
+        with self.assertRaises(IOError):
+            while yxdb.next():
+                pass
+
+        # the read after the error restarts the worker instead of waiting for it forever
+        thread = threading.Thread(target=yxdb.next, daemon=True)
+        thread.start()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        yxdb.seek(200000)
+        self.assertTrue(yxdb.next())
+        self.assertEqual(200000, yxdb.read_index(0))
+        yxdb.close()
+
+    def test_read_ahead_worker_stops_when_reader_is_dropped(self):
+        yxdb = YxdbReader(path="./test_files/LotsOfRecords.yxdb", read_ahead=1)
+        self.assertTrue(yxdb.next())
+        worker = yxdb._record_reader._worker
+        del yxdb
+        gc.collect()
+        worker.join(10)
+        self.assertFalse(worker.is_alive())
+
+    def test_read_ahead_stream(self):
+        stream = BytesIO(open("./test_files/TutorialData.yxdb", 'rb').read())
+        expected = read_all(YxdbReader(path="./test_files/TutorialData.yxdb"))
+        self.assertEqual(expected, read_all(YxdbReader(stream=stream, read_ahead=1)))
+
+    def test_read_ahead_with_mmap(self):
+        self.assertRaises(TypeError, lambda: YxdbReader(path="./test_files/TutorialData.yxdb", mmap=True, read_ahead=2))
+
+    def test_small_lzf_buffers(self):
+        for options in [{}, {'mmap': True}, {'read_ahead': 2}, {'zero_copy': True}]:
+            with self.subTest(**options):
+                path = "./test_files/TutorialData.yxdb"
+                expected = read_all(YxdbReader(path=path))
+                self.assertEqual(expected, read_all(YxdbReader(path=path, lzf_buffer_size=4096, **options)))
+
+    def test_buffer_pool_shared_by_readers(self):
+        pool = BufferPool()
+        expected = read_all(YxdbReader(path="./test_files/TutorialData.yxdb"))
+        for _ in range(3):
+            for use_mmap in [False, True]:
+                self.assertEqual(expected, read_all(YxdbReader(path="./test_files/TutorialData.yxdb", buffer_pool=pool, mmap=use_mmap)))
+        self.assertEqual(2, len(pool))
+
+    def test_date_cache(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        yxdb = YxdbReader(path=path, date_cache=True, columns=["DateField", "DateTimeField"])
+        while yxdb.next():
+            self.assertEqual(datetime.datetime(2020, 1, 1), yxdb.read_index(0))
+            self.assertIs(yxdb.read_index(0), yxdb.read_name("DateField"))
+            self.assertEqual(datetime.datetime(2020, 2, 3, 4, 5, 6), yxdb.read_index(1))
+
+    def test_iter_rows_matches_read_index(self):
+        for file in ["AllNormalFields.yxdb", "TutorialData.yxdb", "LotsOfRecords.yxdb", "null-spatial.yxdb", "VeryLongField.yxdb"]:
+            with self.subTest(file=file):
+                path = "./test_files/" + file
+                expected = read_all(YxdbReader(path=path))
+                self.assertEqual(expected, [list(row) for row in YxdbReader(path=path).iter_rows()])
+
+    def test_iter_rows_with_columns(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        rows = list(YxdbReader(path=path, columns=["DoubleField", "ByteField", "V_StringShortField", "BoolField"]).iter_rows())
+        self.assertEqual([(0.12345, 1, "ABC", True)], rows)
+
+    def test_iter_dicts(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        rows = list(YxdbReader(path=path, columns=["Int16Field", "StringField"]).iter_dicts())
+        self.assertEqual([{"Int16Field": 16, "StringField": "A"}], rows)
+
+    def test_lazy_values(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        yxdb = YxdbReader(path=path, lazy_values=True)
+        self.assertTrue(yxdb.next())
+        value = yxdb.read_name("V_WStringLongField")
+        self.assertIsInstance(value, LazyString)
+        self.assertEqual(500, len(value))
+        self.assertEqual("W" * 500, value)
+        self.assertEqual("XZY", yxdb.read_name("V_WStringShortField"))
+        self.assertEqual("A", yxdb.read_name("StringField"))
+
+        for file in ["AllNormalFields.yxdb", "TutorialData.yxdb", "VeryLongField.yxdb"]:
+            with self.subTest(file=file):
+                path = "./test_files/" + file
+                expected = list(YxdbReader(path=path).iter_rows())
+                lazy = [tuple(materialize(value) for value in row) for row in YxdbReader(path=path, lazy_values=True).iter_rows()]
+                self.assertEqual(expected, lazy)
+
+    def test_mmap_requires_file(self):
+        stream = BytesIO(open("./test_files/LotsOfRecords.yxdb", 'rb').read())
+        self.assertRaises(Exception, lambda: YxdbReader(stream=stream, mmap=True))
+        self.assertTrue(stream.closed)
+
+
+class SlowStream(BytesIO):
+    """Slows down reads so the read-ahead worker is still reading when the consumer uses the stream."""
+
+    def read(self, size=-1):
+        time.sleep(0.005)
+        return super().read(size)
+
+    def readinto(self, buffer):
+        time.sleep(0.005)
+        return super().readinto(buffer)
+
+    def close(self):
+        pass
+
+
+class FlakyStream(BytesIO):
+    """Fails the next reads of record block data while failures is above zero."""
+
+    failures = 0
+
+    def readinto(self, buffer):
+        if self.failures > 0 and len(buffer) > 4:
+            self.failures -= 1
+            raise IOError("simulated read error")
+        return super().readinto(buffer)
+
+    def close(self):
+        pass
+
+
+def read_all(yxdb: YxdbReader):
+    rows = []
+    while yxdb.next():
+        rows.append([yxdb.read_index(i) for i in range(len(yxdb.list_fields()))])
+    return rows
+
+
+def materialize(value):
+    if isinstance(value, LazyString):
+        return str(value)
+    if isinstance(value, LazyBytes):
+        return bytes(value)
+    return value
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,7 +3,8 @@ import struct
 import unittest
 
 from yxdb._metainfo_field import MetaInfoField
-from yxdb._yxdb_record import YxdbRecord
+from yxdb._yxdb_record import YxdbRecord, cached_record
+from yxdb.yxdb_reader import YxdbReader
 from yxdb.yxdb_field import DataType
 
 
@@ -168,6 +169,28 @@ class TestYxdbRecord(unittest.TestCase):
         self.assertEqual(True, record.has_var)
 
 
+    def test_cached_record_is_shared(self):
+        meta_info = '<RecordInfo><Field name="a" type="Int32"/><Field name="b" type="Date"/></RecordInfo>'
+        record = cached_record(meta_info)
+        self.assertIs(record, cached_record(meta_info))
+        self.assertEqual(["a", "b"], [field.name for field in record.fields])
+
+    def test_readers_do_not_modify_cached_record(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        full = YxdbReader(path=path)
+        names = [field.name for field in full.list_fields()]
+        extractors = list(full._record._extractors)
+
+        projected = YxdbReader(path=path, columns=["DateField", "Int16Field"], date_cache=True)
+        self.assertIsNot(full._record, projected._record)
+        self.assertIs(full._record, YxdbReader(path=path)._record)
+        self.assertEqual(names, [field.name for field in full._record.fields])
+        self.assertEqual(extractors, full._record._extractors)
+        self.assertEqual(["DateField", "Int16Field"], [field.name for field in projected.list_fields()])
+        projected.close()
+        full.close()
+
+
 def load_record_with_value_column(data_type, size):
     return YxdbRecord([MetaInfoField("value", data_type, size, 0)])
 
@@ -0,0 +1,45 @@
+import glob
+import unittest
+
+import yxdb
+from yxdb.yxdb_field import DataType
+from yxdb.yxdb_reader import YxdbReader
+
+
+class TestYxdbSchema(unittest.TestCase):
+    def test_read_schema(self):
+        schema = yxdb.read_schema("./test_files/AllNormalFields.yxdb")
+        self.assertEqual(1, schema.num_records)
+        self.assertEqual(16, len(schema.fields))
+        self.assertEqual("ByteField", schema.fields[0].name)
+        self.assertEqual(DataType.BYTE, schema.fields[0].data_type)
+        self.assertTrue(schema.meta_info_str.startswith("<RecordInfo>"))
+
+    def test_matches_reader(self):
+        for path in sorted(glob.glob("./test_files/*.yxdb")):
+            with self.subTest(path=path):
+                reader = YxdbReader(path=path)
+                reader.close()
+                schema = YxdbReader.probe(path)
+                self.assertEqual(reader.num_records, schema.num_records)
+                self.assertEqual(reader.meta_info_str, schema.meta_info_str)
+                self.assertEqual([(field.name, field.data_type) for field in reader.list_fields()],
+                                 [(field.name, field.data_type) for field in schema.fields])
+
+    def test_fields_are_copies(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        yxdb.read_schema(path).fields.clear()
+        YxdbReader(path=path).list_fields().append(None)
+        self.assertEqual(16, len(yxdb.read_schema(path).fields))
+        self.assertEqual(16, len(YxdbReader(path=path).list_fields()))
+
+    def test_invalid_file(self):
+        for path in ["./test_files/invalid.txt", "./test_files/invalidSmall.txt"]:
+            with self.assertRaises(Exception) as context:
+                yxdb.read_schema(path)
+            self.assertEqual("file is not a valid YXDB format", str(context.exception))
+
+    def test_read_schemas(self):
+        paths = sorted(glob.glob("./test_files/*.yxdb")) * 20
+        schemas = list(yxdb.read_schemas(paths, workers=8))
+        self.assertEqual([yxdb.read_schema(path).num_records for path in paths], [schema.num_records for schema in schemas])
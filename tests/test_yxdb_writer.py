@@ -0,0 +1,249 @@
+import datetime
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+from yxdb._header import parse_fields
+from yxdb._lzf import Lzf
+from yxdb._metainfo_field import MetaInfoField
+from yxdb.yxdb_field import DataType, YxdbField
+from yxdb.yxdb_reader import YxdbReader
+from yxdb.yxdb_writer import YxdbWriter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+def read_rows(stream: BytesIO):
+    stream.seek(0)
+    reader = YxdbReader(stream=stream)
+    rows = list(reader.iter_rows())
+    reader.close()
+    return rows
+
+
+def rewrite(path: str, write) -> BytesIO:
+    reader = YxdbReader(path=path)
+    stream = BytesIO()
+    with YxdbWriter(stream=stream, fields=parse_fields(reader.meta_info_str)) as writer:
+        write(reader, writer)
+    reader.close()
+    return stream
+
+
+class TestYxdbWriter(unittest.TestCase):
+    def test_write_rows(self):
+        fields = [
+            MetaInfoField('Id', 'Int32', 4, 0),
+            MetaInfoField('Name', 'V_WString', 0, 0),
+            MetaInfoField('Code', 'String', 5, 0),
+            MetaInfoField('Flag', 'Bool', 1, 0),
+            MetaInfoField('When', 'Date', 10, 0),
+            MetaInfoField('Amount', 'FixedDecimal', 10, 2),
+        ]
+        stream = BytesIO()
+        with YxdbWriter(stream=stream, fields=fields) as writer:
+            writer.write_row([1, 'hello world, this is a long string', 'ab', True, datetime.date(2020, 1, 2), 1.5])
+            writer.write_row({'Id': 2, 'Name': 'Ms', 'Flag': False})
+            writer.write_rows([[None, None, None, None, None, None], [3, '', 'abcdef', None, '2021-03-04', '12.25']])
+
+        self.assertEqual([
+            (1, 'hello world, this is a long string', 'ab', True, datetime.datetime(2020, 1, 2), 1.5),
+            (2, 'Ms', None, False, None, None),
+            (None, None, None, None, None, None),
+            (3, '', 'abcde', None, datetime.datetime(2021, 3, 4), 12.25),
+        ], read_rows(stream))
+
+    def test_rewrite_all_normal_fields(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        stream = rewrite(path, lambda reader, writer: writer.write_rows(reader.iter_rows()))
+        reader = YxdbReader(path=path)
+        self.assertEqual(list(reader.iter_rows()), read_rows(stream))
+
+    @unittest.skipUnless(np is not None, "numpy is not installed")
+    def test_rewrite_with_batches(self):
+        for path in ["./test_files/AllNormalFields.yxdb", "./test_files/TutorialData.yxdb", "./test_files/VeryLongField.yxdb", "./test_files/multi-poly.yxdb"]:
+            with self.subTest(path=path):
+                def write(reader, writer):
+                    for batch in reader.iter_batches(1000):
+                        writer.write_batch(batch)
+                stream = rewrite(path, write)
+                reader = YxdbReader(path=path)
+                self.assertEqual(list(reader.iter_rows()), read_rows(stream))
+
+    @unittest.skipUnless(np is not None, "numpy is not installed")
+    def test_write_dictionary_batch(self):
+        path = "./test_files/TutorialData.yxdb"
+        stream = rewrite(path, lambda reader, writer: [writer.write_batch(batch) for batch in YxdbReader(path=path, dictionary=["Country", "Prefix"]).iter_batches(1000)])
+        self.assertEqual(list(YxdbReader(path=path).iter_rows()), read_rows(stream))
+
+    @unittest.skipUnless(np is not None, "numpy is not installed")
+    def test_rewrite_lots_of_records(self):
+        path = "./test_files/LotsOfRecords.yxdb"
+        stream = rewrite(path, lambda reader, writer: writer.write_batch(reader.read_batch(reader.num_records)))
+        stream.seek(0)
+        reader = YxdbReader(stream=stream)
+        self.assertEqual(100000, reader.num_records)
+        reader.seek(70000)
+        self.assertTrue(reader.next())
+        self.assertEqual(70001, reader.read_index(0))
+        self.assertEqual(list(range(65531, 65541)), reader.read_range(65530, 65540).column(0).values.tolist())
+
+    def test_rows_across_block_index_entries(self):
+        stream = BytesIO()
+        with YxdbWriter(stream=stream, fields=[YxdbField('Value', DataType.LONG), YxdbField('Text', DataType.STRING)]) as writer:
+            writer.write_rows([i, str(i)] for i in range(70000))
+        stream.seek(0)
+        reader = YxdbReader(stream=stream)
+        reader.seek(65536)
+        self.assertTrue(reader.next())
+        self.assertEqual(65536, reader.read_index(0))
+        self.assertEqual('65536', reader.read_index(1))
+
+    def test_stream_with_prefix(self):
+        prefix = b'some bytes before the file'
+        stream = BytesIO()
+        stream.write(prefix)
+        with YxdbWriter(stream=stream, fields=[YxdbField('Value', DataType.LONG)]) as writer:
+            writer.write_rows([i] for i in range(140000))
+        data = stream.getvalue()
+        self.assertEqual(prefix, data[:len(prefix)])
+        reader = YxdbReader(stream=BytesIO(data[len(prefix):]))
+        self.assertEqual(3, len(reader._load_block_index()))
+        reader.seek(131073)
+        self.assertTrue(reader.next())
+        self.assertEqual(131073, reader.read_index(0))
+
+    @unittest.skipUnless(np is not None, "numpy is not installed")
+    def test_write_columns(self):
+        fields = [YxdbField('Value', DataType.DOUBLE), YxdbField('When', DataType.DATE), YxdbField('Data', DataType.BLOB)]
+        stream = BytesIO()
+        with YxdbWriter(stream=stream, fields=fields) as writer:
+            writer.write_columns({
+                'Value': np.ma.masked_array([1.5, 2.5, 3.5], mask=[False, True, False]),
+                'When': np.array(['2020-01-02T03:04:05', 'NaT', '1999-12-31'], dtype='datetime64[s]'),
+                'Data': [b'abc', None, bytes(range(200))],
+            })
+        self.assertEqual([
+            (1.5, datetime.datetime(2020, 1, 2, 3, 4, 5), b'abc'),
+            (None, None, None),
+            (3.5, datetime.datetime(1999, 12, 31), bytes(range(200))),
+        ], read_rows(stream))
+        with self.assertRaises(ValueError):
+            YxdbWriter(stream=BytesIO(), fields=fields).write_columns([[1], [2]])
+
+    @unittest.skipUnless(pa is not None and np is not None, "pyarrow is not installed")
+    def test_write_arrow(self):
+        table = pa.table({'Name': ['a', None, 'ccc'], 'Count': pa.array([1, 2, None], type=pa.int64())})
+        stream = BytesIO()
+        with YxdbWriter(stream=stream, fields=[YxdbField('Count', DataType.LONG), YxdbField('Name', DataType.STRING)]) as writer:
+            writer.write_arrow(table)
+        self.assertEqual([(1, 'a'), (2, None), (None, 'ccc')], read_rows(stream))
+
+    @unittest.skipUnless(pa is not None and np is not None, "pyarrow is not installed")
+    def test_write_arrow_large_integers_with_nulls(self):
+        table = pa.table({'Count': pa.array([2**53 + 1, None, 2**62 + 3], type=pa.int64()), 'Flag': pa.array([True, None, False])})
+        stream = BytesIO()
+        with YxdbWriter(stream=stream, fields=[YxdbField('Count', DataType.LONG), YxdbField('Flag', DataType.BOOLEAN)]) as writer:
+            writer.write_arrow(table)
+        self.assertEqual([(2**53 + 1, True), (None, None), (2**62 + 3, False)], read_rows(stream))
+
+    def test_non_bmp_field_name(self):
+        stream = BytesIO()
+        with YxdbWriter(stream=stream, fields=[MetaInfoField('N\U0001F600', 'Int32', 4, 0)]) as writer:
+            writer.write_rows([[1], [2]])
+        stream.seek(0)
+        reader = YxdbReader(stream=stream)
+        self.assertEqual('N\U0001F600', reader.list_fields()[0].name)
+        self.assertEqual([(1,), (2,)], list(reader.iter_rows()))
+
+    def test_fixed_decimal_too_wide(self):
+        fields = [MetaInfoField('Amount', 'FixedDecimal', 6, 2)]
+        stream = BytesIO()
+        with YxdbWriter(stream=stream, fields=fields) as writer:
+            writer.write_rows([[123.45], [-99.5], ['1.5']])
+            for value in [1234567, -99999.5, '1234567']:
+                with self.assertRaises(ValueError):
+                    writer.write_row([value])
+        self.assertEqual([(123.45,), (-99.5,), (1.5,)], read_rows(stream))
+
+    @unittest.skipUnless(np is not None, "numpy is not installed")
+    def test_fixed_decimal_column_too_wide(self):
+        writer = YxdbWriter(stream=BytesIO(), fields=[MetaInfoField('Amount', 'FixedDecimal', 6, 2)])
+        with self.assertRaises(ValueError):
+            writer.write_columns([np.array([1.5, 1234567.0])])
+
+    def test_compression_modes(self):
+        path = "./test_files/TutorialData.yxdb"
+        reader = YxdbReader(path=path)
+        expected = list(reader.iter_rows())
+        sizes = {}
+        for compression in ['fast', 'python', 'tight', None]:
+            with self.subTest(compression=compression):
+                stream = BytesIO()
+                with YxdbWriter(stream=stream, fields=parse_fields(reader.meta_info_str), compression=compression) as writer:
+                    writer.write_rows(expected)
+                sizes[compression] = len(stream.getvalue())
+                self.assertEqual(expected, read_rows(stream))
+        self.assertLess(sizes['python'], sizes[None])
+        self.assertLess(sizes['tight'], sizes[None])
+        with self.assertRaises(ValueError):
+            YxdbWriter(stream=BytesIO(), fields=[YxdbField('Value', DataType.LONG)], compression='best')
+
+    def test_python_compressor(self):
+        path = "./test_files/TutorialData.yxdb"
+        stream = rewrite(path, lambda reader, writer: writer.write_rows(reader.iter_rows()))
+        python_stream = BytesIO()
+        reader = YxdbReader(path=path)
+        with YxdbWriter(stream=python_stream, fields=parse_fields(reader.meta_info_str), compression='python') as writer:
+            writer.write_rows(reader.iter_rows())
+        self.assertEqual(read_rows(stream), read_rows(python_stream))
+
+    def test_fast_without_native_compressor(self):
+        path = "./test_files/TutorialData.yxdb"
+        raw = BytesIO()
+        reader = YxdbReader(path=path)
+        with YxdbWriter(stream=raw, fields=parse_fields(reader.meta_info_str), compression=None) as writer:
+            writer.write_rows(reader.iter_rows())
+        with patch.dict('yxdb._lzf.backends', {'python': Lzf}, clear=True):
+            stream = rewrite(path, lambda reader, writer: writer.write_rows(reader.iter_rows()))
+        self.assertEqual(len(raw.getvalue()), len(stream.getvalue()))
+        self.assertEqual(read_rows(raw), read_rows(stream))
+
+    def test_write_lazy_values(self):
+        path = "./test_files/AllNormalFields.yxdb"
+        stream = rewrite(path, lambda reader, writer: writer.write_rows(YxdbReader(path=path, lazy_values=True).iter_rows()))
+        self.assertEqual(list(YxdbReader(path=path).iter_rows()), read_rows(stream))
+
+    def test_write_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'out.yxdb')
+            with YxdbWriter(path=path, fields=[MetaInfoField('Name', 'V_String', 0, 0)]) as writer:
+                writer.write_row(['x' * 1000])
+            reader = YxdbReader(path=path)
+            self.assertEqual([('x' * 1000,)], list(reader.iter_rows()))
+            reader.close()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            YxdbWriter(stream=BytesIO())
+        with self.assertRaises(TypeError):
+            YxdbWriter(fields=[YxdbField('Value', DataType.LONG)])
+        with self.assertRaises(ValueError):
+            YxdbWriter(stream=BytesIO(), fields=[MetaInfoField('Name', 'String', 0, 0)])
+        writer = YxdbWriter(stream=BytesIO(), fields=[YxdbField('Value', DataType.LONG)])
+        with self.assertRaises(ValueError):
+            writer.write_row([1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()